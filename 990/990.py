@@ -1,71 +1,82 @@
-import pandas as pd
+import argparse
+import os
+import sys
 
-def analyze_brennen_data(csv_file="BrennanAll.csv", output_file="brennen_filtered_data.csv", house_name="Brennen House"):
-    """
-    Reads a CSV file, filters records based on Entry Date and Exit Date falling within a
-    specified range, removes duplicate entries based on 'Full Name', calculates total and filtered
-    counts, and exports the filtered data to a new CSV file.
-
-    Args:
-        csv_file (str, optional): The path to the input CSV file.
-            Defaults to "BrennanAll.csv".
-        output_file (str, optional): The path to the output CSV file for filtered data.
-        house_name (str, optional): The name of the house for the output description.
-            Defaults to "Brennen House".
-
-    Returns:
-        None. Prints total and filtered counts to the console, and exports filtered data to a CSV file.
-    """
-
-    try:
-        # Read the CSV file into a Pandas DataFrame
-        df = pd.read_csv(csv_file)
-
-        # Convert 'Entry Date' and 'Exit Date' to datetime objects, handling errors
-        df['Entry Date'] = pd.to_datetime(df['Entry Date'], errors='coerce')
-        df['Exit Date'] = pd.to_datetime(df['Exit Date'], errors='coerce')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for svdp
 
-        # Define the date range
-        start_date = pd.to_datetime('07/01/2023')
-        end_date = pd.to_datetime('06/30/2025')
+from svdp.report990 import analyze_990, fiscal_year_windows
 
-        # Store the total number of people before filtering (before removing duplicates)
-        total_people = len(df)
+# House name -> export. Add a house here and it is read alongside the others.
+HOUSE_FILES = {
+    "Brennen House": "BrennanAll.csv",
+    "Rosalie House": "RosalieAll.csv",
+}
 
-        # Filter the DataFrame based on the specified date range
-        filtered_df = df[
-            ((df['Entry Date'] >= start_date) & (df['Entry Date'] <= end_date)) |
-            ((df['Exit Date'] >= start_date) & (df['Exit Date'] <= end_date))
-        ]
+# The combined window's exports keep the names the script has always written;
+# fiscal-year windows get <house>_<window>_filtered_data.csv.
+COMBINED_OUTPUT_FILES = {
+    "Brennen House": "brennen_filtered_data.csv",
+    "Rosalie House": "rosalie_filtered_data.csv",
+}
 
-        # Remove duplicate rows based on 'Full Name'.  Keep the first occurrence.
-        filtered_df = filtered_df.drop_duplicates(subset=['Full Name'], keep='first')  # Removes duplicates based on 'Full Name'
 
-        # Calculate the total number of people after filtering and removing duplicates
-        filtered_people = len(filtered_df)
-
-        # Print the results
-        print(f"--- {house_name} ---") #added house name
-        print(f"Total number of people in the CSV: {total_people}")
-        print(f"Number of people with Entry or Exit Date between 07/01/2023 and 06/30/2025 (duplicates removed based on 'Full Name'): {filtered_people}")
-
-        # Export the filtered data to a new CSV file
-        filtered_df.to_csv(output_file, index=False)
-        print(f"Filtered data exported to: {output_file}")
+def analyze_990_report(house_files=HOUSE_FILES, fiscal_years=(2024, 2025), output_dir="."):
+    """
+    Counts the people with an Entry Date or Exit Date in each reporting window,
+    removing duplicates based on 'Full Name', and exports the filtered data.
 
-    except FileNotFoundError:
-        print(f"Error: File not found at path: {csv_file}")
-    except Exception as e:
-        print(f"An error occurred: {e}")
+    The windows are the combined 07/01/2023 - 06/30/2025 period used for the
+    990 plus one window per fiscal year (FY runs 07/01 - 06/30). All house files
+    are read concurrently and every window is counted in one pass per house.
 
+    Args:
+        house_files (dict, optional): House name -> CSV path. Defaults to HOUSE_FILES.
+        fiscal_years (iterable, optional): Fiscal years to report. Defaults to (2024, 2025).
+        output_dir (str, optional): Where the filtered CSVs are written. Defaults to ".".
 
-def analyze_rosalie_data(csv_file="RosalieAll.csv", output_file="rosalie_filtered_data.csv"):
-    """
-    Analyzes Rosalie House data with the same filtering logic as Brennen House.
+    Returns:
+        dict: House name -> {'total': ..., <window label>: count, ...}.
+              Prints the counts to the console.
     """
-    analyze_brennen_data(csv_file=csv_file, output_file=output_file, house_name="Rosalie House")
-
-
-# Example usage:
-analyze_brennen_data()  # Processes Brennan House
-analyze_rosalie_data()   # Processes Rosalie House
\ No newline at end of file
+    fiscal_years = sorted(fiscal_years)
+    windows = fiscal_year_windows(fiscal_years)
+    output_names = {}
+    if len(windows) > 1:
+        first_day, last_day = windows[0][1], windows[-1][2]
+        combined = f"{first_day:%m/%d/%Y}-{last_day:%m/%d/%Y}"
+        windows.insert(0, (combined, first_day, last_day))
+        output_names = {(house, combined): name for house, name in COMBINED_OUTPUT_FILES.items()}
+
+    results = analyze_990(house_files, windows, output_dir=output_dir, output_names=output_names)
+
+    for house_name, counts in results.items():
+        print(f"--- {house_name} ---")
+        print(f"Total number of people in the CSV: {counts['total']}")
+        for label, start, end in windows:
+            print(f"Number of people with Entry or Exit Date between {start:%m/%d/%Y} and {end:%m/%d/%Y} "
+                  f"({label}, duplicates removed based on 'Full Name'): {counts[label]}")
+    print(f"Filtered data exported to: {os.path.abspath(output_dir)}")
+    return results
+
+
+def _house(value):
+    name, sep, path = value.partition("=")
+    if not sep or not name or not path:
+        raise argparse.ArgumentTypeError(f"expected NAME=PATH, got {value!r}")
+    return name, path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="990 counts: people with an Entry or Exit Date in each window.")
+    parser.add_argument("--house", type=_house, action="append", metavar="NAME=PATH",
+                        help="A house and its export (repeat for each house; default: "
+                             + ", ".join(f"{name}={path}" for name, path in HOUSE_FILES.items()) + ")")
+    parser.add_argument("--fiscal-years", type=int, nargs="+", default=[2024, 2025], metavar="FY",
+                        help="Fiscal years to report (default: 2024 2025)")
+    parser.add_argument("--output-dir", default=".", help="Where the filtered CSVs are written (default: .)")
+    args = parser.parse_args()
+    analyze_990_report(dict(args.house) if args.house else HOUSE_FILES, args.fiscal_years, args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,92 @@
+import argparse
 import csv
+import os
+import sys
 from datetime import datetime
 
-def count_calls_in_date_range(filename="CrisisLineReport.csv"):
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for svdp
+
+from svdp import compression, dates
+from svdp.diagnostics import Issues
+from svdp.results import CallCount
+
+def count_calls_in_date_range(filename="CrisisLineReport.csv", start_date=datetime(2025, 3, 18), show=True):
     """
     Reads a CSV file, counts the number of crisis line calls within a specified date range
-    (March 18, 2025 to today), and returns the count.
+    (start_date to today), and returns the count.
 
     Args:
         filename (str, optional): The name of the CSV file to read.
                                   Defaults to "CrisisLineReport.csv".
+        start_date (datetime, optional): First day counted. Defaults to March 18, 2025.
+        show (bool, optional): Print the count (print_call_count). Defaults to True.
 
     Returns:
-        int: The number of crisis line calls within the date range.
+        svdp.results.CallCount: The number of crisis line calls within the date range,
+        or None if the file could not be read.
     """
 
-    start_date = datetime(2025, 3, 18)  # March 18, 2025
     today = datetime.now()
     call_count = 0
+    issues = Issues(filename, {'bad_date': "Invalid 'Assessment Date' format; row skipped",
+                               'missing_data': "Row too short for 'Assessment Date'; row skipped"})
 
     try:
-        with open(filename, 'r', newline='') as csvfile:
+        with compression.open_text(filename, newline='') as csvfile:
             reader = csv.reader(csvfile)
             header = next(reader)  # Skip the header row
 
             # Check if the "Assessment Date" column exists in the header. if not we can't proceed
             if "Assessment Date" not in header:
                 print("Error: 'Assessment Date' column not found in CSV file.")
-                return 0
+                return
 
             date_column_index = header.index("Assessment Date")
 
-            for row in reader:
+            for index, row in enumerate(reader):
                 try:
                     # Extract the date from the first column
                     date_string = row[date_column_index]
-                    assessment_date = datetime.strptime(date_string, '%m/%d/%Y')  # Parse date
+                    assessment_date = dates.strptime(date_string, '%m/%d/%Y')  # Parse date (memoized)
 
                     # Check if the date is within the specified range
                     if start_date <= assessment_date <= today:
                         call_count += 1
-                except ValueError as e:
-                    print(f"Skipping row due to invalid date format: {row}. Error: {e}") # Print errors if there are any with date format
-                except IndexError as e:
-                    print(f"Skipping row due to missing data: {row}. Error: {e}") # Print errors if there is any other missing data
+                except ValueError:
+                    issues.add('bad_date', index, date_string)  # summarized after the loop
+                except IndexError:
+                    issues.add('missing_data', index)
 
 
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
-        return 0
+        return
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
-        return 0
+        return
+
+    issues.report()
+    result = CallCount(filename, start_date, today, call_count)
+    if show:
+        print_call_count(result)
+    return result
+
+
+def print_call_count(result):
+    """Prints a CallCount in the report's console layout."""
+    start = result.start_date
+    print(f"Number of crisis line calls between {start:%B} {start.day}, {start.year} and today: {result.calls}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count crisis line calls from a start date to today.")
+    parser.add_argument("filename", nargs="?", default="CrisisLineReport.csv", help="Path to the crisis line export")
+    parser.add_argument("--start", type=lambda value: datetime.strptime(value, "%Y-%m-%d"),
+                        default=datetime(2025, 3, 18), help="First day counted, YYYY-MM-DD (default: 2025-03-18)")
+    args = parser.parse_args()
+
+    count_calls_in_date_range(args.filename, args.start)
 
-    return call_count
 
-# Example usage:
 if __name__ == "__main__":
-    call_count = count_calls_in_date_range()
-    print(f"Number of crisis line calls between March 18, 2025 and today: {call_count}")
\ No newline at end of file
+    main()
@@ -1,6 +1,13 @@
 import csv
+import os
+import sys
+
 import pandas as pd
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for svdp
+
+from svdp import compression
+
 def find_dcpr_in_ce(ce_file="CE.csv", dcpr_file="DCPR.csv"):
     """
     Finds DCPR unique identifiers within the CE.csv file.  Returns only
@@ -19,7 +26,7 @@ def find_dcpr_in_ce(ce_file="CE.csv", dcpr_file="DCPR.csv"):
     try:
         # **Skip header rows and read CE.csv into a Pandas DataFrame**
         # Determine number of rows to skip
-        with open(ce_file, 'r') as f:
+        with compression.open_text(ce_file) as f:
             reader = csv.reader(f)
             header_rows = 0
             for row in reader:
@@ -30,7 +37,7 @@ def find_dcpr_in_ce(ce_file="CE.csv", dcpr_file="DCPR.csv"):
                 else:
                     header_rows += 1
 
-        ce_df = pd.read_csv(ce_file, skiprows=header_rows, low_memory=False)  #Added low_memory=False to suppress DtypeWarning
+        ce_df = compression.read_csv(ce_file, skiprows=header_rows, low_memory=False)  #Added low_memory=False to suppress DtypeWarning
 
 
         # Rename the 'Unique Identifier' column in CE.csv to match DCPR.csv
@@ -39,7 +46,7 @@ def find_dcpr_in_ce(ce_file="CE.csv", dcpr_file="DCPR.csv"):
 
 
         # Read DCPR.csv into a Pandas DataFrame
-        dcpr_df = pd.read_csv(dcpr_file)
+        dcpr_df = compression.read_csv(dcpr_file)
 
         # Rename the 'Unique Identifier' column in DCPR.csv to match CE.csv
         dcpr_df.rename(columns={'Unique\nIdentifier': 'Unique Identifier'}, inplace=True) #Ensure the header name is corrected
@@ -1,6 +1,14 @@
+import argparse
 import csv
+import os
+import sys
 from datetime import datetime, date
-import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for svdp
+
+from svdp import compression, dates, instrument
+from svdp.clientids import client_ids
+from svdp.diagnostics import Issues
 
 def process_envoy_data(csv_file_path, output_file_path, start_date, end_date):
     """
@@ -9,47 +17,38 @@ def process_envoy_data(csv_file_path, output_file_path, start_date, end_date):
     the console.
     """
 
-    processed_entries = set()  # Store (name, sign_in_date) tuples
+    ids = client_ids()
+    processed_entries = set()  # Store (client ID, sign-in day) keys (svdp.clientids)
     unique_rows = []  # Store unique rows within the date range
-    non_dv_names = set() # Store names of people who said "No" to DV question
+    non_dv_ids = set() # Store IDs of people who said "No" to DV question
+    issues = Issues(csv_file_path, {'missing_name_or_time': "Missing name or sign_in_time; row skipped",
+                                    'bad_sign_in_time': "Could not parse sign_in_time; row skipped"})
 
     total_rows = 0
     filtered_rows_count = 0
     duplicate_count = 0
 
     try:
-        with open(csv_file_path, 'r', encoding='utf-8') as infile:
+        with instrument.span('load', csv_file_path) as s, \
+                compression.open_text(csv_file_path, encoding='utf-8') as infile:  # read, parse and de-duplicate
             reader = csv.DictReader(infile)
             fieldnames = reader.fieldnames  # Get column headers from the CSV
 
-            for row in reader:
+            for index, row in enumerate(reader):
                 total_rows += 1
                 name = row.get('name')
                 sign_in_time_str = row.get('sign_in_time')
                 dv_status = row.get('Are you a Domestic Violence survivor?\xa0')  # Handles Unicode NBSP
 
                 if not name or not sign_in_time_str:
-                    print(f"Warning: Skipping row due to missing name or sign_in_time: {row}")
+                    issues.add('missing_name_or_time', index)
                     continue  # Skip rows with missing data
 
-                # Parse sign-in time (handling multiple possible formats)
-                try:
-                    sign_in_time = datetime.fromisoformat(sign_in_time_str.replace('Z', '+00:00'))  # ISO format
-                except ValueError:
-                    try:
-                        sign_in_time = datetime.strptime(sign_in_time_str, '%Y-%m-%d %H:%M:%S %Z%z')
-                    except ValueError:
-                        try:
-                            sign_in_time = datetime.strptime(sign_in_time_str, '%m/%d/%Y %I:%M:%S %p %Z%z')  # '01/02/2024 10:30:00 AM EST'
-                        except ValueError:
-                            try:
-                                sign_in_time = datetime.strptime(sign_in_time_str, '%Y-%m-%d %H:%M:%S')  # standard formatting
-                            except ValueError:
-                                try:
-                                    sign_in_time = datetime.strptime(sign_in_time_str, '%m/%d/%Y %I:%M:%S %p')  # '01/02/2024 10:30:00 AM'
-                                except ValueError:
-                                    print(f"Warning: Could not parse sign-in time '{sign_in_time_str}'. Skipping row.")
-                                    continue
+                # Parse sign-in time (handling multiple possible formats, each distinct string once)
+                sign_in_time = dates.parse(sign_in_time_str, dates.ENVOY_FORMATS)
+                if sign_in_time is None:
+                    issues.add('bad_sign_in_time', index, sign_in_time_str)
+                    continue
 
                 sign_in_date = sign_in_time.date()
 
@@ -59,7 +58,8 @@ def process_envoy_data(csv_file_path, output_file_path, start_date, end_date):
 
                 filtered_rows_count += 1
 
-                entry_key = (name, sign_in_date)
+                client_id = ids.id_of(name)
+                entry_key = (client_id, sign_in_date.toordinal())
 
                 if entry_key not in processed_entries:
                     processed_entries.add(entry_key)
@@ -67,9 +67,10 @@ def process_envoy_data(csv_file_path, output_file_path, start_date, end_date):
 
                     # Check Non-DV status
                     if dv_status and dv_status.lower() == 'no':
-                        non_dv_names.add(name)
+                        non_dv_ids.add(client_id)
                 else:
                     duplicate_count += 1
+            s.rows = total_rows
 
 
 
@@ -77,6 +78,7 @@ def process_envoy_data(csv_file_path, output_file_path, start_date, end_date):
         print(f"Error: The file '{csv_file_path}' was not found.")
         return None #Important to return none for correct terminal output
 
+    issues.report()
     print("Processing complete.\n")
     print("Filtered and unique entries saved to:", output_file_path)
 
@@ -84,11 +86,12 @@ def process_envoy_data(csv_file_path, output_file_path, start_date, end_date):
     print(f"Number of rows within the date range ({start_date} to {end_date}): {filtered_rows_count}")
     print(f"Number of duplicate entries removed: {duplicate_count}")
     print(f"Total number of unique entries within the date range: {len(unique_rows)}")
-    print(f"Number of unique entries who answered 'No' to the DV question: {len(non_dv_names)}")
+    print(f"Number of unique entries who answered 'No' to the DV question: {len(non_dv_ids)}")
 
     # Write the unique rows to the output CSV file
     try:
-        with open(output_file_path, 'w', newline='', encoding='utf-8') as outfile:
+        with instrument.span('write', output_file_path, rows=len(unique_rows)), \
+                open(output_file_path, 'w', newline='', encoding='utf-8') as outfile:
             if unique_rows:
                 fieldnames = unique_rows[0].keys()  # Get column headers from the first row
                 writer = csv.DictWriter(outfile, fieldnames=fieldnames)
@@ -101,6 +104,25 @@ def process_envoy_data(csv_file_path, output_file_path, start_date, end_date):
 
     return unique_rows #Important to return unique rows to not get errors in main
 
+def analyze_visits(unique_rows, top=10):
+    """
+    Prints how often the visitors in ``unique_rows`` (what process_envoy_data
+    returns) came back and how long they stayed away (svdp.visits).
+
+    Returns:
+        svdp.visits.VisitStats
+    """
+    from svdp.visits import print_visit_stats, visit_stats  # NumPy/pandas, only when asked for
+
+    names = [row['name'] for row in unique_rows]
+    clients = client_ids().encode(names)
+    times = dates.to_datetime([row['sign_in_time'] for row in unique_rows], dates.ENVOY_FORMATS)
+    stats = visit_stats(clients, times, top)
+    shown = {visitor.client_id for visitor in stats.top_visitors}
+    print("\nVisitor frequency:")
+    print_visit_stats(stats, {int(client): name for client, name in zip(clients, names) if client in shown})
+    return stats
+
 def main():
     """Parses command-line arguments and processes Envoy data."""
     parser = argparse.ArgumentParser(description="Process Envoy data: filter by date, remove duplicates, identify non-DV entries.")
@@ -108,6 +130,8 @@ def main():
     parser.add_argument("output_csv", help="Path to the output CSV file")
     parser.add_argument("start_date", help="Start date (YYYY-MM-DD)")
     parser.add_argument("end_date", help="End date (YYYY-MM-DD)")
+    parser.add_argument("--visits", type=int, nargs="?", const=10, metavar="TOP",
+                        help="Also print visit frequency and return intervals, with the TOP most frequent visitors")
 
     args = parser.parse_args()
 
@@ -124,6 +148,9 @@ def main():
         print("No data to write to CSV.")
         return
 
+    if args.visits is not None:
+        analyze_visits(unique_data, args.visits)
+
 if __name__ == "__main__":
     main()
 
@@ -1,7 +1,17 @@
-import pandas as pd
+import argparse
+import os
+import sys
 from datetime import datetime, timedelta
 
-def analyze_marykrosalie_data(csv_file="MaryKRosalie.csv"):
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for svdp
+
+from svdp import dates, los
+from svdp.pushdown import DateWindow, read_window
+from svdp.results import MaryKayReport, pairs
+
+def analyze_marykrosalie_data(csv_file="MaryKRosalie.csv", show=True):
     """
     Analyzes MaryKRosalie.csv data to extract information for 2024,
     categorizes by gender, adult/child status, calculates average stay
@@ -11,14 +21,17 @@ def analyze_marykrosalie_data(csv_file="MaryKRosalie.csv"):
 
     Args:
         csv_file (str): Path to the CSV file.  Defaults to "MaryKRosalie.csv".
+        show (bool, optional): Print the results (print_marykay). Defaults to True.
 
     Returns:
-        None. Prints results to the terminal.
+        svdp.results.MaryKayReport, or None if the file was not found.
     """
 
     try:
-        df = pd.read_csv(csv_file)
-        print("CSV file loaded successfully.")
+        # Only rows entering or exiting in 2024 are read past their dates (svdp.pushdown)
+        df = read_window(csv_file, DateWindow('2024-01-01', '2024-12-31', ('Entry Date', 'Exit Date'))).frame
+        if show:
+            print("CSV file loaded successfully.")
     except FileNotFoundError:
         print(f"Error: File not found: {csv_file}")
         return
@@ -27,8 +40,8 @@ def analyze_marykrosalie_data(csv_file="MaryKRosalie.csv"):
     df.dropna(subset=["Entry Date", "Exit Date", "Age"], inplace=True)  # Include 'Age' in dropna
 
     # Convert "Entry Date" and "Exit Date" to datetime objects, handling errors
-    df["Entry Date"] = pd.to_datetime(df["Entry Date"], errors='coerce')
-    df["Exit Date"] = pd.to_datetime(df["Exit Date"], errors='coerce')
+    df["Entry Date"] = dates.to_datetime(df["Entry Date"], infer=True)  # each distinct date parsed once
+    df["Exit Date"] = dates.to_datetime(df["Exit Date"], infer=True)
 
     # Drop rows where date conversion failed
     df.dropna(subset=["Entry Date", "Exit Date"], inplace=True)
@@ -51,25 +64,8 @@ def analyze_marykrosalie_data(csv_file="MaryKRosalie.csv"):
     child_df = df_2024[df_2024["Category"] == "child"]
 
     # Calculate average length of stay for adults
-    if not adult_df.empty:
-        adult_df.loc[:, "Length of Stay"] = (adult_df["Exit Date"] - adult_df["Entry Date"]).dt.days
-        adult_df.loc[:, "Length of Stay"] = adult_df["Length of Stay"].clip(upper=90)  # Cap at 90 days
-        avg_stay = adult_df["Length of Stay"].mean()
-    else:
-        avg_stay = None
-
-   # DEBUGGING - Print counts and basic info
-    print(f"\nTotal records in df_2024: {len(df_2024)}")
-    print(f"Number of adults: {len(adult_df)}")
-    print(f"Number of children: {len(child_df)}")
-    print(f"Sum of adults and children: {len(adult_df) + len(child_df)}") #SHOULD match total
-    print(f"Adult ages: \n{adult_df['Age'].describe()}") #Basic stats on adult ages
-    print(f"Child ages: \n{child_df['Age'].describe()}") #Basic stats on child ages
-    # Debug this to help with the results
-    print(f"Total Record of age 0 to 18 with {df_2024[(df_2024['Age'] >= 0) & (df_2024['Age'] <= 18)]}")
-
-
-
+    stay_days = los.stay_days(adult_df["Entry Date"], adult_df["Exit Date"])
+    avg_stay = los.clipped_mean(stay_days, 90)  # Cap at 90 days; None without adults
 
     # Calculate age range counts using a single loop
     age_0_18_count = 0
@@ -97,11 +93,6 @@ def analyze_marykrosalie_data(csv_file="MaryKRosalie.csv"):
         percent_19_50 = 0.0
         percent_50_plus = 0.0
 
-    print("Values are set, let's show results with new set values:")
-
-    print(f"age_0_18_count = {age_0_18_count} ,Percent_0_18 {percent_0_18} , number people {total_records_with_valid_age}")
-
-
     # Categorize Ethnicity (incorporating Race)
     def categorize_ethnicity(ethnicity, race):
         if pd.notnull(race):
@@ -144,34 +135,62 @@ def analyze_marykrosalie_data(csv_file="MaryKRosalie.csv"):
 
     df_2024["Ethnicity Category"] = df_2024.apply(lambda row: categorize_ethnicity(row["Nationality/Race/Ethnicity"], row["Race"]), axis=1)
 
-    # Print Results
-    print("Analysis Results for 2024 Data:\n")
-
-    print(f"Total Records in 2024: {len(df_2024)}")
-    print(f"Number of Male Records: {len(male_df)}")
-    print(f"Number of Female Records: {len(female_df)}")
-    print(f"Number of Adult Records: {len(adult_df)}")
-    print(f"Number of Child Records: {len(child_df)}\n")
+    ethnicity_counts = df_2024["Ethnicity Category"].value_counts()
+    total_ethnicity_records = len(df_2024) #Total here
 
-    if avg_stay is not None:
-        print(f"Average Length of Stay for Adults (capped at 90 days): {avg_stay:.2f} days\n")
+    result = MaryKayReport(
+        source=csv_file,
+        year=2024,
+        total_records=len(df_2024),
+        male_records=len(male_df),
+        female_records=len(female_df),
+        adult_records=len(adult_df),
+        child_records=len(child_df),
+        average_adult_stay=float(avg_stay) if avg_stay is not None else None,
+        age_0_18=age_0_18_count,
+        age_19_50=age_19_50_count,
+        age_50_plus=age_50_plus_count,
+        age_0_18_percent=percent_0_18,
+        age_19_50_percent=percent_19_50,
+        age_50_plus_percent=percent_50_plus,
+        ethnicity_percentages=pairs((ethnicity_counts / total_ethnicity_records) * 100),  # Percent here
+    )
+    if show:
+        print_marykay(result)
+    return result
+
+
+def print_marykay(result):
+    """Prints a MaryKayReport in the script's console layout."""
+    print(f"Analysis Results for {result.year} Data:\n")
+
+    print(f"Total Records in {result.year}: {result.total_records}")
+    print(f"Number of Male Records: {result.male_records}")
+    print(f"Number of Female Records: {result.female_records}")
+    print(f"Number of Adult Records: {result.adult_records}")
+    print(f"Number of Child Records: {result.child_records}\n")
+
+    if result.average_adult_stay is not None:
+        print(f"Average Length of Stay for Adults (capped at 90 days): {result.average_adult_stay:.2f} days\n")
     else:
         print("No adult records found to calculate average stay.\n")
 
-    if percent_0_18 is not None and percent_19_50 is not None and percent_50_plus is not None:
-        print(f"Percentage of individuals aged 0-18: {percent_0_18:.2f}%\n")
-        print(f"Percentage of individuals aged 19-50: {percent_19_50:.2f}%\n")
-        print(f"Percentage of individuals aged 50 and older: {percent_50_plus:.2f}%\n")
-    else:
-        print("Age range percentages could not be calculated (missing age data).\n")
+    print(f"Percentage of individuals aged 0-18: {result.age_0_18_percent:.2f}%\n")
+    print(f"Percentage of individuals aged 19-50: {result.age_19_50_percent:.2f}%\n")
+    print(f"Percentage of individuals aged 50 and older: {result.age_50_plus_percent:.2f}%\n")
 
     print("Ethnicity Categories:")
-    ethnicity_counts = df_2024["Ethnicity Category"].value_counts()
-    total_ethnicity_records = len(df_2024) #Total here
-
-    for category, count in ethnicity_counts.items():
-        percentage = (count / total_ethnicity_records) * 100 #Percent here
+    for category, percentage in result.ethnicity_percentages:
         print(f"- {category}: {percentage:.2f}%")
 
-# Example Usage:
-analyze_marykrosalie_data()
\ No newline at end of file
+
+def main():
+    parser = argparse.ArgumentParser(description="Mary Kay grant figures for Rosalie House (2024).")
+    parser.add_argument("csv_file", nargs="?", default="MaryKRosalie.csv", help="Path to the Mary Kay export")
+    args = parser.parse_args()
+    analyze_marykrosalie_data(args.csv_file)
+
+
+if __name__ == "__main__":
+    main()
+
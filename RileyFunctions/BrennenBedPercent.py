@@ -1,7 +1,18 @@
-import pandas as pd
+import argparse
+import os
+import sys
 from datetime import datetime
 
-def calculate_bed_occupancy(occupancy_file, start_date_str, end_date_str, total_beds, output_file="cleaned_data.csv"):
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for svdp
+
+from svdp.capacity import default_capacity
+from svdp.results import BedOccupancy
+from svdp.schema import load_export
+
+def calculate_bed_occupancy(occupancy_file, start_date_str, end_date_str, total_beds=None,
+                            output_file="cleaned_data.csv", show=True):
     """
     Calculates bed occupancy statistics from a single CSV file and exports cleaned data with occupancy duration.
 
@@ -9,11 +20,13 @@ def calculate_bed_occupancy(occupancy_file, start_date_str, end_date_str, total_
         occupancy_file (str): Path to the occupancy CSV file (BHoccupancy.csv).
         start_date_str (str): Start date for analysis (YYYY-MM-DD).
         end_date_str (str): End date for analysis (YYYY-MM-DD).
-        total_beds (int): Total number of beds.
+        total_beds (int, optional): Total number of beds. Defaults to Brennen House's
+            beds in svdp.capacity for each day of the period.
         output_file (str, optional): Path to save the cleaned data. Defaults to "cleaned_data.csv".
+        show (bool, optional): Print the statistics (print_bed_occupancy). Defaults to True.
 
     Returns:
-        tuple: (occupancy_percentage, total_bed_nights, adult_bed_nights, child_bed_nights, start_date_str, end_date_str)
+        svdp.results.BedOccupancy, or None if the dates or file could not be read.
     """
 
     try:
@@ -21,31 +34,26 @@ def calculate_bed_occupancy(occupancy_file, start_date_str, end_date_str, total_
         end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
     except ValueError:
         print("Error: Invalid date format. Use YYYY-MM-DD.")
-        return None, None, None, None, None, None
+        return
 
     try:
-        df = pd.read_csv(occupancy_file, encoding='utf-8')  # Specify encoding
-        df = df.rename(columns={
-            'Program Enrollment Name': 'program_name',
-            'Bed: Bed Number': 'bed_name',  # Updated column name
-            'Sexual Orientation': 'sexual_orientation',
-            'Entry Date': 'entry_date',
-            'Exit Date': 'exit_date',
-            'Age': 'age'  # Map the Age
-        })
-        df['entry_date'] = pd.to_datetime(df['entry_date'], errors='coerce')  # Handle parsing errors
-        df['exit_date'] = pd.to_datetime(df['exit_date'], errors='coerce')    # Handle parsing errors
-        df['is_adult'] = df['age'] >= 18 # Create is_adult column.
+        df = load_export(occupancy_file, 'riley_everything', columns=['entry_date', 'exit_date', 'age'],
+                         optional_columns=['program_name', 'bed_name', 'sexual_orientation'],
+                         encoding='utf-8')  # Specify encoding; unparseable dates become NaT
+        df['is_adult'] = (df['age'] >= 18).fillna(False) # Create is_adult column.
         df = df.dropna(subset=['entry_date', 'exit_date']) # Remove rows with invalid date
     except FileNotFoundError:
         print(f"Error: File not found: {occupancy_file}")
-        return None, None, None, None, None, None
+        return
     except Exception as e:
         print(f"Error processing {occupancy_file}: {e}")
-        return None, None, None, None, None, None
+        return
 
     total_days = (end_date - start_date).days + 1
-    total_bed_nights = total_beds * total_days
+    if total_beds is None:
+        total_bed_nights = default_capacity().available_nights('BH', 'beds', start_date, end_date)
+    else:
+        total_bed_nights = total_beds * total_days
 
     # Initialize lists to store occupancy duration values
     occupancy_durations = []
@@ -88,22 +96,31 @@ def calculate_bed_occupancy(occupancy_file, start_date_str, end_date_str, total_
     except Exception as e:
         print(f"Error saving cleaned data to CSV: {e}")
 
-    return occupancy_percentage, total_bed_nights, adult_bed_nights, child_bed_nights, start_date_str, end_date_str
+    result = BedOccupancy(occupancy_percentage, total_bed_nights, adult_bed_nights, child_bed_nights)
+    if show:
+        print_bed_occupancy(result, start_date_str, end_date_str)
+    return result
+
+
+def print_bed_occupancy(result, start_date_str, end_date_str):
+    """Prints a BedOccupancy for the period in the report's console layout."""
+    print(f"Occupancy Data from: {start_date_str} to {end_date_str}")
+    print(f"Bed Occupancy Percentage: {result.occupancy_percentage:.2f}%")
+    print(f"Total Available Bed Nights: {result.total_bed_nights}")
+    print(f"Total Adult Bed Nights: {result.adult_bed_nights}")
+    print(f"Total Child Bed Nights: {result.child_bed_nights}")
+    print(f"Combined Adult and Child Bed Nights: {result.adult_bed_nights + result.child_bed_nights}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Brennen House bed occupancy for a date range.")
+    parser.add_argument("occupancy_file", nargs="?", default="BHoccupancy.csv", help="Occupancy export")
+    parser.add_argument("--start", default="2024-01-01", help="First day, YYYY-MM-DD (default: 2024-01-01)")
+    parser.add_argument("--end", default="2024-12-31", help="Last day, YYYY-MM-DD (default: 2024-12-31)")
+    parser.add_argument("--output", default="cleaned_bed_data.csv", help="Cleaned bed data CSV")
+    args = parser.parse_args()
+    calculate_bed_occupancy(args.occupancy_file, args.start, args.end, output_file=args.output)
+
 
-# --- Example Usage ---
 if __name__ == "__main__":
-    occupancy_file_path = r"C:\Users\jurbany\Desktop\BrennenBedPercent\BHoccupancy.csv"  # Updated file path
-    start_date = "2024-01-01"
-    end_date = "2024-12-31"
-    total_beds = 32 # Use your actual total number of beds
-    output_csv_file = "cleaned_bed_data.csv"  # Simplify the output path
-
-    (occupancy_percentage, total_bed_nights, adult_bed_nights, child_bed_nights, start_date_str, end_date_str) = calculate_bed_occupancy(occupancy_file_path, start_date, end_date, total_beds, output_csv_file)
-
-    if occupancy_percentage is not None:
-        print(f"Occupancy Data from: {start_date_str} to {end_date_str}")
-        print(f"Bed Occupancy Percentage: {occupancy_percentage:.2f}%")
-        print(f"Total Available Bed Nights: {total_bed_nights}")
-        print(f"Total Adult Bed Nights: {adult_bed_nights}")
-        print(f"Total Child Bed Nights: {child_bed_nights}")
-        print(f"Combined Adult and Child Bed Nights: {adult_bed_nights + child_bed_nights}")
\ No newline at end of file
+    main()
@@ -1,38 +1,47 @@
+import argparse
+import os
+import sys
+
 import pandas as pd
 
-def calculate_brennen_house_nights(filename="BHQuarterly.csv"):
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for svdp
+
+from svdp import compression
+from svdp.capacity import default_capacity
+from svdp.diagnostics import Issues
+from svdp.periods import parse_period
+from svdp.results import BedNights
+
+def calculate_brennen_house_nights(filename="BHQuarterly.csv", start_date="2025-01-01", end_date="2025-03-31",
+                                    show=True):
     """
     Calculates bed nights and counts total children and adults served
     OUT OF THE 32/33 clients.
 
-    Handles entries before Jan 1st, missing exit dates, and exits within the period.
+    Handles entries before the period starts, missing exit dates, and exits within the period.
 
     Args:
         filename (str, optional): The name of the CSV file to read. Defaults to "BHQuarterly.csv".
+        start_date (str, optional): First day of the reporting period (YYYY-MM-DD). Defaults to "2025-01-01".
+        end_date (str, optional): Last day of the reporting period (YYYY-MM-DD). Defaults to "2025-03-31".
+        show (bool, optional): Print the totals for verification (print_brennen_house_nights). Defaults to True.
 
     Returns:
-        tuple: A tuple containing the following values:
-            - total_individual_nights (int): Total bed nights for all individuals (Adults and Children).
-            - total_possible_bed_nights (int):  The total *possible* bed nights during the reporting period.
-            - total_adult_nights (int): Total bed nights for adults.
-            - total_child_nights (int): Total bed nights for children.
-            - total_adults_served (int): Total number of adults served.
-            - total_children_served (int): Total number of children served.
-            - total_records (int): The number of records processed.
+        svdp.results.BedNights, or None if the file was not found. The served counts
+        are all adults and children; total_records is the number of records processed.
     """
 
     try:
-        df = pd.read_csv(filename)
+        df = compression.read_csv(filename)
         #if len(df) != 32:  # Removed the length check, since it's 33
         #    print(f"Warning: Expected 32 records, but found {len(df)}. Check your data.")
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
-        return 0, 0, 0, 0, 0, 0, 0
+        return
 
-    start_date = pd.to_datetime("2025-01-01")
-    end_date = pd.to_datetime("2025-03-31")
-    num_days_in_period = (end_date - start_date).days + 1
-    total_possible_bed_nights = 32 * num_days_in_period #Assuming 32 beds still.
+    start_date = pd.to_datetime(start_date)
+    end_date = pd.to_datetime(end_date)
+    total_possible_bed_nights = default_capacity().available_nights('BH', 'physical_beds', start_date, end_date)
 
     # Convert 'Entry Date' to datetime objects
     df['Entry Date'] = pd.to_datetime(df['Entry Date'])
@@ -55,6 +64,7 @@ def calculate_brennen_house_nights(filename="BHQuarterly.csv"):
     total_adults_served = 0
     total_children_served = 0
 
+    issues = Issues(filename, {'negative_nights': "Negative number of nights calculated; record skipped"})
     for index, row in df.iterrows():
         total_records += 1
 
@@ -71,7 +81,7 @@ def calculate_brennen_house_nights(filename="BHQuarterly.csv"):
         num_nights = (departure_date - arrival_date).days
 
         if num_nights < 0:
-            print(f"Warning: Negative number of nights calculated for record {index}. Skipping.")
+            issues.add('negative_nights', index, num_nights)
             continue
 
         if age >= 18:
@@ -90,26 +100,46 @@ def calculate_brennen_house_nights(filename="BHQuarterly.csv"):
             total_children_served +=1
 
 
-    # Print for verification and debugging
-    print(f"Total records processed: {total_records}")
-    print(f"Total possible bed nights: {total_possible_bed_nights}")
-    print(f"Total Adult Nights: {total_adult_nights}")
-    print(f"Total Child Nights: {total_child_nights}")
-    print(f"Total Individual Nights: {total_individual_nights}")
-    print(f"Total Adults Served: {total_adults_served}")
-    print(f"Total Children Served: {total_children_served}")
+    issues.report()
+
+    result = BedNights(total_possible_bed_nights, total_adult_nights, total_child_nights, total_individual_nights,
+                       total_adults_served, total_children_served, total_records, len(issues))
+    if show:
+        print_brennen_house_nights(result)
+    return result
+
+
+def print_brennen_house_nights(result):
+    """Prints the totals of a BedNights for verification and debugging."""
+    print(f"Total records processed: {result.total_records}")
+    print(f"Total possible bed nights: {result.total_possible_bed_nights}")
+    print(f"Total Adult Nights: {result.total_adult_nights}")
+    print(f"Total Child Nights: {result.total_child_nights}")
+    print(f"Total Individual Nights: {result.total_individual_nights}")
+    print(f"Total Adults Served: {result.total_adults_served}")
+    print(f"Total Children Served: {result.total_children_served}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Brennen House quarterly nights and people served.")
+    parser.add_argument("filename", nargs="?", default="BHQuarterly.csv", help="Stay export")
+    parser.add_argument("--period", default="2025-Q1",
+                        help="Reporting period, e.g. 2025-Q2 or FY2025-Q3 (default: 2025-Q1)")
+    args = parser.parse_args()
+    _, start, end = parse_period(args.period)
+    period = f"{start:%b} {start.day} - {end:%b} {end.day}, {end.year}"
 
-    return total_individual_nights, total_possible_bed_nights, total_adult_nights, total_child_nights, total_adults_served, total_children_served, total_records
+    result = calculate_brennen_house_nights(args.filename, start.isoformat(), end.isoformat())
+    if result is not None:
+        print("\n--- Results ---")
+        print(f"Total Individual Bed Nights ({period}): {result.total_individual_nights}")
+        print(f"Total Possible Bed Nights ({period}): {result.total_possible_bed_nights}")
+        print(f"Total Bed Nights for Adults ({period}): {result.total_adult_nights}")
+        print(f"Total Bed Nights for Children ({period}): {result.total_child_nights}")
+        print(f"Total Adults Served: {result.total_adults_served}")
+        print(f"Total Children Served: {result.total_children_served}")
+        print(f"Total Records Processed: {result.total_records}")
 
 
-# Example usage
 if __name__ == "__main__":
-    individual_nights, possible_nights, adult_nights, child_nights, total_adults_served, total_children_served, record_count = calculate_brennen_house_nights()
-    print("\n--- Results ---")
-    print(f"Total Individual Bed Nights (Jan 1 - Mar 31, 2025): {individual_nights}")
-    print(f"Total Possible Bed Nights (Jan 1 - Mar 31, 2025): {possible_nights}")
-    print(f"Total Bed Nights for Adults (Jan 1 - Mar 31, 2025): {adult_nights}")
-    print(f"Total Bed Nights for Children (Jan 1 - Mar 31, 2025): {child_nights}")
-    print(f"Total Adults Served: {total_adults_served}")
-    print(f"Total Children Served: {total_children_served}")
-    print(f"Total Records Processed: {record_count}")
\ No newline at end of file
+    main()
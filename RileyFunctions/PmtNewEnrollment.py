@@ -1,30 +1,29 @@
-import pandas as pd
+import os
+import sys
 
-def analyze_enrollment(file="PmtNewEnrollment.csv"):
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for svdp
+
+from svdp import compression
+from svdp.results import EnrollmentReport, HouseEnrollment, pairs
+
+def analyze_enrollment(file="PmtNewEnrollment.csv", show=True):
+    """
+    Counts new enrollments, their ethnicity and age groups overall and for
+    Riley and Brennen Houses.
+
+    Args:
+        file (str): The path to the CSV file with "Bed Assignment Name",
+                    "Ethnicity" and "Age" columns.
+        show (bool, optional): Print the analysis results (print_enrollment). Defaults to True.
+
+    Returns:
+        svdp.results.EnrollmentReport, or None if the file could not be analyzed.
+    """
     try:
-        df = pd.read_csv(file)
+        df = compression.read_csv(file)
         df = df.dropna(how='all')
 
         # --- Analyze All Data ---
-        print("--- All Data ---")
-        num_rows_before = len(df)
-        print(f"Number of rows before handling missing data: {num_rows_before}")
-        num_rows_after = len(df)
-        print(f"Number of rows *AFTER* dropping rows with all NaN values: {num_rows_after}")
-        total = len(df)
-        print(f"Total: {total}")
-        print("\nEthnicity:")
-        for k, v in df['Ethnicity'].value_counts().items(): print(f"{k}: {v}")
-        age_groups = {"0-12": 0, "13-17": 0, "18-24": 0, "25-59": 0, "60+": 0}
-        for age in df['Age']:
-            if 0 <= age <= 12: age_groups["0-12"] += 1
-            elif 13 <= age <= 17: age_groups["13-17"] += 1
-            elif 18 <= age <= 24: age_groups["18-24"] += 1
-            elif 25 <= age <= 59: age_groups["25-59"] += 1
-            else: age_groups["60+"] += 1
-        print("\nAges:")
-        for k, v in age_groups.items(): print(f"{k}: {v}")
-
         brennen_total = 0
         riley_total = 0
         for bed in df['Bed Assignment Name']:
@@ -33,52 +32,61 @@ def analyze_enrollment(file="PmtNewEnrollment.csv"):
                 brennen_total += 1
             elif "RH" in bed_upper:
                 riley_total += 1
-        print("\nPrograms:")
-        print(f"Brennen: {brennen_total}")
-        print(f"Riley: {riley_total}")
+        all_data = HouseEnrollment("All Data", len(df), pairs(df['Ethnicity'].value_counts()),
+                                   _age_groups(df['Age']), (("Brennen", brennen_total), ("Riley", riley_total)))
 
         # --- Analyze Riley House Data ---
-        print("\n--- Riley House ---")
         riley_df = df[df['Bed Assignment Name'].astype(str).str.upper().str.contains("RH")]
-        riley_total = len(riley_df)
-        print(f"Total: {riley_total}")
-        print("\nEthnicity:")
-        for k, v in riley_df['Ethnicity'].value_counts().items(): print(f"{k}: {v}")
-        riley_age_groups = {"0-12": 0, "13-17": 0, "18-24": 0, "25-59": 0, "60+": 0}
-        for age in riley_df['Age']:
-            if 0 <= age <= 12: riley_age_groups["0-12"] += 1
-            elif 13 <= age <= 17: riley_age_groups["13-17"] += 1
-            elif 18 <= age <= 24: riley_age_groups["18-24"] += 1
-            elif 25 <= age <= 59: riley_age_groups["25-59"] += 1
-            else: riley_age_groups["60+"] += 1
-        print("\nAges:")
-        for k, v in riley_age_groups.items(): print(f"{k}: {v}")
-        print("\nPrograms:") # Program analysis will always show Riley for this subset.
-        print(f"Riley: {len(riley_df)}")
+        # Program analysis will always show Riley for this subset.
+        riley = HouseEnrollment("Riley House", len(riley_df), pairs(riley_df['Ethnicity'].value_counts()),
+                                _age_groups(riley_df['Age']), (("Riley", len(riley_df)),))
 
         # --- Analyze Brennen House Data ---
-        print("\n--- Brennen House ---")
         brennen_df = df[df['Bed Assignment Name'].astype(str).str.upper().str.contains("BH")]
-        brennen_total = len(brennen_df)
-        print(f"Total: {brennen_total}")
-        print("\nEthnicity:")
-        for k, v in brennen_df['Ethnicity'].value_counts().items(): print(f"{k}: {v}")
-        brennen_age_groups = {"0-12": 0, "13-17": 0, "18-24": 0, "25-59": 0, "60+": 0}
-        for age in brennen_df['Age']:
-            if 0 <= age <= 12: brennen_age_groups["0-12"] += 1
-            elif 13 <= age <= 17: brennen_age_groups["13-17"] += 1
-            elif 18 <= age <= 24: brennen_age_groups["18-24"] += 1
-            elif 25 <= age <= 59: brennen_age_groups["25-59"] += 1
-            else: brennen_age_groups["60+"] += 1
-        print("\nAges:")
-        for k, v in brennen_age_groups.items(): print(f"{k}: {v}")
-        print("\nPrograms:") # Program analysis will always show Brennen for this subset.
-        print(f"Brennen: {len(brennen_df)}")
+        # Program analysis will always show Brennen for this subset.
+        brennen = HouseEnrollment("Brennen House", len(brennen_df), pairs(brennen_df['Ethnicity'].value_counts()),
+                                  _age_groups(brennen_df['Age']), (("Brennen", len(brennen_df)),))
 
     except FileNotFoundError:
         print(f"Error: '{file}' not found.")
+        return
     except Exception as e:
         print(f"Error: {e}")
+        return
+
+    result = EnrollmentReport(file, all_data, riley, brennen)
+    if show:
+        print_enrollment(result)
+    return result
+
+
+def _age_groups(ages):
+    age_groups = {"0-12": 0, "13-17": 0, "18-24": 0, "25-59": 0, "60+": 0}
+    for age in ages:
+        if 0 <= age <= 12: age_groups["0-12"] += 1
+        elif 13 <= age <= 17: age_groups["13-17"] += 1
+        elif 18 <= age <= 24: age_groups["18-24"] += 1
+        elif 25 <= age <= 59: age_groups["25-59"] += 1
+        else: age_groups["60+"] += 1
+    return pairs(age_groups)
+
+
+def print_enrollment(result):
+    """Prints an EnrollmentReport in the report's console layout."""
+    for house in (result.all_data, result.riley, result.brennen):
+        if house is result.all_data:
+            print(f"--- {house.house} ---")
+            print(f"Number of rows before handling missing data: {house.total}")
+            print(f"Number of rows *AFTER* dropping rows with all NaN values: {house.total}")
+        else:
+            print(f"\n--- {house.house} ---")
+        print(f"Total: {house.total}")
+        print("\nEthnicity:")
+        for k, v in house.ethnicity: print(f"{k}: {v}")
+        print("\nAges:")
+        for k, v in house.ages: print(f"{k}: {v}")
+        print("\nPrograms:")
+        for k, v in house.programs: print(f"{k}: {v}")
 
 if __name__ == "__main__":
-    analyze_enrollment()
\ No newline at end of file
+    analyze_enrollment()
@@ -1,52 +1,62 @@
-import pandas as pd
+import os
+import sys
 
-def analyze_gender_by_house(file="PmtNewGender.csv"):
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for svdp
+
+from svdp import compression
+from svdp.results import GenderReport, HouseGender, pairs
+
+def analyze_gender_by_house(file="PmtNewGender.csv", show=True):
     """
     Analyzes gender distribution for Brennen and Riley Houses from a CSV file.
 
     Args:
         file (str): The path to the CSV file containing the enrollment data.
                       It MUST have "Bed Assignment Name" and "Gender" columns.
+        show (bool, optional): Print the analysis results (print_gender_by_house). Defaults to True.
 
     Returns:
-        None. Prints the analysis results to the console.
+        svdp.results.GenderReport, or None if the file could not be analyzed.
     """
 
     try:
-        df = pd.read_csv(file)
+        df = compression.read_csv(file)
         df = df.dropna(how='all') # Remove rows that are completely empty
 
         # --- Analyze All Data ---
-        print("--- All Data ---")
-        total = len(df)
-        print(f"Total: {total}")
-
-        # Gender Analysis
-        print("\nGender:")
-        for k, v in df['Gender'].value_counts().items(): print(f"{k}: {v}")
+        all_data = HouseGender("All Data", len(df), pairs(df['Gender'].value_counts()))
 
         # --- Brennen House Gender Analysis ---
-        print("\n--- Brennen House ---")
         brennen_df = df[df['Bed Assignment Name'].astype(str).str.upper().str.contains("BH")]
-        brennen_total = len(brennen_df)
-        print(f"Total: {brennen_total}")
-
-        print("\nGender:")
-        for k, v in brennen_df['Gender'].value_counts().items(): print(f"{k}: {v}")
+        brennen = HouseGender("Brennen House", len(brennen_df), pairs(brennen_df['Gender'].value_counts()))
 
         # --- Riley House Gender Analysis ---
-        print("\n--- Riley House ---")
         riley_df = df[df['Bed Assignment Name'].astype(str).str.upper().str.contains("RH")]
-        riley_total = len(riley_df)
-        print(f"Total: {riley_total}")
-
-        print("\nGender:")
-        for k, v in riley_df['Gender'].value_counts().items(): print(f"{k}: {v}")
+        riley = HouseGender("Riley House", len(riley_df), pairs(riley_df['Gender'].value_counts()))
 
     except FileNotFoundError:
         print(f"Error: File '{file}' not found.")
+        return
     except Exception as e:
         print(f"Error: {e}")
+        return
+
+    result = GenderReport(file, all_data, brennen, riley)
+    if show:
+        print_gender_by_house(result)
+    return result
+
+
+def print_gender_by_house(result):
+    """Prints a GenderReport in the report's console layout."""
+    for house in (result.all_data, result.brennen, result.riley):
+        if house is not result.all_data:
+            print()
+        print(f"--- {house.house} ---")
+        print(f"Total: {house.total}")
+
+        print("\nGender:")
+        for k, v in house.gender: print(f"{k}: {v}")
 
 if __name__ == "__main__":
-    analyze_gender_by_house()
\ No newline at end of file
+    analyze_gender_by_house()
@@ -1,39 +1,52 @@
+import argparse
+import os
+import sys
+
+import numpy as np
 import pandas as pd
 
-def calculate_rosalie_house_nights(filename="RHQuarterly.csv"):
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for svdp
+
+from svdp import compression
+from svdp.capacity import default_capacity
+from svdp.diagnostics import Issues
+from svdp.periods import parse_period
+from svdp.clientids import client_ids
+from svdp.presence import ActiveDays
+from svdp.results import BedNights
+
+def calculate_rosalie_house_nights(filename="RHQuarterly.csv", start_date="2025-01-01", end_date="2025-03-31",
+                                    show=True):
     """
     Calculates bed nights and counts *unique* children and adults served at Rosalie House,
     handling cases where individuals may have multiple entries.
 
-    Handles entries before Jan 1st, missing exit dates, and exits within the period.
+    Handles entries before the period starts, missing exit dates, and exits within the period.
     Assumes a maximum of 37 records.
 
     Args:
         filename (str, optional): The name of the CSV file to read. Defaults to "RHQuarterly.csv".
+        start_date (str, optional): First day of the reporting period (YYYY-MM-DD). Defaults to "2025-01-01".
+        end_date (str, optional): Last day of the reporting period (YYYY-MM-DD). Defaults to "2025-03-31".
+        show (bool, optional): Print the totals for verification (print_rosalie_house_nights). Defaults to True.
 
     Returns:
-        tuple: A tuple containing the following values:
-            - total_individual_nights (int): Total bed nights for all individuals (Adults and Children).
-            - total_possible_bed_nights (int):  The total *possible* bed nights during the reporting period.
-            - total_adult_nights (int): Total bed nights for adults.
-            - total_child_nights (int): Total bed nights for children.
-            - total_adults_served (int): Total number of *unique* adults served.
-            - total_children_served (int): Total number of *unique* children served.
-            - total_records (int): The number of records processed.
+        svdp.results.BedNights, or None if the file was not found. The served counts
+        are *unique* adults and children; total_records is the number of records processed.
     """
 
     try:
-        df = pd.read_csv(filename)
+        df = compression.read_csv(filename)
         if len(df) > 37:
             print(f"Warning: Found more than 37 records ({len(df)}).  Check your data for duplicates or errors.")
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
-        return 0, 0, 0, 0, 0, 0, 0
+        return
 
-    start_date = pd.to_datetime("2025-01-01")
-    end_date = pd.to_datetime("2025-03-31")
-    num_days_in_period = (end_date - start_date).days + 1
-    total_possible_bed_nights = 35 * num_days_in_period # Assuming 35 physical beds at the house.
+    start_date = pd.to_datetime(start_date)
+    end_date = pd.to_datetime(end_date)
+    # Physical beds at the house (35), from svdp.capacity
+    total_possible_bed_nights = default_capacity().available_nights('RH', 'physical_beds', start_date, end_date)
 
     # Convert 'Entry Date' and 'Exit Date' to datetime objects
     df['Entry Date'] = pd.to_datetime(df['Entry Date'])
@@ -52,17 +65,13 @@ def calculate_rosalie_house_nights(filename="RHQuarterly.csv"):
     total_child_nights = 0
     total_records = 0
 
-    # Use sets to track unique adults and children
-    adults_served = set()
-    children_served = set()
-
+    issues = Issues(filename, {'negative_nights': "Negative number of nights calculated; record skipped"})
     for index, row in df.iterrows():
         total_records += 1
 
         arrival_date = row['Entry Date']
         departure_date = row['Exit Date']
         age = row['Age']
-        full_name = row['Full Name'] # Use Full Name to track individuals
 
         # Clip the arrival date to the start date of the reporting period.
         arrival_date = max(arrival_date, start_date)
@@ -73,42 +82,63 @@ def calculate_rosalie_house_nights(filename="RHQuarterly.csv"):
         num_nights = (departure_date - arrival_date).days
 
         if num_nights < 0:
-            print(f"Warning: Negative number of nights calculated for record {index}. Skipping.")
+            issues.add('negative_nights', index, num_nights)
             continue
 
         if age >= 18:
             total_adult_nights += num_nights
-            adults_served.add(full_name) # Add the full name to the set.
         else:
             total_child_nights += num_nights
-            children_served.add(full_name) # Add the full name to the set.
 
         total_individual_nights += num_nights
 
-    # Calculate the number of UNIQUE adults and children served
-    total_adults_served = len(adults_served)
-    total_children_served = len(children_served)
-
-    # Print for verification and debugging
-    print(f"Total records processed: {total_records}")
-    print(f"Total possible bed nights: {total_possible_bed_nights}")
-    print(f"Total Adult Nights: {total_adult_nights}")
-    print(f"Total Child Nights: {total_child_nights}")
-    print(f"Total Individual Nights: {total_individual_nights}")
-    print(f"Total Adults Served: {total_adults_served}")
-    print(f"Total Children Served: {total_children_served}")
-
-    return total_individual_nights, total_possible_bed_nights, total_adult_nights, total_child_nights, total_adults_served, total_children_served, total_records
+    # Calculate the number of UNIQUE adults and children served, by Full Name,
+    # from the clients' active days in the period (svdp.presence)
+    active = ActiveDays.from_stays(client_ids().encode(df['Full Name']), df['Entry Date'], df['Exit Date'],
+                                   start_date, end_date, age_group=np.where(df['Age'] >= 18, 'adult', 'child'))
+    total_adults_served = active.count(start_date, end_date, age_group='adult')
+    total_children_served = active.count(start_date, end_date, age_group='child')
+
+    issues.report()
+
+    result = BedNights(total_possible_bed_nights, total_adult_nights, total_child_nights, total_individual_nights,
+                       total_adults_served, total_children_served, total_records, len(issues))
+    if show:
+        print_rosalie_house_nights(result)
+    return result
+
+
+def print_rosalie_house_nights(result):
+    """Prints the totals of a BedNights for verification and debugging."""
+    print(f"Total records processed: {result.total_records}")
+    print(f"Total possible bed nights: {result.total_possible_bed_nights}")
+    print(f"Total Adult Nights: {result.total_adult_nights}")
+    print(f"Total Child Nights: {result.total_child_nights}")
+    print(f"Total Individual Nights: {result.total_individual_nights}")
+    print(f"Total Adults Served: {result.total_adults_served}")
+    print(f"Total Children Served: {result.total_children_served}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rosalie House quarterly bed nights.")
+    parser.add_argument("filename", nargs="?", default="RHQuarterly.csv", help="Stay export")
+    parser.add_argument("--period", default="2025-Q1",
+                        help="Reporting period, e.g. 2025-Q2 or FY2025-Q3 (default: 2025-Q1)")
+    args = parser.parse_args()
+    _, start, end = parse_period(args.period)
+    period = f"{start:%b} {start.day} - {end:%b} {end.day}, {end.year}"
+
+    result = calculate_rosalie_house_nights(args.filename, start.isoformat(), end.isoformat())
+    if result is not None:
+        print("\n--- Results ---")
+        print(f"Total Individual Bed Nights ({period}): {result.total_individual_nights}")
+        print(f"Total Possible Bed Nights ({period}): {result.total_possible_bed_nights}")
+        print(f"Total Bed Nights for Adults ({period}): {result.total_adult_nights}")
+        print(f"Total Bed Nights for Children ({period}): {result.total_child_nights}")
+        print(f"Total Adults Served: {result.total_adults_served}")
+        print(f"Total Children Served: {result.total_children_served}")
+        print(f"Total Records Processed: {result.total_records}")
 
 
-# Example usage
 if __name__ == "__main__":
-    individual_nights, possible_nights, adult_nights, child_nights, adults_served, children_served, record_count = calculate_rosalie_house_nights()
-    print("\n--- Results ---")
-    print(f"Total Individual Bed Nights (Jan 1 - Mar 31, 2025): {individual_nights}")
-    print(f"Total Possible Bed Nights (Jan 1 - Mar 31, 2025): {possible_nights}")
-    print(f"Total Bed Nights for Adults (Jan 1 - Mar 31, 2025): {adult_nights}")
-    print(f"Total Bed Nights for Children (Jan 1 - Mar 31, 2025): {child_nights}")
-    print(f"Total Adults Served: {adults_served}")
-    print(f"Total Children Served: {children_served}")
-    print(f"Total Records Processed: {record_count}")
\ No newline at end of file
+    main()
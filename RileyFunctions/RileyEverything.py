@@ -1,12 +1,47 @@
-import pandas as pd
+import argparse
+import os
+import sys
 from datetime import datetime
-import re
 
-def calculate_occupancy(occupancy_file, start_date_str, end_date_str):
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for svdp
+
+from svdp import instrument
+from svdp.cache import memoize
+from svdp.capacity import default_capacity
+from svdp.conflicts import bed_conflict_summary
+from svdp.clientids import client_ids
+from svdp.periods import parse_period
+from svdp.presence import ActiveDays
+from svdp.pushdown import DateWindow
+from svdp.results import HouseOccupancy, OccupancyReport
+from svdp.schema import load_export
+
+STAY_COLUMNS = ['bed_name', 'full_name', 'age', 'entry_date', 'exit_date']
+
+def occupancy_report(occupancy_file, start_date_str, end_date_str, capacity=None):
     """
-    Calculates and prints bed and bedroom occupancy statistics for Brennen and Rosalie Houses
+    Calculates bed and bedroom occupancy statistics for Brennen and Rosalie Houses
     from a combined CSV file.  Includes people whose entry OR exit dates are within the period.
+    Results are cached by file contents and capacity (svdp.cache), so a repeat run is instant.
+
+    Args:
+        occupancy_file (str): Path to the combined CSV export.
+        start_date_str (str): First day of the period (YYYY-MM-DD).
+        end_date_str (str): Last day of the period (YYYY-MM-DD).
+        capacity (svdp.capacity.Capacity, optional): Beds and rooms available
+            each day. Defaults to default_capacity().
+
+    Returns:
+        svdp.results.OccupancyReport, or None if the dates or file could not be read.
     """
+    return _occupancy_report(occupancy_file, start_date_str, end_date_str, capacity or default_capacity())
+
+
+@memoize(files=('occupancy_file',))
+def _occupancy_report(occupancy_file, start_date_str, end_date_str, capacity):
 
     try:
         start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
@@ -16,28 +51,15 @@ def calculate_occupancy(occupancy_file, start_date_str, end_date_str):
         return
 
     try:
-        df = pd.read_csv(occupancy_file, encoding='utf-8')
-        df = df.rename(columns={
-            'Bed: Bed Number': 'bed_name',
-            'Full Name': 'full_name',
-            'Program Enrollment Name': 'program_name',
-            'Bed Assignment Name': 'bed_assignment_name',
-            'Age': 'age',
-            'Sexual Orientation': 'sexual_orientation',
-            'Other Exit Reason': 'other_exit_reason',
-            'Nationality/Race/Ethnicity': 'ethnicity',
-            'Gender': 'gender',
-            'Entry Date': 'entry_date',
-            'Exit Date': 'exit_date',
-            'Exit Reason': 'exit_reason',
-            'Race': 'race',
-            'Start Date/Time': 'start_time',
-            'Bed Transfer': 'bed_transfer'
-        })
-        df['entry_date'] = pd.to_datetime(df['entry_date'], errors='coerce')
-        df['exit_date'] = pd.to_datetime(df['exit_date'], errors='coerce')
-        df['is_adult'] = df['age'] >= 18
-        df = df.dropna(subset=['entry_date', 'exit_date'])
+        # Only the columns this report uses, and only the stays overlapping the period
+        # (checked on the raw dates before anything else is parsed); canonical names
+        # come from the schema registry
+        with instrument.span('load', occupancy_file) as s:
+            df = load_export(occupancy_file, 'riley_everything', columns=STAY_COLUMNS, encoding='utf-8',
+                             where=DateWindow(start_date, end_date, ('entry_date', 'exit_date'), 'overlap'))
+            df['is_adult'] = (df['age'] >= 18).fillna(False)
+            df = df.dropna(subset=['entry_date', 'exit_date'])
+            s.rows = len(df)
 
     except FileNotFoundError:
         print(f"Error: File not found: {occupancy_file}")
@@ -46,120 +68,39 @@ def calculate_occupancy(occupancy_file, start_date_str, end_date_str):
         print(f"Error processing {occupancy_file}: {e}")
         return
 
+    # --- Double-booked beds inflate occupancy; check before counting ---
+    with instrument.span('validate', occupancy_file, rows=len(df)):
+        bed_houses = df['bed_name'].astype(str)
+        rh_conflicts = bed_conflict_summary(df[bed_houses.str.contains("RH").to_numpy()], start_date, end_date)
+        bh_conflicts = bed_conflict_summary(df[bed_houses.str.contains("BH").to_numpy()
+                                               & ~bed_houses.str.contains("RH").to_numpy()], start_date, end_date)
+
     # --- Constants ---
     start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
     end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
     total_days = (end_date - start_date).days + 1
 
-    rh_total_beds = 18  # Rosalie House
-    bh_total_beds = 32  # Brennen House
-    rh_total_rooms = 6   # Rosalie has 6 rooms
-    bh_total_rooms = 12  # Brennen has 12 rooms. Room #'s 5-16
-
-    rh_total_bed_nights = rh_total_beds * total_days
-    bh_total_bed_nights = bh_total_beds * total_days
-
-    rh_total_room_nights = rh_total_rooms * total_days
-    bh_total_room_nights = bh_total_rooms * total_days
-
-    # --- Initialize tracking variables ---
-    rh_occupied_bed_days = 0
-    rh_adult_bed_nights = 0
-    rh_child_bed_nights = 0
-    rh_occupied_room_days = 0
-    
-    bh_occupied_bed_days = 0
-    bh_adult_bed_nights = 0
-    bh_child_bed_nights = 0
-    bh_occupied_room_days = 0
-    
-    # --- Track unique people at the RECORD level, not day level ---
-    rh_unique_adults = set()
-    rh_unique_children = set()
-    bh_unique_adults = set()
-    bh_unique_children = set()
-    
-    # --- Process data for counting unique individuals first ---
-    # This counts people before day-by-day iteration
-    for index, row in df.iterrows():
-        bed_name = row['bed_name']
-        entry_date = row['entry_date']
-        exit_date = row['exit_date']
-        is_adult = row['is_adult']
-        full_name = row['full_name']
-        
-        # Check if this stay overlaps with our analysis period
-        if not (exit_date < start_date or entry_date > end_date):
-            # This person stayed during our analysis period
-            if "RH" in bed_name:
-                if is_adult:
-                    rh_unique_adults.add(full_name)
-                else:
-                    rh_unique_children.add(full_name)
-            elif "BH" in bed_name:
-                if is_adult:
-                    bh_unique_adults.add(full_name)
-                else:
-                    bh_unique_children.add(full_name)
-
-    #---- Set for holding data ------
-    rh_adult_bed_room = [set() for _ in range(total_days)]
-    bh_adult_bed_room = [set() for _ in range(total_days)]
-
-    # --- Now process data for occupancy calculations ---
-    for index, row in df.iterrows():
-        bed_name = row['bed_name']
-        entry_date = row['entry_date']
-        exit_date = row['exit_date']
-        is_adult = row['is_adult']
-
-        # Check if this stay overlaps with our analysis period
-        if not (exit_date < start_date or entry_date > end_date):
-            # Adjust entry and exit dates to be within the analysis period
-            entry_date = max(entry_date, start_date)
-            exit_date = min(exit_date, end_date)
-            
-            occupancy_duration = (exit_date - entry_date).days + 1
-
-            # Iterate each day in duration
-            for day in range(occupancy_duration):
-                current_date = entry_date + pd.Timedelta(days=day)
-                day_index = (current_date - start_date).days
-                
-                # --- Rosalie House (RH) ---
-                if "RH" in bed_name:
-                    rh_occupied_bed_days += 1
-                    
-                    if is_adult:
-                        rh_adult_bed_nights += 1
-                        try:
-                            match = re.search(r'Rm (\d+)', bed_name)
-                            if match:
-                                room_number = int(match.group(1))
-                                rh_adult_bed_room[day_index].add(room_number)
-                                rh_occupied_room_days += 1
-                        except Exception as e:
-                            pass
-                    else:
-                        rh_child_bed_nights += 1
-
-                # --- Brennen House (BH) ---
-                elif "BH" in bed_name:
-                    bh_occupied_bed_days += 1
-                    
-                    if is_adult:
-                        bh_adult_bed_nights += 1
-                        try:
-                            match = re.search(r'Rm (\d+)', bed_name)
-                            if match:
-                                room_number = int(match.group(1))
-                                if 5 <= room_number <= 16:
-                                    bh_adult_bed_room[day_index].add(room_number)
-                                    bh_occupied_room_days += 1
-                        except Exception as e:
-                            pass
-                    else:
-                        bh_child_bed_nights += 1
+    # Beds and rooms available on each day of the period (svdp.capacity): by default
+    # Rosalie 18 beds / 6 rooms, Brennen 32 beds / 12 rooms (room #'s 5-16)
+    rh_total_bed_nights = capacity.available_nights('RH', 'beds', start_date, end_date)
+    bh_total_bed_nights = capacity.available_nights('BH', 'beds', start_date, end_date)
+
+    rh_total_room_nights = capacity.available_nights('RH', 'rooms', start_date, end_date)
+    bh_total_room_nights = capacity.available_nights('BH', 'rooms', start_date, end_date)
+
+    # --- Unique people at the RECORD level, not day level ---
+    # Every client's active days are indexed once per file (svdp.presence), so
+    # each period's distinct adults and children are an overlap test on merged runs plus a count.
+    with instrument.span('filter', occupancy_file, rows=len(df)):
+        active = _active_days(occupancy_file)
+        rh_unique_adults = active.count(start_date, end_date, house='RH', age_group='adult')
+        rh_unique_children = active.count(start_date, end_date, house='RH', age_group='child')
+        bh_unique_adults = active.count(start_date, end_date, house='BH', age_group='adult')
+        bh_unique_children = active.count(start_date, end_date, house='BH', age_group='child')
+
+    (rh_occupied_bed_days, rh_adult_bed_nights, rh_child_bed_nights, rh_occupied_room_days,
+     bh_occupied_bed_days, bh_adult_bed_nights, bh_child_bed_nights, bh_occupied_room_days) = \
+        _occupied_nights(df, start_date, end_date)
 
     # --- Calculate Percentages ---
     rh_bed_occupancy_percentage = (rh_occupied_bed_days / rh_total_bed_nights) * 100 if rh_total_bed_nights > 0 else 0.0
@@ -168,42 +109,129 @@ def calculate_occupancy(occupancy_file, start_date_str, end_date_str):
     rh_room_occupancy_percentage = (rh_occupied_room_days / rh_total_room_nights) * 100 if rh_total_room_nights > 0 else 0.0
     bh_room_occupancy_percentage = (bh_occupied_room_days / bh_total_room_nights) * 100 if bh_total_room_nights > 0 else 0.0
 
-    # --- Print Results ---
+    result = OccupancyReport(
+        source=occupancy_file,
+        start_date=start_date_str,
+        end_date=end_date_str,
+        total_days=total_days,
+        rosalie=HouseOccupancy(
+            "Rosalie House", rh_bed_occupancy_percentage, rh_total_bed_nights, rh_occupied_bed_days,
+            rh_adult_bed_nights, rh_child_bed_nights, rh_room_occupancy_percentage, rh_total_room_nights,
+            rh_occupied_room_days, rh_unique_adults, rh_unique_children,
+            rh_conflicts.conflicting_pairs, rh_conflicts.max_concurrency),
+        brennen=HouseOccupancy(
+            "Brennen House", bh_bed_occupancy_percentage, bh_total_bed_nights, bh_occupied_bed_days,
+            bh_adult_bed_nights, bh_child_bed_nights, bh_room_occupancy_percentage, bh_total_room_nights,
+            bh_occupied_room_days, bh_unique_adults, bh_unique_children,
+            bh_conflicts.conflicting_pairs, bh_conflicts.max_concurrency),
+    )
+
+    return result
+
+
+@instrument.traced('aggregate')
+def _occupied_nights(df, start_date, end_date):
+    """
+    Counts bed nights and adult-occupied room nights per house within the period.
+
+    Each stay is clipped to the period and counts every day it covers, entry
+    and exit day included, so the nights are computed for all stays at once
+    instead of walking them day by day. A room night is an adult bed night in
+    a numbered room (rooms 5-16 at Brennen House).
+
+    Returns:
+        tuple: Occupied bed nights, adult bed nights, child bed nights and
+               occupied room nights of Rosalie House, then the same four of Brennen House.
+    """
+    nights = (df['exit_date'].clip(upper=end_date) - df['entry_date'].clip(lower=start_date)).dt.days + 1
+    nights = nights.clip(lower=0).to_numpy()
+    is_adult = df['is_adult'].to_numpy(dtype=bool)
+    bed_names = df['bed_name'].astype(str)
+    rooms = pd.to_numeric(bed_names.str.extract(r'Rm (\d+)', expand=False)).to_numpy()  # NaN without a room number
+
+    # --- Rosalie House (RH), then Brennen House (BH) ---
+    rh = bed_names.str.contains("RH").to_numpy()
+    bh = bed_names.str.contains("BH").to_numpy() & ~rh
+    rh_rooms = rh & is_adult & ~np.isnan(rooms)
+    bh_rooms = bh & is_adult & (rooms >= 5) & (rooms <= 16)
+
+    return tuple(int(nights[mask].sum()) for mask in (
+        rh, rh & is_adult, rh & ~is_adult, rh_rooms,
+        bh, bh & is_adult, bh & ~is_adult, bh_rooms))
+
+
+@memoize(files=('occupancy_file',))
+def _active_days(occupancy_file):
+    """
+    Active-day bitmaps of every stay in the file, by house and adult/child.
+    Built from the whole file (not one period's stays) once per file contents.
+    """
+    df = load_export(occupancy_file, 'riley_everything', columns=STAY_COLUMNS, encoding='utf-8')
+    df = df.dropna(subset=['entry_date', 'exit_date'])
+    beds = df['bed_name'].astype(str)
+    house = np.where(beds.str.contains("RH"), 'RH', np.where(beds.str.contains("BH"), 'BH', 'Other'))
+    # A stay whose exit precedes its entry still counts on its entry day
+    exit_dates = df[['entry_date', 'exit_date']].max(axis=1)
+    return ActiveDays.from_stays(client_ids().encode(df['full_name']), df['entry_date'], exit_dates, house=house,
+                                 age_group=np.where((df['age'] >= 18).fillna(False).to_numpy(dtype=bool), 'adult', 'child'))
+
+
+def calculate_occupancy(occupancy_file, start_date_str, end_date_str, show=True):
+    """
+    Calculates (or fetches from the cache) the occupancy statistics and prints them.
+
+    Args:
+        show (bool, optional): Print the statistics (print_occupancy). Defaults to True.
+
+    Returns:
+        svdp.results.OccupancyReport, or None if the dates or file could not be read.
+    """
+    result = occupancy_report(occupancy_file, start_date_str, end_date_str)
+    if show and result is not None:
+        with instrument.span('write', occupancy_file):
+            print_occupancy(result)
+    return result
+
+
+def print_occupancy(result):
+    """Prints an OccupancyReport in the report's console layout."""
     print("----- Occupancy Statistics -----")
-    print(f"Analysis Period: {start_date_str} to {end_date_str}")
-    print(f"Total Days: {total_days}")
-
-    print("\n----- Rosalie House -----")
-    print(f"Bed Occupancy Percentage: {rh_bed_occupancy_percentage:.2f}%")
-    print(f"Total Available Bed Nights: {rh_total_bed_nights}")
-    print(f"Total Adult Bed Nights: {rh_adult_bed_nights}")
-    print(f"Total Child Bed Nights: {rh_child_bed_nights}")
-    print(f"Bedroom Occupancy Percentage: {rh_room_occupancy_percentage:.2f}%")
-    print(f"Total Available Bedroom Nights: {rh_total_room_nights}")
-    print(f"Total Room Occupancy: {rh_occupied_room_days}")
-
-    print("\n----- Brennen House -----")
-    print(f"Bed Occupancy Percentage: {bh_bed_occupancy_percentage:.2f}%")
-    print(f"Total Available Bed Nights: {bh_total_bed_nights}")
-    print(f"Total Adult Bed Nights: {bh_adult_bed_nights}")
-    print(f"Total Child Bed Nights: {bh_child_bed_nights}")
-    print(f"Bedroom Occupancy Percentage: {bh_room_occupancy_percentage:.2f}%")
-    print(f"Total Available Bedroom Nights: {bh_total_room_nights}")
-    print(f"Total Room Occupancy: {bh_occupied_room_days}")
-    
-    # --- Print People Served Statistics at the end ---
+    print(f"Analysis Period: {result.start_date} to {result.end_date}")
+    print(f"Total Days: {result.total_days}")
+
+    for house in (result.rosalie, result.brennen):
+        print(f"\n----- {house.house} -----")
+        print(f"Bed Occupancy Percentage: {house.bed_occupancy_percentage:.2f}%")
+        print(f"Total Available Bed Nights: {house.total_bed_nights}")
+        print(f"Total Adult Bed Nights: {house.adult_bed_nights}")
+        print(f"Total Child Bed Nights: {house.child_bed_nights}")
+        print(f"Bedroom Occupancy Percentage: {house.room_occupancy_percentage:.2f}%")
+        print(f"Total Available Bedroom Nights: {house.total_room_nights}")
+        print(f"Total Room Occupancy: {house.occupied_room_nights}")
+        if house.bed_conflicts:
+            print(f"Warning: {house.bed_conflicts} pairs of stays share a bed on the same night "
+                  f"(up to {house.peak_bed_concurrency} on one bed); occupancy may be overstated")
+
+    # --- People Served Statistics at the end ---
     print("\n----- People Served (Year Total) -----")
-    print("\nRosalie House:")
-    print(f"Total Unique Adults Served: {len(rh_unique_adults)}")
-    print(f"Total Unique Children Served: {len(rh_unique_children)}")
-    
-    print("\nBrennen House:")
-    print(f"Total Unique Adults Served: {len(bh_unique_adults)}")
-    print(f"Total Unique Children Served: {len(bh_unique_children)}")
-
-# --- Example Usage ---
+    for house in (result.rosalie, result.brennen):
+        print(f"\n{house.house}:")
+        print(f"Total Unique Adults Served: {house.unique_adults}")
+        print(f"Total Unique Children Served: {house.unique_children}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bed and room occupancy of both houses for a date range.")
+    parser.add_argument("occupancy_file", nargs="?", default="RileyEverything.csv", help="Occupancy export")
+    parser.add_argument("--start", default="2024-01-01", help="First day, YYYY-MM-DD (default: 2024-01-01)")
+    parser.add_argument("--end", default="2024-12-31", help="Last day, YYYY-MM-DD (default: 2024-12-31)")
+    parser.add_argument("--period", help="Reporting period instead of --start/--end, e.g. 2025-Q1 or FY2025")
+    args = parser.parse_args()
+    if args.period:
+        _, start, end = parse_period(args.period)
+        args.start, args.end = start.isoformat(), end.isoformat()
+    calculate_occupancy(args.occupancy_file, args.start, args.end)
+
+
 if __name__ == "__main__":
-    occupancy_file_path = r"C:\Users\jurbany\Desktop\BrennenBedPercent\RileyEverything.csv"
-    start_date = "2024-01-01"
-    end_date = "2024-12-31"
-    calculate_occupancy(occupancy_file_path, start_date, end_date)
\ No newline at end of file
+    main()
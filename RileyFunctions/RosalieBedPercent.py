@@ -1,7 +1,17 @@
-import pandas as pd
+import argparse
+import os
+import sys
 from datetime import datetime
 
-def calculate_rh_bed_occupancy(occupancy_file, start_date_str, end_date_str, total_beds=18):
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for svdp
+
+from svdp.capacity import default_capacity
+from svdp.results import BedOccupancy
+from svdp.schema import load_export
+
+def calculate_rh_bed_occupancy(occupancy_file, start_date_str, end_date_str, total_beds=None, show=True):
     """
     Calculates bed occupancy statistics for Rosalie House from a CSV file.
     Only considers occupancy entirely within the specified date range.
@@ -10,10 +20,12 @@ def calculate_rh_bed_occupancy(occupancy_file, start_date_str, end_date_str, tot
         occupancy_file (str): Path to the occupancy CSV file.
         start_date_str (str): Start date for analysis (YYYY-MM-DD).
         end_date_str (str): End date for analysis (YYYY-MM-DD).
-        total_beds (int, optional): Total number of beds in Rosalie House. Defaults to 18.
+        total_beds (int, optional): Total number of beds in Rosalie House. Defaults to
+            the beds in svdp.capacity (18) for each day of the period.
+        show (bool, optional): Print the statistics (print_rh_bed_occupancy). Defaults to True.
 
     Returns:
-        tuple: (occupancy_percentage, total_bed_nights, adult_bed_nights, child_bed_nights, start_date_str, end_date_str)
+        svdp.results.BedOccupancy, or None if the dates or file could not be read.
     """
 
     try:
@@ -21,31 +33,25 @@ def calculate_rh_bed_occupancy(occupancy_file, start_date_str, end_date_str, tot
         end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
     except ValueError:
         print("Error: Invalid date format. Use YYYY-MM-DD.")
-        return None, None, None, None, None, None
+        return
 
     try:
-        df = pd.read_csv(occupancy_file, encoding='utf-8')
-        df = df.rename(columns={
-            'Program Enrollment Name': 'program_name',
-            'Bed: Bed Number': 'bed_name',
-            'Sexual Orientation': 'sexual_orientation',
-            'Entry Date': 'entry_date',
-            'Exit Date': 'exit_date',
-            'Age': 'age'
-        })
-        df['entry_date'] = pd.to_datetime(df['entry_date'], errors='coerce')
-        df['exit_date'] = pd.to_datetime(df['exit_date'], errors='coerce')
-        df['is_adult'] = df['age'] >= 18
+        df = load_export(occupancy_file, 'riley_everything', columns=['entry_date', 'exit_date', 'age'],
+                         encoding='utf-8')
+        df['is_adult'] = (df['age'] >= 18).fillna(False)
         df = df.dropna(subset=['entry_date', 'exit_date'])
     except FileNotFoundError:
         print(f"Error: File not found: {occupancy_file}")
-        return None, None, None, None, None, None
+        return
     except Exception as e:
         print(f"Error processing {occupancy_file}: {e}")
-        return None, None, None, None, None, None
+        return
 
     total_days = (end_date - start_date).days + 1
-    total_bed_nights = total_beds * total_days
+    if total_beds is None:
+        total_bed_nights = default_capacity().available_nights('RH', 'beds', start_date, end_date)
+    else:
+        total_bed_nights = total_beds * total_days
 
     occupied_bed_days = 0
     adult_bed_nights = 0
@@ -68,42 +74,48 @@ def calculate_rh_bed_occupancy(occupancy_file, start_date_str, end_date_str, tot
 
     occupancy_percentage = (occupied_bed_days / total_bed_nights) * 100 if total_bed_nights > 0 else 0.0
 
-    return occupancy_percentage, total_bed_nights, adult_bed_nights, child_bed_nights, start_date_str, end_date_str
+    result = BedOccupancy(occupancy_percentage, total_bed_nights, adult_bed_nights, child_bed_nights)
+    if show:
+        print_rh_bed_occupancy(result, start_date_str, end_date_str)
+    return result
 
 
-# --- Example Usage ---
-if __name__ == "__main__":
-    occupancy_file_path_2024 = r"C:\Users\jurbany\Desktop\BrennenBedPercent\RH18-24LastYR.csv"
-    occupancy_file_path_2025 = r"C:\Users\jurbany\Desktop\BrennenBedPercent\RH2025.csv"
+def print_rh_bed_occupancy(result, start_date_str, end_date_str):
+    """Prints a BedOccupancy for the period in the report's console layout."""
+    print(f"Rosalie House Occupancy Data from: {start_date_str} to {end_date_str}")
+    print(f"Bed Occupancy Percentage: {result.occupancy_percentage:.2f}%")
+    print(f"Total Available Bed Nights: {result.total_bed_nights}")
+    print(f"Total Adult Bed Nights: {result.adult_bed_nights}")
+    print(f"Total Child Bed Nights: {result.child_bed_nights}")
+    print(f"Combined Adult and Child Bed Nights: {result.adult_bed_nights + result.child_bed_nights}")
+
 
-    total_beds = 18
+def main():
+    parser = argparse.ArgumentParser(description="Rosalie House bed occupancy for Sept-Dec 2024 and Jan-Jun 2025.")
+    parser.add_argument("file_2024", nargs="?", default="RH18-24LastYR.csv", help="Occupancy export covering 2024")
+    parser.add_argument("file_2025", nargs="?", default="RH2025.csv", help="Occupancy export covering 2025")
+    args = parser.parse_args()
+    occupancy_file_path_2024 = args.file_2024
+    occupancy_file_path_2025 = args.file_2025
 
     # --- 2024 Data (Sept 1 to December 31) ---
     start_date_2024 = "2024-09-01"
     end_date_2024 = "2024-12-31"
-    (occupancy_percentage_2024, total_bed_nights_2024, adult_bed_nights_2024, child_bed_nights_2024, start_date_str_2024, end_date_str_2024) = \
-        calculate_rh_bed_occupancy(occupancy_file_path_2024, start_date_2024, end_date_2024, total_beds)
+    result_2024 = calculate_rh_bed_occupancy(occupancy_file_path_2024, start_date_2024, end_date_2024, show=False)
 
-    if occupancy_percentage_2024 is not None:
+    if result_2024 is not None:
         print("----- 2024 Data (Sept 1 to December 31) -----")
-        print(f"Rosalie House Occupancy Data from: {start_date_str_2024} to {end_date_str_2024}")
-        print(f"Bed Occupancy Percentage: {occupancy_percentage_2024:.2f}%")
-        print(f"Total Available Bed Nights: {total_bed_nights_2024}")
-        print(f"Total Adult Bed Nights: {adult_bed_nights_2024}")
-        print(f"Total Child Bed Nights: {child_bed_nights_2024}")
-        print(f"Combined Adult and Child Bed Nights: {adult_bed_nights_2024 + child_bed_nights_2024}")
+        print_rh_bed_occupancy(result_2024, start_date_2024, end_date_2024)
 
     # --- 2025 Data (First 6 Months) ---
     start_date_2025 = "2025-01-01"
     end_date_2025 = "2025-06-30"
-    (occupancy_percentage_2025, total_bed_nights_2025, adult_bed_nights_2025, child_bed_nights_2025, start_date_str_2025, end_date_str_2025) = \
-        calculate_rh_bed_occupancy(occupancy_file_path_2025, start_date_2025, end_date_2025, total_beds)
+    result_2025 = calculate_rh_bed_occupancy(occupancy_file_path_2025, start_date_2025, end_date_2025, show=False)
 
-    if occupancy_percentage_2025 is not None:
+    if result_2025 is not None:
         print("\n----- 2025 Data (First 6 Months) -----")
-        print(f"Rosalie House Occupancy Data from: {start_date_str_2025} to {end_date_str_2025}")
-        print(f"Bed Occupancy Percentage: {occupancy_percentage_2025:.2f}%")
-        print(f"Total Available Bed Nights: {total_bed_nights_2025}")
-        print(f"Total Adult Bed Nights: {adult_bed_nights_2025}")
-        print(f"Total Child Bed Nights: {child_bed_nights_2025}")
-        print(f"Combined Adult and Child Bed Nights: {adult_bed_nights_2025 + child_bed_nights_2025}")
\ No newline at end of file
+        print_rh_bed_occupancy(result_2025, start_date_2025, end_date_2025)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,17 @@
-import pandas as pd
+import argparse
+import os
+import sys
 from datetime import datetime
 
-def calculate_rh_room_occupancy(occupancy_file, start_date_str, end_date_str):
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for svdp
+
+from svdp import compression
+from svdp.capacity import default_capacity
+from svdp.results import RoomOccupancy
+
+def calculate_rh_room_occupancy(occupancy_file, start_date_str, end_date_str, show=True):
     """
     Calculates room occupancy statistics for Rosalie House from a CSV file.
 
@@ -9,9 +19,10 @@ def calculate_rh_room_occupancy(occupancy_file, start_date_str, end_date_str):
         occupancy_file (str): Path to the occupancy CSV file.
         start_date_str (str): Start date for analysis (YYYY-MM-DD).
         end_date_str (str): End date for analysis (YYYY-MM-DD).
+        show (bool, optional): Print the statistics (print_rh_room_occupancy). Defaults to True.
 
     Returns:
-        tuple: (total_room_nights, occupied_room_nights, room_occupancy_percentage)
+        svdp.results.RoomOccupancy, or None if the dates or file could not be read.
     """
 
     try:
@@ -19,10 +30,10 @@ def calculate_rh_room_occupancy(occupancy_file, start_date_str, end_date_str):
         end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
     except ValueError:
         print("Error: Invalid date format. Use YYYY-MM-DD.")
-        return None, None, None
+        return
 
     try:
-        df = pd.read_csv(occupancy_file, encoding='utf-8')  # Specify encoding
+        df = compression.read_csv(occupancy_file, encoding='utf-8')  # Specify encoding
         df = df.rename(columns={
             'Program Enrollment Name': 'program_name',
             'Bed: Bed Number': 'bed_name',  # Updated column name
@@ -37,16 +48,13 @@ def calculate_rh_room_occupancy(occupancy_file, start_date_str, end_date_str):
         df = df.dropna(subset=['entry_date', 'exit_date']) # Remove rows with invalid date
     except FileNotFoundError:
         print(f"Error: File not found: {occupancy_file}")
-        return None, None, None
+        return
     except Exception as e:
         print(f"Error processing {occupancy_file}: {e}")
-        return None, None, None
-
-    total_days = (end_date - start_date).days + 1
+        return
 
-    # Calculate room occupancy
-    total_rooms = 6
-    total_room_nights = total_rooms * total_days
+    # Calculate room occupancy; room nights available come from svdp.capacity (6 rooms)
+    total_room_nights = default_capacity().available_nights('RH', 'rooms', start_date, end_date)
     occupied_rooms_per_day = {}  # Dictionary to track occupied rooms for each day
 
     for index, row in df.iterrows():
@@ -81,13 +89,26 @@ def calculate_rh_room_occupancy(occupancy_file, start_date_str, end_date_str):
     occupied_room_nights = sum(len(rooms) for rooms in occupied_rooms_per_day.values())
     room_occupancy_percentage = (occupied_room_nights / total_room_nights) * 100 if total_room_nights > 0 else 0.0
 
-    return total_room_nights, occupied_room_nights, room_occupancy_percentage
+    result = RoomOccupancy(total_room_nights, occupied_room_nights, room_occupancy_percentage)
+    if show:
+        print_rh_room_occupancy(result, "")
+    return result
 
 
-# --- Example Usage ---
-if __name__ == "__main__":
-    occupancy_file_path_2024 = r"C:\Users\jurbany\Desktop\BrennenBedPercent\RH18-24LastYR.csv"  # Updated file path
-    occupancy_file_path_2025 = r"C:\Users\jurbany\Desktop\BrennenBedPercent\RH2025.csv" #New 2025 data
+def print_rh_room_occupancy(result, period):
+    """Prints a RoomOccupancy in the report's console layout; ``period`` labels each line, e.g. " (2024)"."""
+    print(f"Total Available Room Nights{period}: {result.total_room_nights}")
+    print(f"Total Occupied Room Nights{period}: {result.occupied_room_nights}")
+    print(f"Room Occupancy Percentage{period}: {result.room_occupancy_percentage:.2f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rosalie House room occupancy for 2024 and Jan-Jun 2025.")
+    parser.add_argument("file_2024", nargs="?", default="RH18-24LastYR.csv", help="Occupancy export covering 2024")
+    parser.add_argument("file_2025", nargs="?", default="RH2025.csv", help="Occupancy export covering 2025")
+    args = parser.parse_args()
+    occupancy_file_path_2024 = args.file_2024
+    occupancy_file_path_2025 = args.file_2025 #New 2025 data
     start_date = "2024-01-01"
     end_date = "2024-12-31"
 
@@ -95,19 +116,19 @@ if __name__ == "__main__":
     end_date_2025 = "2025-06-30" #end of 2025-- changed to june 30 for 6 month
 
     #Process 2024 data
-    total_room_nights_2024, occupied_room_nights_2024, room_occupancy_percentage_2024 = calculate_rh_room_occupancy(occupancy_file_path_2024, start_date, end_date)
+    result_2024 = calculate_rh_room_occupancy(occupancy_file_path_2024, start_date, end_date, show=False)
 
-    if total_room_nights_2024 is not None:
+    if result_2024 is not None:
         print("-----2024 Data-----")
-        print(f"Total Available Room Nights (2024): {total_room_nights_2024}")
-        print(f"Total Occupied Room Nights (2024): {occupied_room_nights_2024}")
-        print(f"Room Occupancy Percentage (2024): {room_occupancy_percentage_2024:.2f}%")
+        print_rh_room_occupancy(result_2024, " (2024)")
 
     #Process 2025 data
-    total_room_nights_2025, occupied_room_nights_2025, room_occupancy_percentage_2025 = calculate_rh_room_occupancy(occupancy_file_path_2025, start_date_2025, end_date_2025)
+    result_2025 = calculate_rh_room_occupancy(occupancy_file_path_2025, start_date_2025, end_date_2025, show=False)
 
-    if total_room_nights_2025 is not None:
+    if result_2025 is not None:
         print("-----2025 Data (First 6 Months)-----")
-        print(f"Total Available Room Nights (2025 - First 6 Months): {total_room_nights_2025}")
-        print(f"Total Occupied Room Nights (2025 - First 6 Months): {occupied_room_nights_2025}")
-        print(f"Room Occupancy Percentage (2025 - First 6 Months): {room_occupancy_percentage_2025:.2f}%")
\ No newline at end of file
+        print_rh_room_occupancy(result_2025, " (2025 - First 6 Months)")
+
+
+if __name__ == "__main__":
+    main()
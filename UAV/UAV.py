@@ -1,83 +1,90 @@
+import argparse
 import csv
-from datetime import datetime
+import os
+import sys
 
-def sort_uav_data(filename="UAV.csv"):
-    january_data = []
-    february_data = []
-    march_data = []
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for svdp
+
+from svdp import compression, dates
+from svdp.buckets import GRANULARITIES, BucketCounter
+from svdp.clientids import client_ids
+from svdp.diagnostics import Issues
+
+
+def sort_uav_data(filename="UAV.csv", granularity="month", members_file=None):
+    """
+    Deduplicates UAV entries by "Full Name" and counts them per calendar bucket.
+
+    Each person is counted once, in the bucket of their first "Start Date/Time"
+    in the file. Works for any span of dates; buckets are created as they show up.
+
+    Args:
+        filename (str, optional): The UAV export to read. Defaults to "UAV.csv".
+        granularity (str, optional): "day", "week", "month", "quarter" or
+            "fiscal_year". Defaults to "month".
+        members_file (str, optional): If given, each unique entry (Bucket, Full Name,
+            Exit Reason) is streamed to this CSV as it is found.
+
+    Returns:
+        dict: Bucket label -> number of unique entries, in chronological order.
+              Returns None if the file is missing or a column is absent.
+    """
     total_lines = 0
-    unique_entries = {}  # Dictionary to track unique entries
+    ids = client_ids()
+    seen_ids = set()  # Client IDs already counted (svdp.clientids)
+    issues = Issues(filename, {'bad_date': "Could not parse 'Start Date/Time'; row skipped"})
 
     try:
-        with open(filename, 'r', newline='') as csvfile:
+        with compression.open_text(filename, newline='') as csvfile:
             reader = csv.DictReader(csvfile)
-            for row in reader:
-                total_lines += 1
-                try:
-                    start_date_str = row["Start Date/Time"]
-                    date_format = '%m/%d/%Y, %I:%M %p'
-                    start_date = datetime.strptime(start_date_str, date_format)
-                    month = start_date.month
-
-                    # Deduplicate based on "Full Name"
-                    full_name = row["Full Name"]
-
-                    if full_name not in unique_entries:
-                        # Store ONLY the Full Name and Exit Reason
-                        unique_entries[full_name] = {"Full Name": row["Full Name"], "Exit Reason": row["Exit Reason"]}
-
-                        if month == 1:
-                            january_data.append(unique_entries[full_name])
-                        elif month == 2:
-                            february_data.append(unique_entries[full_name])
-                        elif month == 3:
-                            march_data.append(unique_entries[full_name])
-
-                except ValueError as e:
-                    print(f"ValueError: Could not parse date '{start_date_str}' in row: {row}. Error: {e}")
-                except KeyError as e:
-                    print(f"KeyError: Missing column in CSV: {e}")
-                    return None
+            with BucketCounter(granularity, members_file=members_file,
+                               fieldnames=["Full Name", "Exit Reason"]) as buckets:
+                for index, row in enumerate(reader):
+                    total_lines += 1
+                    try:
+                        start_date_str = row["Start Date/Time"]
+                        date_format = '%m/%d/%Y, %I:%M %p'
+                        start_date = dates.strptime(start_date_str, date_format)  # memoized
+
+                        # Deduplicate based on "Full Name"
+                        full_name = row["Full Name"]
+                        client_id = ids.id_of(full_name)
+
+                        if client_id not in seen_ids:
+                            seen_ids.add(client_id)
+                            # Store ONLY the Full Name and Exit Reason
+                            buckets.add(start_date, {"Full Name": full_name, "Exit Reason": row["Exit Reason"]})
+
+                    except ValueError:
+                        issues.add('bad_date', index, start_date_str)
+                    except KeyError as e:
+                        print(f"KeyError: Missing column in CSV: {e}")
+                        return None
 
     except FileNotFoundError:
         print(f"Error: The file '{filename}' was not found.")
         return None
 
+    issues.report()
     print(f"Total lines in CSV: {total_lines}")
-    return january_data, february_data, march_data
-
-def write_to_csv(data, filename="unique_uav_data.csv"):
-    """Writes the unique data to a CSV file, including the 'Exit Reason'."""
-    if not data:
-        print("No data to write to CSV.")
-        return
-
-    fieldnames = ["Full Name", "Exit Reason"]  # Only these two columns
-
-    try:
-        with open(filename, 'w', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(data)
-        print(f"Successfully wrote unique data to '{filename}'")
-    except Exception as e:
-        print(f"Error writing to CSV: {e}")
+    return dict(buckets.sorted_counts())
 
 
 def main():
-    data = sort_uav_data()
-    if data is not None:
-        january_data, february_data, march_data = data
-
-        print(f"Number of entries in January: {len(january_data)}")
-        print(f"Number of entries in February: {len(february_data)}")
-        print(f"Number of entries in March: {len(march_data)}")
+    parser = argparse.ArgumentParser(description="Count unique UAV entries per calendar period.")
+    parser.add_argument("input_csv", nargs="?", default="UAV.csv", help="Path to the UAV export")
+    parser.add_argument("--by", choices=GRANULARITIES, default="month", help="Bucket size (default: month)")
+    parser.add_argument("--output", default="unique_uav_data.csv", help="CSV of unique entries per bucket")
+    args = parser.parse_args()
 
-        all_unique_data = january_data + february_data + march_data
-        print(f"Total number of unique entries: {len(all_unique_data)}")
+    counts = sort_uav_data(args.input_csv, args.by, args.output)
+    if counts is not None:
+        for label, count in counts.items():
+            print(f"Number of entries in {label}: {count}")
 
-        write_to_csv(all_unique_data)
+        print(f"Total number of unique entries: {sum(counts.values())}")
+        print(f"Successfully wrote unique data to '{args.output}'")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
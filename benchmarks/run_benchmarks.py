@@ -0,0 +1,257 @@
+"""
+Times the report functions on synthetic exports (see synth.py).
+
+For each scale the exports are generated into a scratch folder, then every
+benchmark runs there with its console output swallowed, the result cache off
+and client IDs kept in memory (ISOLATED_ENV), so repeat runs time the work
+rather than cache hits. Each result records wall time, rows read per second
+and the tracemalloc peak of a separate, untimed run. Results can be saved
+as a JSON baseline and a later run compared against it.
+
+Usage:
+    python benchmarks/run_benchmarks.py --scales 10 100 --save baseline.json
+    python benchmarks/run_benchmarks.py --scales 10 100 --compare baseline.json
+    python benchmarks/run_benchmarks.py --only process_envoy_data find_dcpr_in_ce
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)  # for svdp
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))  # for synth
+
+import synth  # noqa: E402
+
+_modules = {}
+
+# Set while the benchmarks run: seeded data is identical between runs, so a warm cache would time hits.
+ISOLATED_ENV = {'SVDP_NO_CACHE': '1', 'SVDP_NO_ID_STORE': '1'}
+
+
+def _script(relative_path):
+    """Imports a repo script by path (the folders have spaces and digits in their names)."""
+    if relative_path not in _modules:
+        path = os.path.join(REPO_ROOT, relative_path)
+        name = "bench_" + os.path.splitext(os.path.basename(path))[0]
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[relative_path] = module
+    return _modules[relative_path]
+
+
+def _riley(name):
+    return _script(os.path.join("RileyFunctions", name))
+
+
+def _monthly_batch():
+    from svdp.pipeline import run_reports
+    from svdp.reports import monthly_batch
+    return run_reports(monthly_batch(".", "2025-01-01", "2025-03-31", render=None))
+
+
+# name -> (input files, callable). Every callable runs in the data folder.
+BENCHMARKS = {
+    'calculate_occupancy': (["RileyEverything.csv"], lambda: _riley("RileyEverything.py").calculate_occupancy(
+        "RileyEverything.csv", "2025-01-01", "2025-03-31")),
+    'calculate_bed_occupancy': (["BHoccupancy.csv"], lambda: _riley("BrennenBedPercent.py").calculate_bed_occupancy(
+        "BHoccupancy.csv", "2025-01-01", "2025-03-31")),
+    'calculate_rh_bed_occupancy': (["RH2025.csv"], lambda: _riley("RosalieBedPercent.py").calculate_rh_bed_occupancy(
+        "RH2025.csv", "2025-01-01", "2025-03-31")),
+    'calculate_rh_room_occupancy': (["RH2025.csv"], lambda: _riley("RosalieRoomPercent.py")
+                                    .calculate_rh_room_occupancy("RH2025.csv", "2025-01-01", "2025-03-31")),
+    'bh_quarterly_bed_nights': (["BHQuarterly.csv"], lambda: _riley("BHQuarterlyReportBedNights.py")
+                                .calculate_brennen_house_nights("BHQuarterly.csv")),
+    'bh_room_nights': (["BHQuarterly.csv"], lambda: _riley("BrennenRoomPercent.py")
+                       .calculate_brennen_house_nights("BHQuarterly.csv")),
+    'rh_quarterly_bed_nights': (["RHQuarterly.csv"], lambda: _riley("RHQuarterlyReportBedNights.py")
+                                .calculate_rosalie_house_nights("RHQuarterly.csv")),
+    'analyze_enrollment': (["PmtNewEnrollment.csv"], lambda: _riley("PmtNewEnrollment.py").analyze_enrollment()),
+    'analyze_gender_by_house': (["PmtNewGender.csv"], lambda: _riley("PmtNewGender.py").analyze_gender_by_house()),
+    'violence_ovtpmt': (["OVTPMTabuse.csv"], lambda: _riley("OVTPMTabuse.py")
+                        .analyze_violence_from_csv("OVTPMTabuse.csv")),
+    'violence_by_house': (["RHHistoryOfViolence.csv", "BHHistoryOfViolence.csv"],
+                          lambda: _riley("RHHistoryofViolence.py").main()),
+    'monthly_batch': (["BHQuarterly.csv", "RHQuarterly.csv", "PmtNewGender.csv", "PmtNewEnrollment.csv",
+                       "OVTPMTabuse.csv", "RHHistoryOfViolence.csv", "BHHistoryOfViolence.csv"], _monthly_batch),
+    'analyze_990_report': (["BrennanAll.csv", "RosalieAll.csv"], lambda: _script(os.path.join("990", "990.py"))
+                           .analyze_990_report()),
+    'process_envoy_data': (["V-Mar18-Apr23.csv"], lambda: _script(os.path.join("Envoy visitors", "EnvoyDuplicates.py"))
+                           .process_envoy_data("V-Mar18-Apr23.csv", "UniqueEntries.csv",
+                                               date(2025, 3, 18), date(2025, 4, 23))),
+    'find_dcpr_in_ce': (["CE.csv", "DCPR.csv"], lambda: _script(os.path.join("DC", "find_dcpr_in_ce.py"))
+                        .find_dcpr_in_ce()),
+    'sort_uav_data': (["UAV.csv"], lambda: _script(os.path.join("UAV", "UAV.py")).sort_uav_data()),
+    'count_calls_in_date_range': (["CrisisLineReport.csv"], lambda: _script(os.path.join("CrisisLine", "Crisisline.py"))
+                                  .count_calls_in_date_range()),
+    'analyze_marykrosalie_data': (["MaryKRosalie.csv"], lambda: _script(os.path.join("Marykay", "MaryKRosalie.py"))
+                                  .analyze_marykrosalie_data()),
+    'marykbren': (["MaryKBren.csv"], lambda: _script(os.path.join("Marykay", "MaryKBren.py")).analyze_marykbren_data()),
+}
+
+
+SCRIPTS = [os.path.join("RileyFunctions", name) for name in (
+    "RileyEverything.py", "BrennenBedPercent.py", "RosalieBedPercent.py", "RosalieRoomPercent.py",
+    "BHQuarterlyReportBedNights.py", "BrennenRoomPercent.py", "RHQuarterlyReportBedNights.py",
+    "PmtNewEnrollment.py", "PmtNewGender.py", "OVTPMTabuse.py", "RHHistoryofViolence.py")] + [
+    os.path.join("990", "990.py"), os.path.join("Envoy visitors", "EnvoyDuplicates.py"),
+    os.path.join("DC", "find_dcpr_in_ce.py"), os.path.join("UAV", "UAV.py"),
+    os.path.join("CrisisLine", "Crisisline.py"), os.path.join("Marykay", "MaryKRosalie.py"),
+    os.path.join("Marykay", "MaryKBren.py")]
+
+
+def preload():
+    """Imports every script (and pandas with them) so import time is not charged to the first benchmark."""
+    import svdp.pipeline  # noqa: F401
+    import svdp.reports  # noqa: F401
+    for relative_path in SCRIPTS:
+        _script(relative_path)
+
+
+def _rows(files, rows_written):
+    return sum(rows_written.get(name, 0) for name in files)
+
+
+def _call(func):
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+    except BaseException as e:  # scripts call exit() on errors
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def run_one(func, repeat=1):
+    """
+    Runs ``func`` ``repeat`` times with stdout swallowed, then once more under
+    tracemalloc. The timed runs are not traced, since tracing slows down every
+    allocation and would inflate the times.
+
+    Returns:
+        dict: seconds (best of the timed runs), peak_memory_bytes (tracemalloc
+              peak of the extra run) and error (None, or the exception text).
+    """
+    best = None
+    error = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        error = _call(func) or error
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        error = _call(func) or error
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': best, 'peak_memory_bytes': peak, 'error': error}
+
+
+@contextlib.contextmanager
+def _isolated_env():
+    saved = {name: os.environ.get(name) for name in ISOLATED_ENV}
+    os.environ.update(ISOLATED_ENV)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def run_suite(scales, only=None, repeat=1, seed=0, keep_dir=None):
+    """
+    Generates data for each scale and runs the benchmarks on it.
+
+    Returns:
+        dict: {'meta': {...}, 'results': {"name@scale": {...}}}
+    """
+    names = [name for name in BENCHMARKS if not only or name in only]
+    results = {}
+    cwd = os.getcwd()
+    preload()
+    with _isolated_env():
+        for scale in scales:
+            with tempfile.TemporaryDirectory() as scratch:
+                data_dir = os.path.join(keep_dir, f"scale{scale}") if keep_dir else scratch
+                rows_written = synth.generate_all(data_dir, scale=scale, seed=seed)
+                os.chdir(data_dir)
+                try:
+                    for name in names:
+                        files, func = BENCHMARKS[name]
+                        result = run_one(func, repeat)
+                        rows = _rows(files, rows_written)
+                        result['rows'] = rows
+                        result['rows_per_second'] = rows / result['seconds'] if result['seconds'] else None
+                        results[f"{name}@{scale}"] = result
+                        status = f"  ERROR {result['error']}" if result['error'] else ""
+                        print(f"{name:<28} x{scale:<6} {result['seconds']:8.3f}s  "
+                              f"{result['peak_memory_bytes'] / 2 ** 20:8.1f} MiB  {rows:>9} rows{status}")
+                finally:
+                    os.chdir(cwd)
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+            'scales': list(scales),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline):
+    """Prints time and memory ratios (current / baseline) for benchmarks present in both runs."""
+    print(f"\n{'benchmark':<36} {'time':>10} {'ratio':>7} {'memory':>10} {'ratio':>7}")
+    for key, result in current['results'].items():
+        old = baseline['results'].get(key)
+        if old is None or result['error'] or old['error']:
+            continue
+        time_ratio = result['seconds'] / old['seconds'] if old['seconds'] else float('nan')
+        memory_ratio = (result['peak_memory_bytes'] / old['peak_memory_bytes']
+                        if old['peak_memory_bytes'] else float('nan'))
+        print(f"{key:<36} {result['seconds']:9.3f}s {time_ratio:6.2f}x "
+              f"{result['peak_memory_bytes'] / 2 ** 20:7.1f}MiB {memory_ratio:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the report functions on synthetic exports.")
+    parser.add_argument("--scales", type=float, nargs="+", default=[10], help="Data scales (1 = BASE_ROWS)")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per benchmark; the best time is kept")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic data")
+    parser.add_argument("--keep-data", metavar="DIR", help="Write the synthetic exports here instead of a temp folder")
+    parser.add_argument("--save", metavar="JSON", help="Write the results to this file")
+    parser.add_argument("--compare", metavar="JSON", help="Compare against a saved baseline")
+    args = parser.parse_args()
+
+    scales = [int(scale) if float(scale).is_integer() else scale for scale in args.scales]
+    report = run_suite(scales, args.only, args.repeat, args.seed, args.keep_data)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.save}")
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
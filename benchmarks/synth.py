@@ -0,0 +1,238 @@
+"""
+Seeded synthetic exports for benchmarking.
+
+Writes every CSV the report scripts read, with the same headers and value
+formats as the real exports: stays with bed labels like "BH Rm 12-A", blank
+and decimal ages, missing exit dates, multi-label violence histories, Envoy
+sign-in times in all the formats EnvoyDuplicates.py handles, CE title rows
+above the header and the 'Unique\\nIdentifier' header in DCPR. Nothing here is
+real client data.
+
+Usage:
+    python benchmarks/synth.py OUTPUT_DIR [--scale 10] [--seed 0]
+"""
+
+import argparse
+import csv
+import os
+import random
+from datetime import date, datetime, timedelta
+
+# Rows per export at scale 1, roughly one house-year of real data.
+BASE_ROWS = {
+    'stays': 1000,
+    'pmt': 300,
+    'violence': 300,
+    'envoy': 5000,
+    'ce': 2000,
+    'dcpr': 200,
+    'uav': 1500,
+    'crisis': 3000,
+}
+
+FIRST_NAMES = ("Maria", "James", "Aisha", "Wei", "Carlos", "Fatima", "John", "Olga", "Ngozi", "Luis",
+               "Emily", "Omar", "Grace", "Dmitri", "Keisha", "Tomas", "Priya", "Samuel", "Leila", "Ana")
+LAST_NAMES = ("Smith", "Garcia", "Nguyen", "Johnson", "Okafor", "Hernandez", "Kim", "Brown", "Lopez",
+              "Ivanova", "Williams", "Ali", "Martinez", "Chen", "Davis", "Patel", "Rodriguez", "Jones")
+RACES = ("White", "Black or African American", "Asian", "Native American or Alaskan Native",
+         "Hawaiian Native or Pacific Islander", "Multi-Racial", "Unknown", "Data not collected", "Other")
+ETHNICITIES = ("Hispanic", "Non-Hispanic", "Puerto Rican", "Guatemalan", "Chinese", "Afghan", "Samoan", "American")
+GENDERS = ("Female", "Female", "Female", "Male", "Male", "Transgender", "Non-binary")
+VIOLENCE = ("Physical Violence", "Physical Abuse", "Emotional Abuse", "Other/Unknown", "Sexual Assault",
+            "Neglect", "Witnessed Violence", "Elder Abuse", "Trafficked")
+EXIT_REASONS = ("Completed program", "Found housing", "Left voluntarily", "Rule violation", "Other", "")
+STAY_HEADER = ['Program Enrollment Name', 'Bed: Bed Number', 'Bed Assignment Name', 'Full Name', 'Age',
+               'Sexual Orientation', 'Other Exit Reason', 'Nationality/Race/Ethnicity', 'Gender',
+               'Entry Date', 'Exit Date', 'Exit Reason', 'Race', 'Start Date/Time', 'Bed Transfer']
+
+FIRST_DAY = date(2022, 7, 1)
+LAST_DAY = date(2025, 6, 30)
+
+
+def _people(rng, count):
+    """Distinct-looking names; the pool is smaller than the row count so people repeat."""
+    return [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index:05d}" for index in range(count)]
+
+
+def _day(rng, first=FIRST_DAY, last=LAST_DAY):
+    return first + timedelta(days=rng.randint(0, (last - first).days))
+
+
+def _age(rng):
+    value = rng.choice((rng.randint(0, 17), rng.randint(18, 85), rng.randint(18, 50)))
+    roll = rng.random()
+    if roll < 0.02:
+        return ""
+    if roll < 0.05:
+        return f"{value}.0"
+    return str(value)
+
+
+def _bed(rng, house):
+    if house == "RH":
+        return f"RH Rm {rng.randint(1, 6)}-{rng.choice('ABC')}"
+    return f"BH Rm {rng.randint(5, 16)}-{rng.choice('AB')}"
+
+
+def _write(path, header, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def stay_rows(rng, count, houses=("RH", "BH")):
+    """Rows in the HMIS stay layout (STAY_HEADER)."""
+    people = _people(rng, max(count // 2, 1))
+    rows = []
+    for _ in range(count):
+        house = rng.choice(houses)
+        entry = _day(rng)
+        exit_ = entry + timedelta(days=min(int(rng.expovariate(1 / 45)), 400))
+        start_time = datetime.combine(entry, datetime.min.time()) + timedelta(minutes=rng.randint(420, 1260))
+        rows.append([
+            "Brennen House Shelter" if house == "BH" else "Rosalie House Shelter",
+            _bed(rng, house),
+            f"{house} Bed {rng.randint(1, 32)}",
+            rng.choice(people),
+            _age(rng),
+            rng.choice(("Heterosexual", "Gay", "Bisexual", "Data not collected")),
+            "",
+            rng.choice(ETHNICITIES),
+            rng.choice(GENDERS),
+            entry.strftime('%m/%d/%Y'),
+            "" if rng.random() < 0.05 else exit_.strftime('%m/%d/%Y'),
+            rng.choice(EXIT_REASONS),
+            rng.choice(RACES),
+            start_time.strftime('%m/%d/%Y, %I:%M %p'),
+            "Yes" if rng.random() < 0.08 else "",
+        ])
+    return rows
+
+
+def _violence(rng):
+    picked = rng.sample(VIOLENCE, rng.choice((0, 1, 1, 2, 2, 3, 4)))
+    if picked and rng.random() < 0.05:
+        picked.append(picked[0])  # the same type listed twice
+    return ";".join(picked)
+
+
+def _sign_in(rng, when):
+    """An Envoy sign-in time in one of the formats the export has used."""
+    roll = rng.random()
+    if roll < 0.4:
+        return when.strftime('%Y-%m-%dT%H:%M:%S') + "Z"
+    if roll < 0.6:
+        return when.strftime('%Y-%m-%d %H:%M:%S')
+    if roll < 0.8:
+        return when.strftime('%m/%d/%Y %I:%M:%S %p')
+    if roll < 0.99:
+        return when.strftime('%Y-%m-%d %H:%M:%S') + " UTC+0000"
+    return "not a date"
+
+
+def generate_all(out_dir, scale=1, seed=0):
+    """
+    Writes every export into ``out_dir``.
+
+    Args:
+        out_dir (str): Output folder (created if needed).
+        scale (int, optional): Multiplier on BASE_ROWS. Defaults to 1.
+        seed (int, optional): Random seed; the same seed gives the same files. Defaults to 0.
+
+    Returns:
+        dict: File name -> number of data rows written.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    rows_of = {kind: max(int(count * scale), 1) for kind, count in BASE_ROWS.items()}
+    written = {}
+
+    def save(name, header, rows):
+        _write(os.path.join(out_dir, name), header, rows)
+        written[name] = len(rows)
+
+    # --- HMIS stay exports ---
+    everything = stay_rows(rng, rows_of['stays'])
+    save("RileyEverything.csv", STAY_HEADER, everything)
+    save("BHoccupancy.csv", STAY_HEADER, [row for row in everything if row[1].startswith("BH")])
+    for name in ("RH18-24LastYR.csv", "RH2025.csv", "RosalieAll.csv", "RHQuarterly.csv"):
+        save(name, STAY_HEADER, stay_rows(rng, rows_of['stays'] // 2, houses=("RH",)))
+    for name in ("BrennanAll.csv", "BHQuarterly.csv"):
+        save(name, STAY_HEADER, stay_rows(rng, rows_of['stays'] // 2, houses=("BH",)))
+    for name in ("MaryKBren.csv", "MaryKRosalie.csv"):
+        rows = [row for row in stay_rows(rng, rows_of['stays'] // 2) if row[4]]  # the script needs ages
+        save(name, STAY_HEADER, rows)
+
+    # --- PMT exports ---
+    pmt_header = ['Bed Assignment Name', 'Full Name', 'Ethnicity', 'Age', 'Gender', 'History of Violence']
+    for name in ("PmtNewEnrollment.csv", "PmtNewGender.csv", "OVTPMTabuse.csv"):
+        people = _people(rng, rows_of['pmt'])
+        rows = [[f"{rng.choice(('BH', 'RH'))} Bed {rng.randint(1, 32)}", person, rng.choice(ETHNICITIES),
+                 rng.randint(0, 85), rng.choice(GENDERS), _violence(rng)] for person in people]
+        save(name, pmt_header, rows)
+    for name in ("RHHistoryOfViolence.csv", "BHHistoryOfViolence.csv"):
+        save(name, ['Full Name', 'History of Violence'],
+             [[person, _violence(rng)] for person in _people(rng, rows_of['violence'])])
+
+    # --- Envoy sign-ins (V-Mar18-Apr23.csv in the script's example) ---
+    visitors = _people(rng, max(rows_of['envoy'] // 6, 1))
+    dv_answer = {visitor: rng.choice(("Yes", "No", "No", "")) for visitor in visitors}
+    start = datetime(2025, 3, 18, 8)
+    rows = []
+    for _ in range(rows_of['envoy']):
+        visitor = rng.choice(visitors)
+        when = start + timedelta(days=rng.randint(0, 36), minutes=rng.randint(0, 600))
+        rows.append([visitor if rng.random() > 0.005 else "", _sign_in(rng, when),
+                     f"{visitor.split()[0].lower()}@example.org", "Front desk", dv_answer[visitor]])
+    rows.sort(key=lambda row: row[1])
+    save("V-Mar18-Apr23.csv",
+         ['name', 'sign_in_time', 'email', 'host', 'Are you a Domestic Violence survivor?\xa0'], rows)
+
+    # --- CE with title rows, and DCPR with a line break in its header ---
+    ids = [f"{rng.randint(0, 16 ** 8):08X}" for _ in range(rows_of['ce'])]
+    ce_path = os.path.join(out_dir, "CE.csv")
+    with open(ce_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Coordinated Entry Report"])
+        writer.writerow([f"Generated {date(2025, 4, 1):%m/%d/%Y}"])
+        writer.writerow([])
+        writer.writerow(['Unique Identifier', 'Full Name', 'Assessment Date', 'Score'])
+        for identifier in ids:
+            writer.writerow([f" {identifier} ", rng.choice(visitors), _day(rng).strftime('%m/%d/%Y'),
+                             rng.randint(0, 20)])
+    written["CE.csv"] = len(ids)
+    dcpr_ids = rng.sample(ids, min(rows_of['dcpr'], len(ids))) + \
+        [f"{rng.randint(0, 16 ** 8):08X}" for _ in range(rows_of['dcpr'] // 4)]
+    save("DCPR.csv", ['Unique\nIdentifier', 'Program'], [[f"{identifier} ", "DCPR"] for identifier in dcpr_ids])
+
+    # --- UAV log and crisis line ---
+    people = _people(rng, max(rows_of['uav'] // 2, 1))
+    rows = []
+    for _ in range(rows_of['uav']):
+        when = datetime.combine(_day(rng, date(2024, 1, 1), date(2025, 6, 30)), datetime.min.time()) + \
+            timedelta(minutes=rng.randint(0, 1439))
+        rows.append([rng.choice(people), when.strftime('%m/%d/%Y, %I:%M %p') if rng.random() > 0.01 else "bad",
+                     rng.choice(EXIT_REASONS)])
+    save("UAV.csv", ['Full Name', 'Start Date/Time', 'Exit Reason'], rows)
+
+    rows = [[f"C{index:07d}", _day(rng, date(2024, 7, 1), LAST_DAY).strftime('%m/%d/%Y'),
+             rng.choice(("Safety planning", "Shelter request", "Information", "Other")), "Hotline"]
+            for index in range(rows_of['crisis'])]
+    save("CrisisLineReport.csv", ['Call ID', 'Assessment Date', 'Call Type', 'Source'], rows)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic exports for benchmarking.")
+    parser.add_argument("out_dir", help="Folder to write the CSV files to")
+    parser.add_argument("--scale", type=float, default=1, help="Multiplier on the base row counts")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    for name, rows in generate_all(args.out_dir, args.scale, args.seed).items():
+        print(f"{name}: {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+Shared helpers for the SVdP reporting scripts.
+
+The report scripts in the sibling folders stay runnable on their own; the
+modules in this package hold the pieces several of them need. Submodules are
+imported directly (``from svdp import colscan``) so that importing the package
+itself stays cheap.
+"""
+
+__version__ = "0.1.0"
@@ -0,0 +1,5 @@
+"""python -m svdp COMMAND [ARGS]: see svdp.cli."""
+
+from svdp.cli import main
+
+main()
@@ -0,0 +1,129 @@
+"""
+Streaming calendar bucketing.
+
+Groups dated entries into day, week, month, quarter, year or fiscal-period
+buckets in a single pass. Only a count per bucket is kept in memory; the members of each
+bucket can be streamed straight to a CSV file as they arrive.
+
+bucket_label is the one place period labels are made; svdp.periods labels its
+calendars with it too.
+"""
+
+import csv
+
+GRANULARITIES = ('day', 'week', 'month', 'quarter', 'year', 'fiscal_month', 'fiscal_quarter', 'fiscal_year')
+
+# SVdP fiscal years run July 1 - June 30.
+FISCAL_YEAR_START_MONTH = 7
+
+
+def fiscal_year_of(when, fiscal_year_start=FISCAL_YEAR_START_MONTH):
+    """The fiscal year a date falls in, named for the calendar year it ends in."""
+    return when.year + 1 if when.month >= fiscal_year_start and fiscal_year_start > 1 else when.year
+
+
+def bucket_label(when, granularity='month', fiscal_year_start=FISCAL_YEAR_START_MONTH):
+    """
+    Returns the bucket label for a date.
+
+    Labels sort chronologically as plain strings:
+        day             2025-03-18
+        week            2025-W12     (ISO week)
+        month           2025-03
+        quarter         2025-Q1
+        year            2025
+        fiscal_month    FY2025-M09   (March is the 9th month of FY2025)
+        fiscal_quarter  FY2025-Q3
+        fiscal_year     FY2025       (named for the calendar year it ends in)
+
+    Args:
+        when (datetime.date or datetime.datetime): The date to bucket.
+        granularity (str, optional): One of GRANULARITIES. Defaults to "month".
+        fiscal_year_start (int, optional): Month the fiscal year starts in. Defaults to 7.
+
+    Returns:
+        str: The bucket label.
+    """
+    if granularity == 'day':
+        return f"{when.year:04d}-{when.month:02d}-{when.day:02d}"
+    if granularity == 'week':
+        iso_year, iso_week, _ = when.isocalendar()
+        return f"{iso_year:04d}-W{iso_week:02d}"
+    if granularity == 'month':
+        return f"{when.year:04d}-{when.month:02d}"
+    if granularity == 'quarter':
+        return f"{when.year:04d}-Q{(when.month - 1) // 3 + 1}"
+    if granularity == 'year':
+        return f"{when.year:04d}"
+    if granularity in ('fiscal_month', 'fiscal_quarter', 'fiscal_year'):
+        fiscal_year = fiscal_year_of(when, fiscal_year_start)
+        fiscal_month = (when.month - fiscal_year_start) % 12 + 1
+        if granularity == 'fiscal_month':
+            return f"FY{fiscal_year:04d}-M{fiscal_month:02d}"
+        if granularity == 'fiscal_quarter':
+            return f"FY{fiscal_year:04d}-Q{(fiscal_month - 1) // 3 + 1}"
+        return f"FY{fiscal_year:04d}"
+    raise ValueError(f"Unknown granularity '{granularity}'. Use one of: {', '.join(GRANULARITIES)}")
+
+
+class BucketCounter:
+    """
+    Counts entries per calendar bucket and optionally streams them to a CSV.
+
+    The members file gets a "Bucket" column followed by ``fieldnames``. Rows are
+    written as they are added, so memory stays at one counter per bucket no
+    matter how long the input is.
+
+    Use as a context manager so the members file is closed:
+
+        with BucketCounter('quarter', members_file='members.csv',
+                           fieldnames=['Full Name']) as buckets:
+            buckets.add(start_date, {'Full Name': name})
+        print(buckets.counts)
+    """
+
+    def __init__(self, granularity='month', members_file=None, fieldnames=None,
+                 fiscal_year_start=FISCAL_YEAR_START_MONTH):
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity '{granularity}'. Use one of: {', '.join(GRANULARITIES)}")
+        self.granularity = granularity
+        self.fiscal_year_start = fiscal_year_start
+        self.counts = {}
+        self._file = None
+        self._writer = None
+        if members_file is not None:
+            self._file = open(members_file, 'w', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._file, fieldnames=['Bucket'] + list(fieldnames or []),
+                                          extrasaction='ignore')
+            self._writer.writeheader()
+
+    def add(self, when, member=None):
+        """
+        Adds one entry dated ``when``; ``member`` (a dict) is written to the
+        members file if there is one. Returns the bucket label.
+        """
+        label = bucket_label(when, self.granularity, self.fiscal_year_start)
+        self.counts[label] = self.counts.get(label, 0) + 1
+        if self._writer is not None and member is not None:
+            self._writer.writerow({'Bucket': label, **member})
+        return label
+
+    def sorted_counts(self):
+        """Returns (label, count) pairs in chronological order."""
+        return sorted(self.counts.items())
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,256 @@
+"""
+Content-addressed cache of report results.
+
+A result is stored under a key made from the function, its parameters, a
+hash of every input export's contents and a hash of the code that computes
+it (the function's source file, every svdp module's source and
+svdp.__version__). Editing an export, the report code or any shared helper it
+calls (schema, dates, presence, ...) changes the key, so stale results are
+never returned; old entries simply age out.
+
+Results are pickled to files in a cache folder (``SVDP_CACHE_DIR``, default
+~/.cache/svdp) capped at ``max_bytes``: a hit touches the file and when the
+folder grows past the cap the least recently used files are deleted. An
+in-process LRU of unpickled results sits on top, so a repeat call in the same
+run does not even read the file. Set ``SVDP_NO_CACHE=1`` to bypass caching.
+
+    from svdp.cache import memoize
+
+    @memoize(files=('occupancy_file',))
+    def occupancy_report(occupancy_file, start_date_str, end_date_str):
+        ...
+
+None results are not cached, so a run that failed to read its file is retried.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+import svdp
+
+DEFAULT_MAX_BYTES = 512 * 2 ** 20
+DEFAULT_MEMORY_ITEMS = 128
+_HASH_BLOCK = 4 * 2 ** 20
+
+_digests = {}  # (path, size, mtime_ns) -> content hash, so unchanged files are hashed once per process
+_digest_lock = threading.Lock()
+
+
+def file_digest(path):
+    """BLAKE2b hash of a file's contents (remembered while its size and mtime are unchanged)."""
+    stat = os.stat(path)
+    stamp = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _digest_lock:
+        if stamp in _digests:
+            return _digests[stamp]
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b''):
+            digest.update(block)
+    value = digest.hexdigest()
+    with _digest_lock:
+        _digests[stamp] = value
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def _source_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=12).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def package_digest():
+    """Hash of the sources of every svdp module (read once per process)."""
+    directory = os.path.dirname(os.path.abspath(svdp.__file__))
+    digest = hashlib.blake2b(digest_size=12)
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.py'):
+            digest.update(name.encode('utf-8'))
+            digest.update(_source_digest(os.path.join(directory, name)).encode('ascii'))
+    return digest.hexdigest()
+
+
+def code_version(*funcs):
+    """Hash of the source files defining ``funcs``, of the svdp package sources and the svdp version."""
+    parts = [svdp.__version__, package_digest()]
+    for func in funcs:
+        if func is None:
+            continue
+        path = inspect.getsourcefile(func)
+        parts.append(_source_digest(path) if path else func.__qualname__)
+    return "-".join(parts)
+
+
+def make_key(name, params, files=(), version=""):
+    """
+    The cache key for one call.
+
+    Args:
+        name (str): Function identity, e.g. "module.qualname".
+        params (dict): Parameters other than the input files; must have a stable repr.
+        files (list): Input file paths; their contents, not their names, go into the key.
+        version (str): Code version, e.g. from code_version().
+    """
+    payload = json.dumps({
+        'name': name,
+        'params': {key: repr(value) for key, value in sorted(params.items())},
+        'files': [file_digest(path) for path in files],
+        'version': version,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _default_directory():
+    return os.environ.get('SVDP_CACHE_DIR') or os.path.join(os.path.expanduser("~"), ".cache", "svdp")
+
+
+class ResultCache:
+    """
+    Two-level LRU cache: unpickled results in memory over pickle files on disk.
+
+    Args:
+        directory (str, optional): Cache folder. Defaults to $SVDP_CACHE_DIR or ~/.cache/svdp.
+        max_bytes (int, optional): Size cap of the folder. Defaults to 512 MiB.
+        memory_items (int, optional): Results kept in process. Defaults to 128.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, memory_items=DEFAULT_MEMORY_ITEMS):
+        self.directory = directory or _default_directory()
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def get(self, key, default=None):
+        """Returns the cached result for ``key``, or ``default``."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)  # mark as recently used
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            with self._lock:
+                self.misses += 1
+            return default
+        self._remember(key, value)
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Stores a result (written atomically), then trims the folder to ``max_bytes``."""
+        self._remember(key, value)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Deletes least recently used files until the folder fits in ``max_bytes``."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".pkl"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    total += stat.st_size
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """Empties both levels."""
+        with self._lock:
+            self._memory.clear()
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".pkl"):
+                    os.remove(entry.path)
+
+
+_default_cache = None
+
+
+def default_cache():
+    """The process-wide cache, or None when SVDP_NO_CACHE is set."""
+    global _default_cache
+    if os.environ.get('SVDP_NO_CACHE'):
+        return None
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+
+def memoize(files=(), ignore=(), cache=None):
+    """
+    Caches a function's results by content.
+
+    Args:
+        files (tuple): Names of the parameters that are input file paths.
+        ignore (tuple): Names of parameters that do not affect the result.
+        cache (ResultCache, optional): Defaults to default_cache() at call time.
+    """
+    def decorate(func):
+        signature = inspect.signature(func)
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            store = cache or default_cache()
+            if store is None:
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            paths = [bound.arguments[param] for param in files]
+            params = {param: value for param, value in bound.arguments.items()
+                      if param not in files and param not in ignore}
+            try:
+                key = make_key(name, params, paths, code_version(func))
+            except OSError:
+                return func(*args, **kwargs)  # missing input: let the function report it
+            result = store.get(key)
+            if result is None:
+                result = func(*args, **kwargs)
+                if result is not None:
+                    store.put(key, result)
+            return result
+        return wrapper
+    return decorate
@@ -0,0 +1,206 @@
+"""
+Facility capacity over time, as date-indexed step functions.
+
+The houses' capacities change: beds go offline for repairs, rooms are added
+mid-year. Capacity is kept per house and kind ('beds', 'rooms',
+'physical_beds') as a step function of the day, built from
+
+    set      from a day on, the house has ``count`` of a kind
+    offline  ``count`` units (a named bed or room, optionally) are out of
+             service from ``start`` to ``end`` inclusive
+    add      ``count`` extra units from ``start`` to ``end`` (open-ended if no end)
+
+Available nights for any window are two prefix-sum lookups on the step
+function, however many changes it has, so every occupancy report gets its
+denominators here instead of from constants in the scripts.
+
+The defaults are the figures the reports have always used:
+
+    RH beds 18, BH beds 32, RH rooms 6, BH rooms 12 (rooms 5-16), and
+    physical_beds RH 35 / BH 32 for the quarterly bed-night reports.
+
+Changes can be kept in a CSV and loaded with load_capacity(); point
+``SVDP_CAPACITY_FILE`` at it to apply it to every report:
+
+    action,house,kind,start,end,count,unit
+    offline,BH,beds,2025-02-03,2025-02-16,1,BH Rm 6-A
+    set,RH,rooms,2025-07-01,,7,
+"""
+
+import csv
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+KINDS = ('beds', 'rooms', 'physical_beds')
+ACTIONS = ('set', 'offline', 'add')
+EPOCH = date(1900, 1, 1)
+
+DEFAULT_LEVELS = (
+    ('RH', 'beds', 18),
+    ('BH', 'beds', 32),
+    ('RH', 'rooms', 6),
+    ('BH', 'rooms', 12),  # rooms 5-16
+    ('RH', 'physical_beds', 35),
+    ('BH', 'physical_beds', 32),
+)
+
+
+def _ordinal(day):
+    if isinstance(day, (int, np.integer)):
+        return int(day)
+    return pd.Timestamp(day).toordinal()
+
+
+class StepFunction:
+    """
+    A piecewise-constant count per day: ``levels[i]`` from day ``starts[i]``
+    up to the next start (0 before the first), with prefix sums of the
+    level-days at each start for O(log n) window totals.
+    """
+
+    def __init__(self, starts, levels):
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.levels = np.asarray(levels, dtype=np.int64)
+        lengths = np.diff(self.starts)
+        self._prefix = np.concatenate([[0], np.cumsum(self.levels[:-1] * lengths)])
+
+    def __repr__(self):
+        steps = ", ".join(f"{date.fromordinal(int(start))}: {int(level)}"
+                          for start, level in zip(self.starts, self.levels))
+        return f"StepFunction({steps})"
+
+    def at(self, days):
+        """Level on each day (ordinals or dates; an array in, an array out)."""
+        ordinals = np.asarray(days if np.ndim(days) else [days])
+        if not np.issubdtype(ordinals.dtype, np.integer):
+            ordinals = np.array([_ordinal(day) for day in ordinals], dtype=np.int64)
+        index = np.searchsorted(self.starts, ordinals, side='right') - 1
+        levels = np.where(index >= 0, self.levels[np.maximum(index, 0)], 0)
+        return levels if np.ndim(days) else int(levels[0])
+
+    def _cumulative(self, ordinals):
+        """Level-days before each ordinal."""
+        index = np.searchsorted(self.starts, ordinals, side='right') - 1
+        safe = np.maximum(index, 0)
+        total = self._prefix[safe] + self.levels[safe] * (ordinals - self.starts[safe])
+        return np.where(index >= 0, total, 0)
+
+    def total(self, first_day, last_day):
+        """Sum of the level over first_day..last_day inclusive (arrays of windows work too)."""
+        first = np.asarray(first_day if np.ndim(first_day) else _ordinal(first_day), dtype=np.int64)
+        last = np.asarray(last_day if np.ndim(last_day) else _ordinal(last_day), dtype=np.int64)
+        totals = self._cumulative(last + 1) - self._cumulative(first)
+        return totals if totals.ndim else int(totals)
+
+
+class Capacity:
+    """
+    Capacity changes per (house, kind), turned into step functions on demand.
+
+    The repr lists every change, so a Capacity passed as a report parameter
+    gives a stable svdp.cache key that changes when the capacity does.
+    """
+
+    def __init__(self, levels=DEFAULT_LEVELS):
+        self._changes = []  # (action, house, kind, start ordinal, end ordinal or None, count, unit)
+        self._schedules = {}
+        for house, kind, count in levels:
+            self.set_level(house, kind, EPOCH, count)
+
+    def __repr__(self):
+        return f"Capacity({self._changes!r})"
+
+    def _add(self, action, house, kind, start, end, count, unit):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown capacity kind '{kind}'. Use one of: {', '.join(KINDS)}")
+        end = None if end is None or (isinstance(end, str) and not end.strip()) else _ordinal(end)
+        self._changes.append((action, house.upper(), kind, _ordinal(start), end, int(count), unit or None))
+        self._schedules.pop((house.upper(), kind), None)
+        return self
+
+    def set_level(self, house, kind, start, count):
+        """From ``start`` on, ``house`` has ``count`` of ``kind``."""
+        return self._add('set', house, kind, start, None, count, None)
+
+    def take_offline(self, house, kind, start, end, count=1, unit=None):
+        """``count`` units (e.g. unit='BH Rm 6-A') are out of service from start to end inclusive."""
+        return self._add('offline', house, kind, start, end, count, unit)
+
+    def add_units(self, house, kind, start, end=None, count=1, unit=None):
+        """``count`` extra units from start to end inclusive (from start on if end is None)."""
+        return self._add('add', house, kind, start, end, count, unit)
+
+    def schedule(self, house, kind):
+        """The StepFunction for one house and kind."""
+        key = (house.upper(), kind)
+        if key not in self._schedules:
+            self._schedules[key] = self._build(*key)
+        return self._schedules[key]
+
+    def _build(self, house, kind):
+        changes = [change for change in self._changes if change[1] == house and change[2] == kind]
+        if not changes:
+            raise KeyError(f"No {kind} capacity recorded for {house}")
+        sets = sorted((start, count) for action, _, _, start, _, count, _ in changes if action == 'set')
+        deltas = []
+        for action, _, _, start, end, count, _ in changes:
+            if action == 'set':
+                continue
+            sign = -1 if action == 'offline' else 1
+            deltas.append((start, sign * count))
+            if end is not None:
+                deltas.append((end + 1, -sign * count))
+
+        # Breakpoints are every set and every delta; the level at each is the
+        # latest set plus the running sum of the deltas so far.
+        points = np.unique([start for start, _ in sets] + [day for day, _ in deltas])
+        set_days = np.array([start for start, _ in sets], dtype=np.int64)
+        set_counts = np.array([count for _, count in sets], dtype=np.int64)
+        index = np.searchsorted(set_days, points, side='right') - 1
+        base = np.where(index >= 0, set_counts[np.maximum(index, 0)], 0)
+        delta_days = np.array([day for day, _ in deltas], dtype=np.int64)
+        delta_counts = np.array([count for _, count in deltas], dtype=np.int64)
+        order = np.argsort(delta_days, kind='stable')
+        running = np.concatenate([[0], np.cumsum(delta_counts[order])])
+        applied = running[np.searchsorted(delta_days[order], points, side='right')]
+        return StepFunction(points, np.maximum(base + applied, 0))
+
+    def level_on(self, house, kind, day):
+        """Units available on one day."""
+        return self.schedule(house, kind).at(_ordinal(day))
+
+    def available_nights(self, house, kind, start_date, end_date):
+        """Unit-nights available from start_date to end_date inclusive, e.g. bed nights."""
+        return self.schedule(house, kind).total(start_date, end_date)
+
+
+def load_capacity(path, base=None):
+    """
+    Applies the changes in a capacity CSV (columns action, house, kind, start,
+    end, count, unit) on top of ``base`` (default: a new Capacity with the
+    default levels).
+    """
+    capacity = base if base is not None else Capacity()
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            action = (row.get('action') or '').strip().lower()
+            if action not in ACTIONS:
+                raise ValueError(f"{path}, line {line}: action must be one of {', '.join(ACTIONS)}")
+            capacity._add(action, row['house'].strip(), row['kind'].strip(), row['start'].strip(),
+                          row.get('end'), row['count'], (row.get('unit') or '').strip())
+    return capacity
+
+
+_default_capacity = None
+
+
+def default_capacity():
+    """The capacity every report uses: the defaults plus $SVDP_CAPACITY_FILE, if set."""
+    global _default_capacity
+    if _default_capacity is None:
+        path = os.environ.get('SVDP_CAPACITY_FILE')
+        _default_capacity = load_capacity(path) if path else Capacity()
+    return _default_capacity
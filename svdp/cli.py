@@ -0,0 +1,98 @@
+"""
+One command line for the reports: ``python -m svdp COMMAND [ARGS]``.
+
+Each command is a report script or an svdp module with a main(), and its
+arguments are the script's own (``python -m svdp crisis --help``). Only the
+chosen command is imported, so commands that read their export with the csv
+module (crisis, uav, envoy) never load pandas or NumPy and a quick count
+starts in tens of milliseconds instead of waiting on a pandas import.
+
+Usage:
+    python -m svdp list
+    python -m svdp crisis CrisisLineReport.csv --start 2025-03-18
+    python -m svdp -C ~/exports uav UAV.csv --by quarter
+    python -m svdp reports . --period 2025-Q1
+"""
+
+import importlib
+import os
+import runpy
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Command -> (svdp module with a main(), or a script path relative to the repo root; description)
+COMMANDS = {
+    'reports': ('svdp.reports', "Run the monthly report batch, reading each export once"),
+    'watch': ('svdp.watch', "Re-run the reports that read each export dropped into a folder"),
+    'warehouse': ('svdp.warehouse', "Load every known export in a folder into a SQLite warehouse"),
+    'episodes': ('svdp.episodes', "Stitch bed stays into episodes"),
+    'conflicts': ('svdp.conflicts', "Find stays that share a bed on the same night"),
+    'visits': ('svdp.visits', "Visitor frequency and return intervals of Envoy sign-in logs"),
+    'crisis': ("CrisisLine/Crisisline.py", "Count crisis line calls from a start date to today"),
+    'uav': ("UAV/UAV.py", "Count unique UAV entries per calendar period"),
+    'envoy': ("Envoy visitors/EnvoyDuplicates.py", "Filter Envoy sign-ins by date and remove same-day duplicates"),
+    'dcpr': ("DC/find_dcpr_in_ce.py", "Find the DCPR clients in the CE export"),
+    '990': ("990/990.py", "990 counts of people with an Entry or Exit Date in each window"),
+    'marykay-rosalie': ("Marykay/MaryKRosalie.py", "Mary Kay grant figures for Rosalie House"),
+    'marykay-brennen': ("Marykay/MaryKBren.py", "Mary Kay grant figures for Brennen House"),
+    'occupancy': ("RileyFunctions/RileyEverything.py", "Bed and room occupancy of both houses"),
+    'bh-bed-occupancy': ("RileyFunctions/BrennenBedPercent.py", "Brennen House bed occupancy"),
+    'rh-bed-occupancy': ("RileyFunctions/RosalieBedPercent.py", "Rosalie House bed occupancy"),
+    'rh-room-occupancy': ("RileyFunctions/RosalieRoomPercent.py", "Rosalie House room occupancy"),
+    'bh-bed-nights': ("RileyFunctions/BHQuarterlyReportBedNights.py", "Brennen House quarterly bed nights"),
+    'bh-room-nights': ("RileyFunctions/BrennenRoomPercent.py", "Brennen House quarterly nights and people served"),
+    'rh-bed-nights': ("RileyFunctions/RHQuarterlyReportBedNights.py", "Rosalie House quarterly bed nights"),
+    'pmt-enrollment': ("RileyFunctions/PmtNewEnrollment.py", "PMT new enrollments"),
+    'pmt-gender': ("RileyFunctions/PmtNewGender.py", "PMT gender by house"),
+    'violence-ovtpmt': ("RileyFunctions/OVTPMTabuse.py", "History of violence counts (OVTPMTabuse.csv)"),
+    'violence-by-house': ("RileyFunctions/RHHistoryofViolence.py", "History of violence counts per house"),
+}
+
+
+def _command_list():
+    width = max(map(len, COMMANDS))
+    return "\n".join(f"  {name:<{width}}  {description}" for name, (_, description) in COMMANDS.items())
+
+
+def run_command(name, args=()):
+    """
+    Runs one command as if from its own command line (``args`` become its sys.argv).
+
+    Scripts run as ``__main__`` from their file, like ``python <script>``;
+    modules have their main() called.
+    """
+    target, _ = COMMANDS[name]
+    saved_argv = sys.argv
+    sys.argv = [f"svdp {name}", *args]  # run_path swaps in the script path for argv[0]
+    try:
+        if target.endswith('.py'):
+            runpy.run_path(os.path.join(REPO_ROOT, *target.split('/')), run_name='__main__')
+        else:
+            importlib.import_module(target).main()
+    finally:
+        sys.argv = saved_argv
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="svdp", description="Run an SVdP report.", formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="commands:\n" + _command_list() + "\n\nArguments after the command go to it; "
+                                                  "'svdp COMMAND --help' lists them.")
+    parser.add_argument("-C", dest="directory", metavar="DIR", help="Run in DIR (where the exports are)")
+    parser.add_argument("command", choices=["list", *COMMANDS], metavar="COMMAND", help="Report to run, or 'list'")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        print(_command_list())
+        return
+    if args.directory:
+        os.chdir(args.directory)
+    run_command(args.command, args.args)
+
+
+if __name__ == "__main__":
+    main()
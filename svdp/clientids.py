@@ -0,0 +1,268 @@
+"""
+Pseudonymous int32 client IDs for dedupe and distinct counts.
+
+Deduplicating on name strings keeps a copy of every name in each set, dict
+and tuple key along the way. A ClientIds table gives each client key (a name
+or identifier, stripped and casefolded as in svdp.warehouse) a dense int32 ID
+instead, so dedupe works on NumPy integer arrays and intermediate structures
+hold no names:
+
+    ids = client_ids()
+    codes = ids.encode(df['full_name'])   # int32 per row, -1 where missing
+    served = np.unique(codes[codes >= 0]).size
+    seen.add(ids.id_of(row['Full Name']))  # one value, for row-at-a-time scripts
+
+Keys are looked up by a keyed BLAKE2b hash (64 bits), so the table itself
+stores no names either: ``ids.bin`` holds the hash of ID i (little-endian
+uint64) at position i. A saved table is read back by later runs, so a client
+keeps their ID from one report run to the next. (Folders saved before
+ids.bin replaced ``ids.npy`` are read from ids.npy until the next save.)
+The hash key is generated once into ``key`` (or given in SVDP_ID_KEY as hex,
+to share IDs between machines); without it the hashes cannot be matched to
+names.
+
+Names are only written to the dimension table ``names.csv`` (ID, first
+spelling seen), and only for tables opened with ``record_names=True``. Both
+it and the key are created readable by the owner only.
+
+Nothing is written unless asked for. The process-wide table (client_ids())
+keeps its IDs in memory for the run only, unless SVDP_ID_DIR names a folder
+to keep them in. In that case it is read from there and saved there when the
+process exits. SVDP_NO_ID_STORE=1 turns the folder off again. A table opened
+with ClientIds(directory) is written by its save() only. id_of works without
+NumPy and pandas; encode imports them.
+"""
+
+import atexit
+import csv
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from array import array
+
+MISSING_ID = -1
+MAX_ID = 2 ** 31 - 1
+KEY_BYTES = 32
+_HASH_BYTES = 8
+
+
+def _default_directory():
+    """The folder the process-wide table is kept in, or None to keep IDs in memory."""
+    if os.environ.get('SVDP_NO_ID_STORE'):
+        return None
+    return os.environ.get('SVDP_ID_DIR') or None
+
+
+def normalize_key(value):
+    """The client key of a name or identifier: stripped and casefolded; None if missing or blank."""
+    if not isinstance(value, str):
+        try:
+            if value is None or value != value:  # None, NaN
+                return None
+        except TypeError:  # pandas.NA
+            return None
+    key = str(value).strip().casefold()
+    return key or None
+
+
+def _write_private(path, data, mode='wb'):
+    """Writes a file readable by the owner only, replacing it atomically."""
+    directory = os.path.dirname(path)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        os.chmod(tmp, 0o600)
+        with os.fdopen(fd, mode, **({} if 'b' in mode else {'newline': '', 'encoding': 'utf-8'})) as f:
+            if callable(data):
+                data(f)
+            else:
+                f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class ClientIds:
+    """
+    Client key -> dense int32 ID, persisted in ``directory`` (None: in memory only).
+
+    Call save() to keep IDs added during the run; client_ids() does so at exit.
+    """
+
+    def __init__(self, directory=None, key=None, record_names=False):
+        self.directory = directory
+        self.record_names = record_names
+        self._lock = threading.Lock()
+        self._hashes = []     # ID -> hash
+        self._ids = {}        # hash -> ID
+        self._memo = {}       # raw value -> ID, for id_of
+        self._names = {}      # ID -> first spelling seen (record_names only)
+        self._saved = 0       # IDs already on disk
+        self._names_saved = 0
+        self._key = key if key is not None else self._load_key()
+        if directory is not None:
+            self._merge(self._read_hashes())
+            self._saved = len(self._hashes)
+            if record_names:
+                self._names.update(self._read_names())
+                self._names_saved = len(self._names)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load_key(self):
+        if os.environ.get('SVDP_ID_KEY'):
+            return bytes.fromhex(os.environ['SVDP_ID_KEY'])
+        if self.directory is None:
+            return os.urandom(KEY_BYTES)  # IDs for this run only
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path('key')
+        if not os.path.exists(path):
+            _write_private(path, os.urandom(KEY_BYTES))
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def _read_hashes(self):
+        hashes = array('Q')
+        path = self._path('ids.bin')
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                hashes.frombytes(f.read())
+            if sys.byteorder != 'little':
+                hashes.byteswap()
+        elif os.path.exists(self._path('ids.npy')):
+            import numpy as np  # the earlier format; the next save() writes ids.bin
+
+            hashes.extend(np.load(self._path('ids.npy')).astype(np.uint64).tolist())
+        return hashes
+
+    def _read_names(self):
+        path = self._path('names.csv')
+        if not os.path.exists(path):
+            return {}
+        with open(path, newline='', encoding='utf-8') as f:
+            return {int(row['id']): row['name'] for row in csv.DictReader(f)}
+
+    def _merge(self, hashes):
+        """Adds hashes (in order) that are not in the table yet."""
+        for value in hashes:
+            if value not in self._ids:
+                self._ids[value] = len(self._hashes)
+                self._hashes.append(value)
+
+    def _hash(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=_HASH_BYTES, key=self._key).digest()
+        return int.from_bytes(digest, 'little')
+
+    def _assign(self, value):
+        """ID of one raw value, adding it if new. Call with the lock held."""
+        key = normalize_key(value)
+        if key is None:
+            return MISSING_ID
+        hashed = self._hash(key)
+        client_id = self._ids.get(hashed)
+        if client_id is None:
+            client_id = self._ids[hashed] = len(self._hashes)
+            self._hashes.append(hashed)
+            if client_id > MAX_ID:
+                raise OverflowError("More client IDs than fit in int32")
+        if self.record_names and client_id not in self._names:
+            self._names[client_id] = str(value).strip()
+        return client_id
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def id_of(self, value):
+        """The ID of one name or identifier (MISSING_ID if missing or blank)."""
+        client_id = self._memo.get(value)
+        if client_id is None:
+            with self._lock:
+                client_id = self._memo[value] = self._assign(value)
+        return client_id
+
+    def encode(self, values):
+        """
+        IDs of an array of names or identifiers, hashing each distinct value once.
+
+        Returns:
+            numpy.ndarray: int32 per value, MISSING_ID where missing or blank.
+        """
+        import numpy as np
+        import pandas as pd
+
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object).to_numpy())
+        with self._lock:
+            table = np.array([self._assign(value) for value in uniques] + [MISSING_ID], dtype=np.int32)
+        return table[codes]  # code -1 (missing) picks the trailing MISSING_ID
+
+    def names(self):
+        """ID -> name, from the dimension table (record_names tables only)."""
+        if not self.record_names:
+            raise ValueError("This ID table does not record names; open it with record_names=True")
+        with self._lock:
+            return dict(self._names)
+
+    def save(self):
+        """
+        Writes the IDs added since the table was read. IDs another process saved
+        in the meantime keep theirs; this run's new clients are numbered after them.
+        """
+        if self.directory is None:
+            return
+        with self._lock:
+            if len(self._hashes) == self._saved and len(self._names) == self._names_saved:
+                return
+            on_disk = self._read_hashes()
+            if len(on_disk) > self._saved:
+                added = self._hashes[self._saved:]
+                names = {self._hashes[client_id]: name for client_id, name in self._names.items()}
+                self._hashes, self._ids, self._memo = [], {}, {}
+                self._merge(on_disk)
+                self._merge(added)
+                self._names = {self._ids[value]: name for value, name in names.items()}
+            hashes = array('Q', self._hashes)
+            if sys.byteorder != 'little':
+                hashes.byteswap()
+            _write_private(self._path('ids.bin'), hashes.tobytes())
+            self._saved = len(self._hashes)
+            if len(self._names) != self._names_saved:
+                for client_id, name in self._read_names().items():
+                    self._names.setdefault(client_id, name)  # names another process recorded
+
+                def write(f):
+                    writer = csv.writer(f)
+                    writer.writerow(['id', 'name'])
+                    writer.writerows(sorted(self._names.items()))
+                _write_private(self._path('names.csv'), write, 'w')
+                self._names_saved = len(self._names)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def client_ids():
+    """The process-wide ID table: in memory, or kept in SVDP_ID_DIR and saved when the process exits."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            directory = _default_directory()
+            try:
+                _default = ClientIds(directory)
+            except OSError as e:
+                print(f"Warning: Could not open the client ID folder {directory} ({e}); IDs are kept for this run only")
+                _default = ClientIds(None)
+            if _default.directory is not None:
+                atexit.register(_save_default)
+        return _default
+
+
+def _save_default():
+    try:
+        _default.save()
+    except OSError as e:
+        print(f"Warning: Could not save client IDs to {_default.directory}: {e}")
@@ -0,0 +1,320 @@
+"""
+Memory-mapped single-column scanner for wide CSV exports.
+
+Several reports only need one column out of a wide export (``Assessment Date``
+in the crisis line report, ``Start Date/Time`` in the UAV log, ``sign_in_time``
+in Envoy). ``csv.reader`` still splits every field of every row to get there.
+This module maps the file into memory, finds the row boundaries with NumPy and
+cuts each row only as far as the requested column, so the rest of a wide row
+is never tokenized and only that column is turned into Python strings.
+
+Quoted fields (including delimiters and newlines inside quotes and doubled
+``""`` escapes) are handled. Rows that are too short to contain the column and
+blank lines are skipped, the same rows ``csv.reader`` based code would hit an
+IndexError on.
+
+Compressed exports (see svdp.compression) cannot be mapped; they are
+decompressed as a stream and scanned one block at a time the same way.
+"""
+
+import csv
+import io
+import mmap
+import os
+import numpy as np
+
+from svdp import compression, dates
+
+# Bytes handed to NumPy at a time. Each block is cut back to the last newline
+# that is not inside quotes, so every block starts at the beginning of a row.
+BLOCK_SIZE = 64 * 1024 * 1024
+
+# Ordinal used for values that could not be parsed as a date.
+MISSING_ORDINAL = dates.MISSING_ORDINAL
+
+_NEWLINE = ord('\n')
+
+
+def read_header(path, encoding='utf-8-sig', delimiter=',', quotechar='"'):
+    """
+    Reads the header row of a CSV file.
+
+    Args:
+        path (str): Path to the CSV file.
+        encoding (str, optional): File encoding. Defaults to "utf-8-sig" so a
+            byte order mark is not glued onto the first column name.
+        delimiter (str, optional): Field delimiter. Defaults to ",".
+        quotechar (str, optional): Quote character. Defaults to '"'.
+
+    Returns:
+        list: The column names, or an empty list for an empty file.
+    """
+    with compression.open_text(path, newline='', encoding=encoding) as csvfile:
+        reader = csv.reader(csvfile, delimiter=delimiter, quotechar=quotechar)
+        return next(reader, [])
+
+
+def find_column_index(header, column):
+    """
+    Returns the position of ``column`` in ``header``.
+
+    Surrounding whitespace and non-breaking spaces are ignored on both sides,
+    so 'Are you a Domestic Violence survivor?\\xa0' matches without the NBSP.
+
+    Raises:
+        KeyError: If the column is not in the header.
+    """
+    wanted = column.replace('\xa0', ' ').strip()
+    for index, name in enumerate(header):
+        if name.replace('\xa0', ' ').strip() == wanted:
+            return index
+    raise KeyError(f"Column '{column}' not found in header")
+
+
+def _row_ends(arr, quote):
+    """
+    Returns the offsets of the newlines in ``arr`` that end a row (newlines
+    inside quoted fields do not), and the offsets of the quote characters.
+
+    A byte is inside quotes when an odd number of quote characters precede it,
+    so each newline is checked with one ``searchsorted`` into the (usually
+    short) quote list instead of keeping a running count over every byte.
+    """
+    quotes = np.flatnonzero(arr == quote)
+    newlines = np.flatnonzero(arr == _NEWLINE)
+    if len(quotes):
+        newlines = newlines[(np.searchsorted(quotes, newlines) & 1) == 0]
+    return newlines, quotes
+
+
+def _header_end(view, quote):
+    """Returns the offset just past the header row."""
+    probe = 1024 * 1024
+    while True:
+        row_ends, _ = _row_ends(view[:probe], quote)
+        if len(row_ends):
+            return int(row_ends[0]) + 1
+        if probe >= len(view):
+            return len(view)
+        probe *= 2
+
+
+def _row_values(buffer, base, row_ends, quotes, column_index, encoding, delimiter, quotechar):
+    """
+    Pulls field ``column_index`` out of every row of a block.
+
+    Rows are cut with ``bytes.split`` limited to the fields we need, so the
+    rest of a wide row is never looked at. Only rows with a quote character at
+    or before the wanted field go through ``csv.reader`` to get the escaping
+    right.
+    """
+    # Offset of the first quote in each row, past the row end if there is none.
+    row_starts = np.concatenate(([0], row_ends[:-1] + 1))
+    first_quote = row_ends - row_starts + 1
+    if len(quotes):
+        following = np.searchsorted(quotes, row_starts)
+        found = following < len(quotes)
+        first_quote[found] = np.minimum(first_quote[found], quotes[following[found]] - row_starts[found])
+
+    separator = delimiter.encode(encoding)
+    values = []
+    start = base
+    for end, quote_at in zip((row_ends + base).tolist(), first_quote.tolist()):
+        line = buffer[start:end]
+        start = end + 1
+        if line.endswith(b'\r'):
+            line = line[:-1]
+        if not line:
+            continue  # csv.reader yields no row for a blank line
+        fields = line.split(separator, column_index + 1)
+        if len(fields) <= column_index:
+            continue
+        field_end = len(line) - len(fields[-1]) - 1 if len(fields) > column_index + 1 else len(line)
+        if quote_at < field_end:
+            fields = next(csv.reader(io.StringIO(line.decode(encoding)), delimiter=delimiter, quotechar=quotechar))
+            if len(fields) > column_index:
+                values.append(fields[column_index])
+        else:
+            values.append(fields[column_index].decode(encoding))
+    return values
+
+
+def iter_column(path, column, encoding='utf-8', delimiter=',', quotechar='"', block_size=BLOCK_SIZE):
+    """
+    Yields the values of one column, one NumPy string array per block.
+
+    Args:
+        path (str): Path to the CSV file.
+        column (str): Header name of the column to extract.
+        encoding (str, optional): File encoding. Defaults to "utf-8".
+        delimiter (str, optional): Field delimiter. Defaults to ",".
+        quotechar (str, optional): Quote character. Defaults to '"'.
+        block_size (int, optional): Bytes scanned per block. Defaults to BLOCK_SIZE.
+
+    Yields:
+        numpy.ndarray: String values of the column, in file order.
+
+    Raises:
+        KeyError: If the column is not in the header.
+    """
+    if os.path.getsize(path) == 0:
+        raise KeyError(f"Column '{column}' not found in header")
+
+    if compression.detect(path) is not None:
+        # Compressed exports cannot be mapped; scan the decompressed stream block by block.
+        with compression.open_binary(path) as stream:
+            yield from _scan_stream(stream, column, encoding, delimiter, quotechar, block_size)
+        return
+
+    with open(path, 'rb') as raw, mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        if hasattr(buffer, 'madvise'):  # not available on Windows
+            # Let the kernel read ahead instead of faulting in one page at a time.
+            buffer.madvise(mmap.MADV_SEQUENTIAL)
+            buffer.madvise(mmap.MADV_WILLNEED)
+        view = np.frombuffer(buffer, dtype=np.uint8)
+        try:
+            yield from _scan_buffer(buffer, view, column, encoding, delimiter, quotechar, block_size)
+        finally:
+            # NumPy views pin the map; drop them before mmap is closed.
+            del view
+
+
+def _scan_buffer(buffer, view, column, encoding, delimiter, quotechar, block_size):
+    """Block loop behind ``iter_column``; ``view`` is a uint8 array over ``buffer``."""
+    quote_byte = ord(quotechar)
+    offset = _header_end(view, quote_byte)
+    header_text = buffer[:offset].decode(encoding).lstrip('\ufeff')
+    header = next(csv.reader(io.StringIO(header_text), delimiter=delimiter, quotechar=quotechar), [])
+    column_index = find_column_index(header, column)
+
+    size = len(view)
+    while offset < size:
+        stop = min(offset + block_size, size)
+        row_ends, quotes = _row_ends(view[offset:stop], quote_byte)
+        if stop == size and (len(row_ends) == 0 or row_ends[-1] != stop - offset - 1):
+            # Last row without a trailing newline.
+            row_ends = np.append(row_ends, stop - offset)
+        elif len(row_ends) == 0:
+            # A single row longer than the block; retry with a bigger one.
+            block_size *= 2
+            continue
+        cut = int(row_ends[-1]) + 1
+        quotes = quotes[quotes < cut]
+
+        values = _row_values(buffer, offset, row_ends, quotes, column_index, encoding, delimiter, quotechar)
+        if values:
+            yield np.array(values)
+        offset += cut
+
+
+def _scan_stream(stream, column, encoding, delimiter, quotechar, block_size):
+    """
+    ``iter_column`` over a decompressing stream: reads ``block_size`` bytes at
+    a time and carries the partial row at the end of each block into the next.
+    """
+    quote_byte = ord(quotechar)
+    column_index = None
+    pending = b''
+    at_end = False
+    while True:
+        if not at_end:
+            data = stream.read(block_size)
+            at_end = not data
+            pending += data
+        view = np.frombuffer(pending, dtype=np.uint8)
+        row_ends, quotes = _row_ends(view, quote_byte)
+        if at_end and len(view) and (len(row_ends) == 0 or row_ends[-1] != len(view) - 1):
+            # Last row without a trailing newline.
+            row_ends = np.append(row_ends, len(view))
+        if len(row_ends) == 0:
+            if at_end:
+                break
+            continue  # no complete row yet; read more
+
+        if column_index is None:
+            header_end = int(row_ends[0]) + 1
+            header_text = pending[:header_end].decode(encoding).lstrip('\ufeff')
+            header = next(csv.reader(io.StringIO(header_text), delimiter=delimiter, quotechar=quotechar), [])
+            column_index = find_column_index(header, column)
+            pending = pending[header_end:]
+            continue
+
+        cut = int(row_ends[-1]) + 1
+        quotes = quotes[quotes < cut]
+        values = _row_values(pending, 0, row_ends, quotes, column_index, encoding, delimiter, quotechar)
+        if values:
+            yield np.array(values)
+        pending = pending[cut:]
+        if at_end and not pending:
+            break
+    if column_index is None:
+        raise KeyError(f"Column '{column}' not found in header")
+
+
+def scan_column(path, column, **kwargs):
+    """
+    Extracts one column from a CSV file as a NumPy string array.
+
+    Takes the same arguments as ``iter_column``.
+
+    Returns:
+        numpy.ndarray: The column values, in file order.
+    """
+    blocks = list(iter_column(path, column, **kwargs))
+    if not blocks:
+        return np.array([], dtype=str)
+    return np.concatenate(blocks)
+
+
+def to_ordinals(values, date_format='%m/%d/%Y'):
+    """
+    Parses date strings into day ordinals (``date.toordinal()``).
+
+    Each distinct string is parsed once (see svdp.dates) and the result is
+    mapped back to every row, so a column with a few thousand distinct dates
+    costs a few thousand ``strptime`` calls no matter how many rows it has.
+
+    Args:
+        values (numpy.ndarray): Date strings.
+        date_format (str, optional): strptime format. Defaults to "%m/%d/%Y".
+
+    Returns:
+        numpy.ndarray: int32 ordinals, MISSING_ORDINAL where a value did not parse.
+    """
+    return dates.to_ordinals(values, (date_format,))
+
+
+def scan_column_ordinals(path, column, date_format='%m/%d/%Y', **kwargs):
+    """
+    Extracts one date column from a CSV file as int32 day ordinals.
+
+    Args:
+        path (str): Path to the CSV file.
+        column (str): Header name of the date column.
+        date_format (str, optional): strptime format. Defaults to "%m/%d/%Y".
+        **kwargs: Passed on to ``iter_column``.
+
+    Returns:
+        numpy.ndarray: int32 ordinals, MISSING_ORDINAL where a value did not parse.
+    """
+    return to_ordinals(scan_column(path, column, **kwargs), date_format)
+
+
+def count_dates_in_range(path, column, start_date, end_date, date_format='%m/%d/%Y', **kwargs):
+    """
+    Counts rows whose date column falls within [start_date, end_date].
+
+    Args:
+        path (str): Path to the CSV file.
+        column (str): Header name of the date column.
+        start_date (datetime.date): First day counted.
+        end_date (datetime.date): Last day counted.
+        date_format (str, optional): strptime format. Defaults to "%m/%d/%Y".
+
+    Returns:
+        tuple: (count, unparsed) where ``unparsed`` is the number of rows whose
+            date could not be parsed.
+    """
+    ordinals = scan_column_ordinals(path, column, date_format, **kwargs)
+    in_range = (ordinals >= start_date.toordinal()) & (ordinals <= end_date.toordinal())
+    return int(in_range.sum()), int((ordinals == MISSING_ORDINAL).sum())
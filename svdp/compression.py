@@ -0,0 +1,90 @@
+"""
+Transparent reading of compressed exports.
+
+Monthly exports are archived as gzip, bzip2, xz or Zstandard files, often
+without a telling extension. Every loader opens its input through this module,
+which looks at the file's first bytes, not its name, and decompresses as it
+reads, so a compressed export is never written back out to disk:
+
+    with compression.open_text("RileyEverything.csv.gz") as f:   # csv.reader etc.
+        ...
+    df = compression.read_csv("BHQuarterly.csv.xz")              # pandas.read_csv
+    for chunk in compression.read_csv(path, chunksize=100000): ...
+
+Plain files are opened as before. Zstandard needs the optional ``zstandard``
+package; the other formats use the standard library.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+
+# (format, leading bytes); the names are the ones pandas.read_csv takes for ``compression``.
+MAGIC = (
+    ('gzip', b'\x1f\x8b'),
+    ('bz2', b'BZh'),
+    ('xz', b'\xfd7zXZ\x00'),
+    ('zstd', b'\x28\xb5\x2f\xfd'),
+)
+_PROBE = max(len(magic) for _, magic in MAGIC)
+
+
+def detect(path):
+    """The compression format of a file from its magic bytes: 'gzip', 'bz2', 'xz', 'zstd' or None."""
+    if not isinstance(path, (str, bytes)) and not hasattr(path, '__fspath__'):
+        return None  # an open file or buffer: read as given
+    with open(path, 'rb') as f:
+        head = f.read(_PROBE)
+    for name, magic in MAGIC:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def _zstd_reader(path):
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(f"{path} is Zstandard-compressed; install the 'zstandard' package to read it") from None
+    # closefd: closing the reader closes the file
+    return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+
+
+def open_binary(path):
+    """A binary file object that yields the file's decompressed bytes as it is read."""
+    kind = detect(path)
+    if kind == 'gzip':
+        return gzip.open(path, 'rb')
+    if kind == 'bz2':
+        return bz2.open(path, 'rb')
+    if kind == 'xz':
+        return lzma.open(path, 'rb')
+    if kind == 'zstd':
+        return _zstd_reader(path)
+    return open(path, 'rb')
+
+
+def open_text(path, encoding=None, newline=None, errors=None):
+    """Like open(path, 'r', ...), decompressing on the fly when the file is compressed."""
+    if detect(path) is None:
+        return open(path, 'r', encoding=encoding, newline=newline, errors=errors)
+    return io.TextIOWrapper(open_binary(path), encoding=encoding, newline=newline, errors=errors)
+
+
+def read_csv(path, **kwargs):
+    """
+    pandas.read_csv with the compression taken from the file's contents.
+
+    Works for whole-file and chunked (``chunksize``/``iterator``) reads alike;
+    pandas decompresses as it parses. An explicit ``compression`` argument wins.
+    """
+    if 'compression' not in kwargs:
+        kind = detect(path)
+        kwargs['compression'] = None if kind is None else {'method': kind}
+        if kind == 'zstd':
+            # pandas reads Zstandard through the same package; fail with our message if it is missing.
+            _zstd_reader(path).close()
+    import pandas as pd  # here, so csv-module readers start without pandas
+
+    return pd.read_csv(path, **kwargs)
@@ -0,0 +1,211 @@
+"""
+Bed conflict (double-booking) detection.
+
+Two stays conflict when they hold the same bed on the same night. A stay
+holds its bed from the night of entry up to, but not including, the exit
+day (someone may check in the day another checks out); a same-day stay
+holds its entry night. Stays with no exit hold the bed to the end of the
+checked window, or indefinitely.
+
+Stays are sorted by (bed, entry) once. Every overlapping pair is then found
+with one searchsorted per stay (the later stays on the same bed that enter
+before it ends) and peak concurrency with a sweep over the +1/-1 entry and
+exit events, so a check costs O(n log n + conflicts) and is cheap enough to
+run ahead of every occupancy report.
+
+    check = find_bed_conflicts(stays, '2025-01-01', '2025-03-31')
+    check.conflicts   # one row per overlapping pair
+    check.beds        # per-bed stays, conflicts and peak concurrency
+
+Usage:
+    python -m svdp.conflicts RileyEverything.csv [--start 2025-01-01 --end 2025-03-31] [--out conflicts.csv]
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from svdp import dates
+from svdp.results import BedConflictSummary, pairs
+
+OPEN_ORDINAL = np.iinfo(np.int32).max
+_SPAN = np.int64(OPEN_ORDINAL) + 1
+
+BedConflictCheck = namedtuple('BedConflictCheck', ['conflicts', 'beds'])
+BedConflictCheck.__doc__ = """
+Result of find_bed_conflicts: two DataFrames.
+
+    conflicts  bed_name, house, row_a, row_b (df index labels), full_name_a,
+               full_name_b, overlap_start, overlap_end (first and last shared
+               night) and overlap_nights, one row per overlapping pair
+    beds       bed_name, house, stays, conflicts, peak_concurrency and
+               peak_date (first night at the peak), one row per bed
+"""
+
+
+def normalize_bed(names):
+    """Bed names folded for grouping: upper case, single spaces ('rh  rm 5-a' -> 'RH RM 5-A')."""
+    return names.astype('string').str.upper().str.replace(r'\s+', ' ', regex=True).str.strip()
+
+
+def _house(beds):
+    return np.where(beds.str.contains('RH', na=False), 'RH',
+                    np.where(beds.str.contains('BH', na=False), 'BH', 'Unknown'))
+
+
+def _ordinals(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return dates.datetimes_to_ordinals(values).astype(np.int64)
+    return dates.to_ordinals(values).astype(np.int64)
+
+
+def _sorted_stays(df, start_date, end_date, bed_column):
+    """Valid stays sorted by (bed, entry): original rows, bed codes, first night, exclusive end, sort key."""
+    beds = normalize_bed(df[bed_column])
+    bed_codes, bed_names = pd.factorize(beds)
+    first = _ordinals(df['entry_date'])
+    end = _ordinals(df['exit_date'])
+    end = np.where(end == dates.MISSING_ORDINAL, OPEN_ORDINAL, np.maximum(end, first + 1))  # exclusive
+    if start_date is not None:
+        first = np.maximum(first, pd.Timestamp(start_date).toordinal())
+    if end_date is not None:
+        end = np.minimum(end, pd.Timestamp(end_date).toordinal() + 1)
+    valid = (bed_codes >= 0) & (first != dates.MISSING_ORDINAL) & (end > first)
+    rows = np.flatnonzero(valid)
+
+    # Sort once by (bed, entry); the composite key keeps beds apart in one array.
+    bed, first, end = bed_codes[rows].astype(np.int64), first[rows], end[rows]
+    key = bed * _SPAN + first
+    order = np.argsort(key, kind='stable')
+    return rows[order], bed[order], first[order], end[order], key[order], bed_names
+
+
+def _overlap_counts(bed, end, key):
+    """For each sorted stay, how many later stays on its bed enter before it ends."""
+    stop = np.searchsorted(key, bed * _SPAN + end, side='left')
+    return stop - np.arange(len(key)) - 1
+
+
+def find_bed_conflicts(df, start_date=None, end_date=None, bed_column='bed_name'):
+    """
+    Finds every pair of stays that share a bed on some night.
+
+    Args:
+        df (pandas.DataFrame): Stays with ``bed_column``, entry_date and
+            exit_date (full_name is copied into the conflicts when present).
+        start_date, end_date (str or date, optional): Only check nights in this window.
+        bed_column (str, optional): Defaults to "bed_name".
+
+    Returns:
+        BedConflictCheck
+    """
+    rows, bed, first, end, key, bed_names = _sorted_stays(df, start_date, end_date, bed_column)
+    overlaps = _overlap_counts(bed, end, key)
+    # Pair each stay with the run of stays right after it that it overlaps.
+    a = np.repeat(np.arange(len(key)), overlaps)
+    b = a + 1 + (np.arange(len(a)) - np.repeat(np.cumsum(overlaps) - overlaps, overlaps))
+    overlap_start = first[b]
+    overlap_end = np.minimum(end[a], end[b]) - 1
+    is_open = overlap_end >= OPEN_ORDINAL - 1
+
+    names = df['full_name'].to_numpy() if 'full_name' in df else np.full(len(df), None)
+    labels = df.index.to_numpy()
+    conflicts = pd.DataFrame({
+        'bed_name': pd.Categorical.from_codes(bed[a], bed_names),
+        'row_a': labels[rows[a]],
+        'row_b': labels[rows[b]],
+        'full_name_a': names[rows[a]],
+        'full_name_b': names[rows[b]],
+        'overlap_start': dates.ordinals_to_datetimes(overlap_start).astype('datetime64[ns]'),
+        'overlap_end': dates.ordinals_to_datetimes(np.where(is_open, dates.MISSING_ORDINAL, overlap_end)
+                                                   ).astype('datetime64[ns]'),
+        'overlap_nights': np.where(is_open, -1, overlap_end - overlap_start + 1),
+    })
+    conflicts.insert(1, 'house', pd.Categorical(_house(conflicts['bed_name'].astype('string'))))
+    return BedConflictCheck(conflicts, _bed_peaks(bed, first, end, overlaps, bed_names))
+
+
+def _bed_peaks(bed, first, end, overlaps, bed_names):
+    """Per-bed stay counts, conflict counts and peak concurrency from a sweep over entry/exit events."""
+    count = len(bed)
+    # Exits sort before entries on the same night, so back-to-back stays do not count as concurrent.
+    events = np.concatenate([bed * 2 ** 33 + end * 2, bed * 2 ** 33 + first * 2 + 1])
+    deltas = np.concatenate([-np.ones(count, dtype=np.int64), np.ones(count, dtype=np.int64)])
+    order = np.argsort(events, kind='stable')
+    events, deltas = events[order], deltas[order]
+    # Each bed's events sum to zero, so one running sum is every bed's own concurrency.
+    running = np.cumsum(deltas)
+    event_bed = events // 2 ** 33
+    starts = np.flatnonzero(np.r_[True, event_bed[1:] != event_bed[:-1]]) if count else np.array([], int)
+    peaks = np.maximum.reduceat(running, starts) if count else running
+    segment = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(events)]))
+    at_peak = running == peaks[segment]
+    hits = np.flatnonzero(at_peak)
+    _, first_hit = np.unique(segment[hits], return_index=True)  # every bed reaches its peak
+    first_peak = hits[first_hit]
+    peak_day = (events[first_peak] % 2 ** 33) // 2
+
+    bed_of_segment = event_bed[starts]
+    codes = pd.Categorical.from_codes(bed_of_segment, bed_names)
+    beds = pd.DataFrame({
+        'bed_name': codes,
+        'house': pd.Categorical(_house(pd.Series(codes).astype('string'))),
+        'stays': np.bincount(bed, minlength=len(bed_names))[bed_of_segment],
+        'conflicts': np.bincount(bed, weights=overlaps, minlength=len(bed_names)).astype(np.int64)[bed_of_segment],
+        'peak_concurrency': peaks,
+        'peak_date': dates.ordinals_to_datetimes(peak_day).astype('datetime64[ns]'),
+    })
+    return beds
+
+
+def bed_conflict_summary(df, start_date=None, end_date=None, bed_column='bed_name', worst=5):
+    """
+    Counts from find_bed_conflicts for a report: conflicting pairs and beds,
+    peak concurrency and the ``worst`` beds by number of conflicts.
+
+    Returns:
+        svdp.results.BedConflictSummary
+    """
+    # Only counts are needed, so the pairs themselves are never built.
+    _, bed, first, end, key, bed_names = _sorted_stays(df, start_date, end_date, bed_column)
+    overlaps = _overlap_counts(bed, end, key)
+    beds = _bed_peaks(bed, first, end, overlaps, bed_names)
+    flagged = beds[beds['conflicts'] > 0].sort_values(['conflicts', 'bed_name'], ascending=[False, True])
+    return BedConflictSummary(
+        beds_checked=len(beds),
+        stays_checked=int(beds['stays'].sum()),
+        conflicting_pairs=int(overlaps.sum()),
+        beds_with_conflicts=len(flagged),
+        max_concurrency=int(beds['peak_concurrency'].max()) if len(beds) else 0,
+        worst_beds=pairs(dict(zip(flagged['bed_name'].astype(str).head(worst), flagged['conflicts'].head(worst)))),
+    )
+
+
+def main():
+    import argparse
+
+    from svdp.schema import load_export
+
+    parser = argparse.ArgumentParser(description="Find stays that share a bed on the same night.")
+    parser.add_argument("csv_file", help="Stay export, e.g. RileyEverything.csv")
+    parser.add_argument("--start", help="First night to check (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last night to check (YYYY-MM-DD)")
+    parser.add_argument("--out", help="Write the conflict table to this CSV")
+    args = parser.parse_args()
+
+    stays = load_export(args.csv_file, 'riley_everything', columns=['bed_name', 'full_name', 'entry_date',
+                                                                    'exit_date'])
+    check = find_bed_conflicts(stays, args.start, args.end)
+    flagged = check.beds[check.beds['conflicts'] > 0]
+    print(f"Checked {int(check.beds['stays'].sum())} stays on {len(check.beds)} beds")
+    print(f"Overlapping stay pairs: {len(check.conflicts)} on {len(flagged)} beds")
+    if len(flagged):
+        print(flagged.sort_values('conflicts', ascending=False).head(10).to_string(index=False))
+    if args.out:
+        check.conflicts.to_csv(args.out, index=False)
+        print(f"Conflict table written to: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Shared date parsing that parses each distinct date string once.
+
+The exports repeat a few thousand distinct date strings over hundreds of
+thousands of rows, so every parser here goes through a bounded memo table of
+(string, format hints) -> result, and the column functions parse only the
+distinct values and map the results back with NumPy indexing.
+
+Format hints are tuples of strptime formats tried in order; the special hint
+'iso' means ``datetime.fromisoformat`` (with a trailing 'Z' accepted).
+Common hint sets:
+
+    DATE_FORMATS     HMIS dates like 03/18/2025 (and ISO dates)
+    ENVOY_FORMATS    the Envoy sign-in cascade from EnvoyDuplicates.py
+    START_TIME_FORMATS  '03/18/2025, 02:30 PM' (UAV, Start Date/Time)
+
+Day ordinals are ``date.toordinal()`` values as int32, with MISSING_ORDINAL
+for values that did not parse, ready for interval arithmetic.
+
+NumPy and pandas are imported by the column functions only, so scripts that
+parse one value at a time (parse, strptime) start without them.
+"""
+
+import threading
+from datetime import datetime
+
+MISSING_ORDINAL = -1
+MEMO_SIZE = 65536
+
+DATE_FORMATS = ('%m/%d/%Y', '%Y-%m-%d')
+START_TIME_FORMATS = ('%m/%d/%Y, %I:%M %p',)
+ENVOY_FORMATS = ('iso', '%Y-%m-%d %H:%M:%S %Z%z', '%m/%d/%Y %I:%M:%S %p %Z%z', '%Y-%m-%d %H:%M:%S',
+                 '%m/%d/%Y %I:%M:%S %p')
+
+_memo = {}  # (text, formats) -> datetime, or None when no format matched
+_memo_lock = threading.Lock()
+
+
+def _parse_uncached(text, formats):
+    for date_format in formats:
+        try:
+            if date_format == 'iso':
+                return datetime.fromisoformat(text.replace('Z', '+00:00'))
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def parse(text, formats=DATE_FORMATS):
+    """
+    Parses one date string with the first matching format, remembering the result.
+
+    Args:
+        text (str): The date string; surrounding whitespace is ignored.
+        formats (tuple, optional): Format hints, tried in order. Defaults to DATE_FORMATS.
+
+    Returns:
+        datetime.datetime, or None if no format matched.
+    """
+    if isinstance(formats, str):
+        formats = (formats,)
+    key = (text, formats)
+    try:
+        return _memo[key]
+    except KeyError:
+        pass
+    value = _parse_uncached(text.strip(), formats) if isinstance(text, str) else None
+    with _memo_lock:
+        if len(_memo) >= MEMO_SIZE:
+            del _memo[next(iter(_memo))]  # drop the oldest entry
+        _memo[key] = value
+    return value
+
+
+def strptime(text, date_format):
+    """Memoized ``datetime.strptime``: same result and the same ValueError on a mismatch."""
+    value = parse(text, (date_format,))
+    if value is None:
+        raise ValueError(f"time data {text!r} does not match format {date_format!r}")
+    return value
+
+
+def clear_memo():
+    with _memo_lock:
+        _memo.clear()
+
+
+def _distinct(values):
+    """
+    Distinct values (hash-based, no sorting) and each row's index into them.
+    Missing values get index -1.
+    """
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    return [str(value) for value in uniques], codes
+
+
+def to_datetime(values, formats=DATE_FORMATS, infer=False):
+    """
+    Parses a column of date strings to datetime64, parsing each distinct value once.
+
+    Time zones are dropped, keeping the wall-clock time written in the export.
+
+    Args:
+        values (pandas.Series or array-like): Date strings; missing values become NaT.
+        formats (tuple, optional): Format hints. Defaults to DATE_FORMATS.
+        infer (bool, optional): Pass values no hint matched to pandas' own
+            format inference (like ``pd.to_datetime(errors='coerce')``). Defaults to False.
+
+    Returns:
+        pandas.Series of datetime64[ns] (index kept when given a Series).
+    """
+    import numpy as np
+    import pandas as pd
+
+    index = values.index if isinstance(values, pd.Series) else None
+    if len(values) == 0:
+        return pd.Series([], index=index, dtype='datetime64[ns]')
+    unique_values, codes = _distinct(values)
+    parsed = []
+    for text in unique_values:
+        when = parse(text, formats)
+        parsed.append(when.replace(tzinfo=None) if when is not None else None)
+    parsed = pd.to_datetime(pd.Series(parsed + [None], dtype=object), errors='coerce')  # last: missing
+    if infer:
+        leftover = np.flatnonzero(parsed.isna().to_numpy()[:-1])
+        if len(leftover):
+            retry = pd.to_datetime(pd.Series([unique_values[i] for i in leftover]), errors='coerce')
+            parsed.iloc[leftover] = retry.to_numpy()
+    return pd.Series(parsed.to_numpy(dtype='datetime64[ns]')[codes], index=index)
+
+
+def to_ordinals(values, formats=DATE_FORMATS):
+    """
+    Parses a column of date strings to int32 day ordinals (``date.toordinal()``),
+    parsing each distinct value once.
+
+    Returns:
+        numpy.ndarray: int32 ordinals, MISSING_ORDINAL where a value did not parse.
+    """
+    import numpy as np
+
+    if len(values) == 0:
+        return np.array([], dtype=np.int32)
+    unique_values, codes = _distinct(values)
+    ordinals = np.full(len(unique_values) + 1, MISSING_ORDINAL, dtype=np.int32)  # last: missing
+    for index, text in enumerate(unique_values):
+        when = parse(text, formats)
+        if when is not None:
+            ordinals[index] = when.toordinal()
+    return ordinals[codes]
+
+
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+def datetimes_to_ordinals(values):
+    """datetime64 values (Series or array) as int32 day ordinals, MISSING_ORDINAL for NaT."""
+    import numpy as np
+
+    days = np.asarray(values, dtype='datetime64[D]')
+    missing = np.isnat(days)
+    ordinals = days.astype(np.int64) + _EPOCH_ORDINAL
+    ordinals[missing] = MISSING_ORDINAL
+    return ordinals.astype(np.int32)
+
+
+def ordinals_to_datetimes(ordinals):
+    """int32 day ordinals back to datetime64[D] (NaT for MISSING_ORDINAL)."""
+    import numpy as np
+
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    days = (ordinals - _EPOCH_ORDINAL).astype('datetime64[D]')
+    days[ordinals == MISSING_ORDINAL] = np.datetime64('NaT')
+    return days
@@ -0,0 +1,138 @@
+"""
+Batched row diagnostics for the report scripts.
+
+Printing a warning (often the whole row) for every bad record makes a dirty
+export spend much of its run writing to the terminal. An Issues collector
+records each issue as a code number and a row index in compact arrays and
+prints one summary at the end:
+
+    issues = Issues("UAV.csv", {'bad_date': "Could not parse 'Start Date/Time'"})
+    for index, row in enumerate(reader):
+        ...
+        issues.add('bad_date', index, start_date_str)
+    issues.report()
+
+    UAV.csv: 12 issues
+      bad_date: 12 - Could not parse 'Start Date/Time' (rows 40, 157, 233, ...)
+        values: 'bad', '13/45/2025'
+
+Rows are numbered from 0 below the header, like a pandas index. Only row
+numbers, codes and the offending values are kept, never whole rows, so
+client names stay out of the summary and the issue file.
+
+The full list (row, code, message, value) is a CSV written only when asked
+for: to the path given to report(), or to ``<export>_issues.csv`` in
+SVDP_ISSUES_DIR when that is set.
+"""
+
+import csv
+import os
+from array import array
+from collections import Counter
+
+DEFAULT_SAMPLES = 3
+SHOWN_ROWS = 10  # row numbers listed per code in the summary
+
+
+def issues_path(source):
+    """Where the full issue list of an export goes: <export name>_issues.csv in SVDP_ISSUES_DIR (None if unset)."""
+    directory = os.environ.get('SVDP_ISSUES_DIR')
+    if not directory:
+        return None
+    stem = os.path.basename(str(source)).split('.')[0] or 'export'
+    return os.path.join(directory, f"{stem}_issues.csv")
+
+
+class Issues:
+    """
+    Issues found in one export's rows.
+
+    Args:
+        source (str): The export (its name labels the summary and the issue file).
+        messages (dict, optional): Issue code -> description printed in the summary.
+        samples (int, optional): Distinct offending values printed per code. Defaults to DEFAULT_SAMPLES.
+    """
+
+    def __init__(self, source, messages=None, samples=DEFAULT_SAMPLES):
+        self.source = source
+        self.messages = dict(messages or {})
+        self.samples = samples
+        self._names = []       # code number -> code
+        self._numbers = {}     # code -> code number
+        self._codes = array('H')
+        self._rows = array('q')
+        self._details = []     # the offending value of each issue (or None)
+        self._sampled = {}     # code -> first distinct offending values
+
+    def add(self, code, row, detail=None):
+        """
+        Records one issue.
+
+        Args:
+            code (str): Kind of issue, e.g. 'bad_date'.
+            row (int): Row index in the export.
+            detail (optional): The value at fault (one field, not the row).
+        """
+        number = self._numbers.get(code)
+        if number is None:
+            number = self._numbers[code] = len(self._names)
+            self._names.append(code)
+            self._sampled[code] = []
+        self._codes.append(number)
+        self._rows.append(row)
+        self._details.append(detail)
+        sampled = self._sampled[code]
+        if detail is not None and len(sampled) < self.samples and detail not in sampled:
+            sampled.append(detail)
+
+    def __len__(self):
+        return len(self._codes)
+
+    def counts(self):
+        """Issue code -> number of issues, in the order codes first occurred."""
+        totals = Counter(self._codes)
+        return {code: totals[number] for number, code in enumerate(self._names)}
+
+    def rows(self, code):
+        """Row indices with issue ``code``, in the order they were added."""
+        number = self._numbers.get(code)
+        return [row for found, row in zip(self._codes, self._rows) if found == number]
+
+    def write(self, path):
+        """Writes every issue (row, code, message, detail) to a CSV file."""
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['row', 'code', 'message', 'detail'])
+            for number, row, detail in zip(self._codes, self._rows, self._details):
+                code = self._names[number]
+                writer.writerow([row, code, self.messages.get(code, code), '' if detail is None else detail])
+
+    def report(self, path=None, show=True):
+        """
+        Prints the summary and, if ``path`` is given or SVDP_ISSUES_DIR is set
+        (issues_path), writes the full list. Does nothing without issues.
+
+        Returns:
+            dict: counts()
+        """
+        counts = self.counts()
+        if not counts:
+            return counts
+        path = path or issues_path(self.source)
+        where = ""
+        if path:
+            try:
+                self.write(path)
+                where = f" (full list: {path})"
+            except OSError as e:
+                where = f" (could not write the full list to {path}: {e})"
+        if show:
+            print(f"{os.path.basename(str(self.source))}: {len(self)} issues{where}")
+            for code, total in counts.items():
+                shown = self.rows(code)[:SHOWN_ROWS]
+                more = ", ..." if total > len(shown) else ""
+                print(f"  {code}: {total} - {self.messages.get(code, code)} "
+                      f"(rows {', '.join(map(str, shown))}{more})")
+                if self._sampled[code]:
+                    print(f"    values: {', '.join(map(repr, self._sampled[code]))}")
+        return counts
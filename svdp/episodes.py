@@ -0,0 +1,171 @@
+"""
+Bed-transfer episode stitching.
+
+A client who moves beds, rooms or houses shows up in the HMIS exports as
+several stays. An episode is one continuous time in shelter: a client's
+stays joined while each starts no more than ``max_gap_days`` after the
+latest exit so far, or is flagged 'Bed Transfer' and starts within
+``transfer_gap_days``.
+
+Stays are sorted by client, entry day and Start Date/Time once; the gaps
+between each stay and the running latest exit of the client's earlier
+stays are then computed for all rows at once, so stitching is O(n log n)
+for the sort and vectorized after it.
+
+The episode table uses the stay export's canonical column names
+(entry_date, exit_date, bed_name, age, gender, exit_reason, ...), so it goes
+straight into svdp.los.prepare_stays or anything else that reads stays:
+
+    stays = load_export("RileyEverything.csv", 'riley_everything')
+    episodes = build_episodes(stays)
+    distributions = los.length_of_stay(los.prepare_stays(episodes), clip_days=90)
+
+Usage:
+    python -m svdp.episodes RileyEverything.csv [--out episodes.csv]
+"""
+
+import numpy as np
+import pandas as pd
+
+from svdp import dates
+
+DEFAULT_MAX_GAP_DAYS = 1  # re-entry the day after an exit continues the episode
+TRANSFER_GAP_DAYS = 7
+OPEN_ORDINAL = np.iinfo(np.int32).max  # stand-in exit for stays still open
+
+TRANSFER_VALUES = ('yes', 'y', 'true', '1', 'transfer')
+
+
+def _day_ordinals(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return dates.datetimes_to_ordinals(values)
+    return dates.to_ordinals(values)
+
+
+def _is_transfer(values):
+    return pd.Series(values).astype('string').str.strip().str.casefold().isin(TRANSFER_VALUES).to_numpy()
+
+
+def assign_episodes(df, client_column='full_name', max_gap_days=DEFAULT_MAX_GAP_DAYS,
+                    transfer_gap_days=TRANSFER_GAP_DAYS):
+    """
+    Episode number of each stay.
+
+    Args:
+        df (pandas.DataFrame): Stays with ``client_column``, entry_date and
+            exit_date; bed_transfer and start_time are used when present.
+        client_column (str, optional): Column identifying the client. Defaults to "full_name".
+        max_gap_days (int, optional): Largest entry-after-exit gap that continues an episode.
+        transfer_gap_days (int, optional): Largest gap for a stay flagged as a bed transfer.
+
+    Returns:
+        tuple: (int32 episode number per row in df's order, -1 for stays without
+        a client or entry date; the row order that sorts the stays by client and entry).
+    """
+    clients = df[client_column].astype('string').str.strip().str.casefold()
+    client_codes, _ = pd.factorize(clients)  # -1 for missing
+    entry = _day_ordinals(df['entry_date']).astype(np.int64)
+    exit_ = _day_ordinals(df['exit_date']).astype(np.int64)
+    exit_[exit_ == dates.MISSING_ORDINAL] = OPEN_ORDINAL
+    start = (df['start_time'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+             if 'start_time' in df else np.zeros(len(df), dtype=np.int64))
+    transfer = _is_transfer(df['bed_transfer']) if 'bed_transfer' in df else np.zeros(len(df), dtype=bool)
+
+    valid = (client_codes >= 0) & (entry != dates.MISSING_ORDINAL)
+    order = np.lexsort((start, entry, client_codes))
+    order = order[valid[order]]
+
+    client = client_codes[order]
+    entry, exit_, transfer = entry[order], exit_[order], transfer[order]
+    first_of_client = np.ones(len(order), dtype=bool)
+    first_of_client[1:] = client[1:] != client[:-1]
+
+    # Latest exit over the client's earlier stays: a running max that restarts per
+    # client, done as one accumulate by lifting each client above the previous one.
+    span = np.int64(OPEN_ORDINAL) + 1
+    lifted = np.maximum.accumulate(client * span + exit_) - client * span
+    latest_exit = np.empty(len(order), dtype=np.int64)
+    latest_exit[1:] = lifted[:-1]
+    latest_exit[first_of_client] = OPEN_ORDINAL
+    gap = entry - latest_exit
+
+    continues = ~first_of_client & ((gap <= max_gap_days) | (transfer & (gap <= transfer_gap_days)))
+    numbers = np.cumsum(~continues) - 1
+
+    episode = np.full(len(df), -1, dtype=np.int32)
+    episode[order] = numbers
+    return episode, order
+
+
+def build_episodes(df, client_column='full_name', max_gap_days=DEFAULT_MAX_GAP_DAYS,
+                   transfer_gap_days=TRANSFER_GAP_DAYS):
+    """
+    Stitches stays into episodes.
+
+    Returns:
+        pandas.DataFrame: One row per episode, in client and entry order, with
+        episode, ``client_column``, entry_date (first entry), exit_date (latest
+        exit; NaT while any stay is open), days, stays, transfers, bed_name
+        (first bed), last_bed_name, and age, gender and exit_reason (age at
+        entry, gender and exit reason of the last stay) when the stays have them.
+    """
+    episode, order = assign_episodes(df, client_column, max_gap_days, transfer_gap_days)
+    numbers = episode[order]
+    starts = np.flatnonzero(np.r_[True, numbers[1:] != numbers[:-1]]) if len(order) else np.array([], int)
+    ends = np.r_[starts[1:], len(order)] - 1
+    first_rows, last_rows = order[starts], order[ends]
+
+    entry = _day_ordinals(df['entry_date']).astype(np.int64)[order]
+    exit_ = _day_ordinals(df['exit_date']).astype(np.int64)[order]
+    exit_[exit_ == dates.MISSING_ORDINAL] = OPEN_ORDINAL
+    episode_entry = entry[starts]
+    episode_exit = np.maximum.reduceat(exit_, starts) if len(starts) else exit_[:0]
+    is_open = episode_exit == OPEN_ORDINAL
+    days = np.where(is_open, -1, episode_exit - episode_entry)
+    episode_exit = np.where(is_open, dates.MISSING_ORDINAL, episode_exit)
+
+    out = pd.DataFrame({
+        'episode': numbers[starts],
+        client_column: df[client_column].to_numpy()[first_rows],
+        'entry_date': dates.ordinals_to_datetimes(episode_entry).astype('datetime64[ns]'),
+        'exit_date': dates.ordinals_to_datetimes(episode_exit).astype('datetime64[ns]'),
+        'days': days.astype(np.int32),
+        'stays': (ends - starts + 1).astype(np.int32),
+    })
+    if 'bed_transfer' in df:
+        transfers = _is_transfer(df['bed_transfer'])[order].astype(np.int32)
+        out['transfers'] = (np.add.reduceat(transfers, starts) if len(starts) else transfers[:0]).astype(np.int32)
+    # Per-episode columns keep the stays' compact dtypes (category, Int8).
+    for name, source, rows in (('bed_name', 'bed_name', first_rows), ('last_bed_name', 'bed_name', last_rows),
+                               ('age', 'age', first_rows), ('gender', 'gender', last_rows),
+                               ('exit_reason', 'exit_reason', last_rows)):
+        if source in df:
+            out[name] = df[source].iloc[rows].reset_index(drop=True)
+    return out
+
+
+def main():
+    import argparse
+
+    from svdp.schema import load_export
+
+    parser = argparse.ArgumentParser(description="Stitch bed stays into episodes.")
+    parser.add_argument("csv_file", help="Stay export, e.g. RileyEverything.csv")
+    parser.add_argument("--out", help="Write the episode table to this CSV")
+    parser.add_argument("--max-gap", type=int, default=DEFAULT_MAX_GAP_DAYS,
+                        help="Days between stays that still continue an episode")
+    parser.add_argument("--transfer-gap", type=int, default=TRANSFER_GAP_DAYS,
+                        help="Same, for stays flagged as bed transfers")
+    args = parser.parse_args()
+
+    stays = load_export(args.csv_file, 'riley_everything')
+    episodes = build_episodes(stays, max_gap_days=args.max_gap, transfer_gap_days=args.transfer_gap)
+    print(f"{len(stays)} stays -> {len(episodes)} episodes for {episodes['full_name'].nunique()} clients")
+    print(f"Episodes with more than one stay: {int((episodes['stays'] > 1).sum())}")
+    if args.out:
+        episodes.to_csv(args.out, index=False)
+        print(f"Episode table written to: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Per-stage timing and memory spans for the report functions.
+
+Wrap the parts of a report in spans named after the stage they belong to
+(load, parse, filter, aggregate, write, ...):
+
+    from svdp import instrument
+
+    with instrument.span('load', 'RileyEverything.csv') as s:
+        df = load_export(...)
+        s.rows = len(df)
+
+or decorate a whole function with ``@instrument.traced('aggregate')``.
+
+Spans do nothing until ``enable()`` is called; a disabled span is one shared
+no-op object, so instrumented code costs a global lookup and a method call.
+When enabled each finished span records wall time, CPU time of its thread,
+rows (if the code sets them) and the tracemalloc high-water mark above the
+memory in use when the span started. Records are kept in memory, optionally
+written as JSON lines, and ``summary_table()`` totals them per stage.
+
+tracemalloc is process-wide, so spans running at the same time in different
+threads see each other's allocations in their peaks.
+"""
+
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+
+_enabled = False
+_track_memory = False
+_started_tracing = False
+_jsonl = None
+_records = []
+_open_spans = []
+_lock = threading.Lock()
+
+
+class _NullSpan:
+    """What ``span`` returns while instrumentation is disabled."""
+
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass  # s.rows = ... is ignored
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _fold_peak():
+    """Credits the tracemalloc peak so far to every open span, then resets it. Caller holds _lock."""
+    current, peak = tracemalloc.get_traced_memory()
+    for open_span in _open_spans:
+        open_span._peak = max(open_span._peak, peak)
+    tracemalloc.reset_peak()
+    return current
+
+
+class Span:
+    """A timed region. Set ``rows`` inside the ``with`` block to record how many rows it handled."""
+
+    def __init__(self, stage, label=None, rows=None):
+        self.stage = stage
+        self.label = label
+        self.rows = rows
+        self._peak = 0
+        self._base = 0
+
+    def __enter__(self):
+        if _track_memory:
+            with _lock:
+                self._base = _fold_peak()
+                self._peak = self._base
+                _open_spans.append(self)
+        self._started = time.time()
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        peak = None
+        if _track_memory:
+            with _lock:
+                _fold_peak()
+                _open_spans.remove(self)
+            peak = max(self._peak - self._base, 0)
+        record = OrderedDict([
+            ('stage', self.stage),
+            ('label', self.label),
+            ('start', round(self._started, 6)),
+            ('wall_s', round(wall, 6)),
+            ('cpu_s', round(cpu, 6)),
+            ('rows', self.rows),
+            ('peak_bytes', peak),
+            ('thread', threading.current_thread().name),
+            ('error', exc_type.__name__ if exc_type else None),
+        ])
+        _emit(record)
+        return False
+
+
+def _emit(record):
+    with _lock:
+        _records.append(record)
+        if _jsonl is not None:
+            _jsonl.write(json.dumps(record) + "\n")
+            _jsonl.flush()
+
+
+def span(stage, label=None, rows=None):
+    """
+    Returns a context manager timing one stage.
+
+    Args:
+        stage (str): Stage name, e.g. 'load', 'parse', 'filter', 'aggregate' or 'write'.
+        label (str, optional): What the stage works on (a file, a report name).
+        rows (int, optional): Rows handled, if known up front.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(stage, label, rows)
+
+
+def traced(stage, label=None, rows=None):
+    """
+    Decorator form of ``span``. ``label`` defaults to the function name;
+    ``rows`` is an optional function of the return value, e.g. ``len``.
+    """
+    def decorate(func):
+        name = label or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(stage, name) as s:
+                result = func(*args, **kwargs)
+                if rows is not None and result is not None:
+                    s.rows = rows(result)
+                return result
+        return wrapper
+    return decorate
+
+
+def enable(jsonl_path=None, memory=True):
+    """
+    Starts recording spans.
+
+    Args:
+        jsonl_path (str, optional): Append each finished span to this file as a JSON line.
+        memory (bool, optional): Track peak memory with tracemalloc (slows
+            allocation-heavy code noticeably). Defaults to True.
+    """
+    global _enabled, _track_memory, _started_tracing, _jsonl
+    disable()
+    if jsonl_path:
+        _jsonl = open(jsonl_path, 'a', encoding='utf-8')
+    if memory:
+        _started_tracing = not tracemalloc.is_tracing()
+        if _started_tracing:
+            tracemalloc.start()
+        _track_memory = True
+    _enabled = True
+
+
+def disable():
+    """Stops recording spans and closes the JSON lines file. Recorded spans are kept."""
+    global _enabled, _track_memory, _started_tracing, _jsonl
+    _enabled = False
+    if _started_tracing:
+        tracemalloc.stop()  # only if enable() started it
+        _started_tracing = False
+    _track_memory = False
+    if _jsonl is not None:
+        _jsonl.close()
+        _jsonl = None
+
+
+def is_enabled():
+    return _enabled
+
+
+def records():
+    """Finished spans, oldest first, as dicts."""
+    with _lock:
+        return [dict(record) for record in _records]
+
+
+def clear():
+    """Forgets the recorded spans."""
+    with _lock:
+        _records.clear()
+
+
+def summary(by_label=False):
+    """
+    Totals per stage (or per stage and label).
+
+    Returns:
+        list: Dicts with stage, label, count, wall_s, cpu_s, rows, peak_bytes
+              (the largest single-span peak), in first-seen order.
+    """
+    totals = OrderedDict()
+    for record in records():
+        key = (record['stage'], record['label'] if by_label else None)
+        total = totals.setdefault(key, {'stage': key[0], 'label': key[1], 'count': 0, 'wall_s': 0.0,
+                                        'cpu_s': 0.0, 'rows': 0, 'peak_bytes': None})
+        total['count'] += 1
+        total['wall_s'] += record['wall_s']
+        total['cpu_s'] += record['cpu_s']
+        total['rows'] += record['rows'] or 0
+        if record['peak_bytes'] is not None:
+            total['peak_bytes'] = max(total['peak_bytes'] or 0, record['peak_bytes'])
+    return list(totals.values())
+
+
+def summary_table(by_label=False):
+    """The summary as a fixed-width text table."""
+    lines = [f"{'stage':<40} {'spans':>5} {'wall s':>9} {'cpu s':>9} {'rows':>10} {'peak MiB':>9}"]
+    for total in summary(by_label):
+        name = f"{total['stage']} {total['label']}" if total['label'] else total['stage']
+        peak = f"{total['peak_bytes'] / 2 ** 20:9.1f}" if total['peak_bytes'] is not None else f"{'-':>9}"
+        lines.append(f"{name[:40]:<40} {total['count']:>5} {total['wall_s']:9.3f} {total['cpu_s']:9.3f} "
+                     f"{total['rows']:>10} {peak}")
+    return "\n".join(lines)
@@ -0,0 +1,308 @@
+"""
+Length-of-stay distributions per cohort.
+
+Stays are measured in whole days (Exit Date - Entry Date) and kept as exact
+integer-day histograms, one row per cohort. Every statistic comes from the
+histogram: the mean, means clipped at any cap (the Mary Kay reports cap at 90
+and 360 days), the median and other percentiles (NumPy's linear
+interpolation, so they match ``Series.median``/``quantile``) and binned counts.
+
+A cohort is any combination of columns, by default house x age group x gender
+x exit reason. All cohorts are counted in one grouped pass: the rows get a
+cohort code and a single ``np.bincount`` over (code, days) fills every
+histogram at once.
+
+Histograms add, so they merge exactly. ``LengthOfStaySketch`` keeps them
+across chunks, files or years and is what the one-shot functions use:
+
+    sketch = LengthOfStaySketch(by=('house', 'age_group'))
+    for chunk in pd.read_csv("RileyEverything.csv", chunksize=200_000):
+        sketch.add(prepare_stays(chunk))
+    distributions = sketch.distributions(clip_days=90)
+
+Memory is one int64 per (cohort, day) up to ``max_days``; longer stays go in
+the last day (their exact total is kept, so means stay exact).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from svdp import dates
+
+DEFAULT_BY = ('house', 'age_group', 'gender', 'exit_reason')
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+# Histogram bin edges in days: 0-6, 7-29, 30-89, 90-179, 180-364, 365+.
+DEFAULT_BINS = (0, 7, 30, 90, 180, 365)
+MAX_DAYS = 3660
+UNKNOWN = "Unknown"
+
+# (label, lowest age, highest age); ages outside every group and missing ages are UNKNOWN.
+AGE_GROUPS = (("child", 0, 17), ("adult", 18, 130))
+MARYKAY_AGE_GROUPS = (("0-18", 0, 18), ("19-50", 19, 50), ("51+", 51, 130))
+
+StayDistribution = namedtuple('StayDistribution', [
+    'cohort', 'stays', 'mean_days', 'clip_days', 'clipped_mean_days', 'median_days', 'percentiles',
+    'histogram'])
+StayDistribution.__doc__ = """
+Length of stay of one cohort. cohort, percentiles and histogram are tuples of
+(key, value) pairs: (column, value), (percentile, days) and (bin label, stays).
+clipped_mean_days is None when no clip_days was asked for.
+"""
+
+
+def stay_days(entry_dates, exit_dates, as_of=None):
+    """
+    Whole days from entry to exit, as int32; -1 where either date is missing
+    or the exit is before the entry.
+
+    Args:
+        entry_dates, exit_dates: datetime64 Series/arrays, or int day ordinals.
+        as_of (datetime.date, optional): Measure stays with no exit to this day
+            instead of leaving them out.
+    """
+    entry = _ordinals(entry_dates)
+    exit_ = _ordinals(exit_dates)
+    if as_of is not None:
+        exit_ = np.where(exit_ == dates.MISSING_ORDINAL, pd.Timestamp(as_of).toordinal(), exit_)
+    days = exit_.astype(np.int64) - entry
+    valid = (entry != dates.MISSING_ORDINAL) & (exit_ != dates.MISSING_ORDINAL) & (days >= 0)
+    return np.where(valid, days, -1).astype(np.int32)
+
+
+def _ordinals(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.integer):
+        return values.astype(np.int32)
+    return dates.datetimes_to_ordinals(values)
+
+
+def age_groups(ages, groups=AGE_GROUPS):
+    """Age group label of each age (UNKNOWN when missing or in no group), as a categorical."""
+    ages = pd.to_numeric(pd.Series(ages), errors='coerce').to_numpy(dtype=float)
+    labels = [label for label, _, _ in groups]
+    codes = np.full(len(ages), -1, dtype=np.int8)
+    for code, (_, low, high) in enumerate(groups):
+        codes[(codes == -1) & (ages >= low) & (ages <= high)] = code
+    codes[codes == -1] = len(labels)
+    return pd.Categorical.from_codes(codes, labels + [UNKNOWN])
+
+
+def houses(beds):
+    """'RH' or 'BH' from a bed column ('RH Bed 24', 'BH Rm 6-A'), UNKNOWN otherwise."""
+    beds = pd.Series(beds).astype('string').str.upper()
+    house = np.where(beds.str.contains('RH', na=False), 'RH',
+                     np.where(beds.str.contains('BH', na=False), 'BH', UNKNOWN))
+    return pd.Categorical(house)
+
+
+def prepare_stays(df, age_group_bins=AGE_GROUPS, as_of=None):
+    """
+    Adds the columns the engine groups and measures by to a stay export
+    (canonical names from svdp.schema, or the export's own headers):
+    'days', 'house', 'age_group', and 'gender' / 'exit_reason' when present.
+    """
+    rename = {'Entry Date': 'entry_date', 'Exit Date': 'exit_date', 'Age': 'age', 'Gender': 'gender',
+              'Exit Reason': 'exit_reason', 'Bed: Bed Number': 'bed_name',
+              'Bed Assignment Name': 'bed_assignment_name'}
+    df = df.rename(columns={key: value for key, value in rename.items() if key in df and value not in df})
+    out = pd.DataFrame(index=df.index)
+    entry, exit_ = (df[name] if pd.api.types.is_datetime64_any_dtype(df[name])
+                    else dates.to_datetime(df[name], infer=True) for name in ('entry_date', 'exit_date'))
+    out['days'] = stay_days(entry, exit_, as_of)
+    beds = df['bed_name'] if 'bed_name' in df else df.get('bed_assignment_name')
+    out['house'] = houses(beds) if beds is not None else UNKNOWN
+    out['age_group'] = age_groups(df['age'], age_group_bins) if 'age' in df else UNKNOWN
+    for name in ('gender', 'exit_reason'):
+        if name in df:
+            out[name] = df[name].astype('string').str.strip().fillna(UNKNOWN).astype('category')
+    return out
+
+
+def percentile(cumulative, total, percent):
+    """
+    NumPy-style linear percentile of the integer values a histogram counts,
+    from its cumulative sum (``cumulative[v]`` = values <= v) and their count.
+    """
+    position = percent / 100 * (total - 1)
+    low = int(np.floor(position))
+    below = np.searchsorted(cumulative, [low + 1, min(low + 2, total)], side='left')
+    return float(below[0] + (position - low) * (below[1] - below[0]))
+
+
+def bin_labels(bins):
+    """Labels of integer bins from their edges: (0, 7, 30) -> ['0-6', '7-29', '30+'] (a one-value bin is '7')."""
+    labels = [str(low) if high - low == 1 else f"{low}-{high - 1}" for low, high in zip(bins, bins[1:])]
+    return labels + [f"{bins[-1]}+"]
+
+
+class LengthOfStaySketch:
+    """
+    Mergeable exact integer-day histograms of length of stay, one per cohort.
+
+    Args:
+        by (tuple, optional): Cohort columns. Defaults to DEFAULT_BY; columns
+            missing from the data count as UNKNOWN.
+        max_days (int, optional): Days tracked individually. Defaults to MAX_DAYS.
+    """
+
+    def __init__(self, by=DEFAULT_BY, max_days=MAX_DAYS):
+        self.by = tuple(by)
+        self.max_days = max_days
+        self.cohorts = {}  # cohort key tuple -> histogram row
+        self.counts = np.zeros((0, max_days + 1), dtype=np.int64)
+        self.totals = np.zeros(0, dtype=np.int64)  # exact sum of days per cohort
+
+    def _rows_for(self, keys):
+        rows = np.empty(len(keys), dtype=np.int64)
+        for index, key in enumerate(keys):
+            if key not in self.cohorts:
+                self.cohorts[key] = len(self.cohorts)
+            rows[index] = self.cohorts[key]
+        grow = len(self.cohorts) - len(self.totals)
+        if grow:
+            self.counts = np.vstack([self.counts, np.zeros((grow, self.max_days + 1), dtype=np.int64)])
+            self.totals = np.concatenate([self.totals, np.zeros(grow, dtype=np.int64)])
+        return rows
+
+    def add(self, df):
+        """
+        Adds the stays of a frame with a 'days' column (see prepare_stays) and
+        the cohort columns. Rows with days < 0 are skipped. Returns self.
+        """
+        days = df['days'].to_numpy(dtype=np.int64)
+        keep = days >= 0
+        if not keep.any():
+            return self
+        if self.by:
+            keys = pd.DataFrame({name: (df[name].astype(object).where(df[name].notna(), UNKNOWN)
+                                        if name in df else pd.Series(UNKNOWN, index=df.index))
+                                 for name in self.by})[keep]
+            # One code per row for its cohort, then a single bincount over (cohort, days).
+            codes, uniques = pd.MultiIndex.from_frame(keys).factorize()
+        else:
+            codes, uniques = np.zeros(int(keep.sum()), dtype=np.int64), [()]
+        rows = self._rows_for([tuple(key) for key in uniques])[codes]
+        days = days[keep]
+        width = self.max_days + 1
+        flat = np.bincount(rows * width + np.minimum(days, self.max_days),
+                           minlength=len(self.totals) * width)
+        self.counts += flat.reshape(len(self.totals), width)
+        self.totals += np.bincount(rows, weights=days, minlength=len(self.totals)).astype(np.int64)
+        return self
+
+    def merge(self, other):
+        """Adds another sketch's histograms (same ``by`` and ``max_days``) into this one. Returns self."""
+        if other.by != self.by or other.max_days != self.max_days:
+            raise ValueError("Sketches with different cohorts or max_days cannot be merged")
+        keys = list(other.cohorts)
+        rows = self._rows_for(keys)
+        source = np.array([other.cohorts[key] for key in keys], dtype=np.int64)
+        self.counts[rows] += other.counts[source]
+        self.totals[rows] += other.totals[source]
+        return self
+
+    def overall(self):
+        """A sketch with every cohort combined into one."""
+        combined = LengthOfStaySketch(by=(), max_days=self.max_days)
+        combined._rows_for([()])
+        combined.counts[0] = self.counts.sum(axis=0)
+        combined.totals[0] = self.totals.sum()
+        return combined
+
+    def distributions(self, clip_days=None, percentiles=DEFAULT_PERCENTILES, bins=DEFAULT_BINS):
+        """
+        One StayDistribution per cohort, largest cohort first.
+
+        Args:
+            clip_days (int, optional): Cap each stay at this many days for clipped_mean_days.
+            percentiles (tuple, optional): Percentiles to report. Defaults to DEFAULT_PERCENTILES.
+            bins (tuple, optional): Histogram bin edges in days. Defaults to DEFAULT_BINS.
+
+        Returns:
+            tuple of StayDistribution
+        """
+        if clip_days is not None and clip_days > self.max_days:
+            raise ValueError(f"clip_days must be at most max_days ({self.max_days})")
+        day_values = np.arange(self.max_days + 1)
+        edges = np.asarray(bins)
+        labels = bin_labels(bins)
+        stays = self.counts.sum(axis=1)
+        cumulative = np.cumsum(self.counts, axis=1)
+        binned = np.add.reduceat(self.counts, edges, axis=1) if len(self.totals) else self.counts
+        clipped = (self.counts @ np.minimum(day_values, clip_days)) if clip_days is not None else None
+
+        results = []
+        for key, row in sorted(self.cohorts.items(), key=lambda item: -stays[item[1]]):
+            total = int(stays[row])
+            if total == 0:
+                continue
+            results.append(StayDistribution(
+                cohort=tuple(zip(self.by, key)),
+                stays=total,
+                mean_days=float(self.totals[row] / total),
+                clip_days=clip_days,
+                clipped_mean_days=float(clipped[row] / total) if clipped is not None else None,
+                median_days=percentile(cumulative[row], total, 50),
+                percentiles=tuple((p, percentile(cumulative[row], total, p))
+                                  for p in percentiles),
+                histogram=tuple(zip(labels, binned[row].tolist())),
+            ))
+        return tuple(results)
+
+
+def length_of_stay(df, by=DEFAULT_BY, clip_days=None, percentiles=DEFAULT_PERCENTILES, bins=DEFAULT_BINS,
+                   max_days=MAX_DAYS):
+    """
+    Length-of-stay distributions of a stay export, per cohort, in one grouped pass.
+
+    Args:
+        df (pandas.DataFrame): Stays, already through prepare_stays() (or with a 'days' column).
+        by (tuple, optional): Cohort columns; () for one overall distribution.
+
+    Returns:
+        tuple of StayDistribution, largest cohort first.
+    """
+    if 'days' not in df:
+        df = prepare_stays(df)
+    sketch = LengthOfStaySketch(by, max_days).add(df)
+    return sketch.distributions(clip_days, percentiles, bins)
+
+
+def clipped_mean(days, clip_days):
+    """Mean of ``days`` capped at ``clip_days``, ignoring negative (invalid) stays; None if there are none."""
+    days = np.asarray(days, dtype=np.int64)
+    days = days[days >= 0]
+    if len(days) == 0:
+        return None
+    return float(np.minimum(days, clip_days).mean())
+
+
+def length_of_stay_file(csv_file, export_type='riley_everything', by=DEFAULT_BY, clip_days=None,
+                        chunksize=None, age_group_bins=AGE_GROUPS, episodes=False, **options):
+    """
+    Length-of-stay distributions of a stay export file. With ``chunksize`` the
+    file is streamed through a sketch, so memory does not grow with the file.
+    With ``episodes`` stays are first stitched into bed-transfer episodes
+    (svdp.episodes), which needs the whole file at once.
+    """
+    from svdp.schema import iter_export, load_export
+
+    columns = ['entry_date', 'exit_date']
+    wanted = ['age', 'gender', 'exit_reason', 'bed_name', 'bed_assignment_name']
+    sketch = LengthOfStaySketch(by, options.pop('max_days', MAX_DAYS))
+    if episodes:
+        if chunksize is not None:
+            raise ValueError("episodes=True reads the whole file; leave chunksize unset")
+        from svdp.episodes import build_episodes
+
+        stays = load_export(csv_file, export_type, columns + ['full_name'],
+                            wanted + ['bed_transfer', 'start_time'])
+        sketch.add(prepare_stays(build_episodes(stays), age_group_bins))
+    elif chunksize is None:
+        sketch.add(prepare_stays(load_export(csv_file, export_type, columns, wanted), age_group_bins))
+    else:
+        for chunk in iter_export(csv_file, export_type, columns, wanted, chunksize=chunksize):
+            sketch.add(prepare_stays(chunk, age_group_bins))
+    return sketch.distributions(clip_days, **options)
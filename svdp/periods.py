@@ -0,0 +1,198 @@
+"""
+The reporting calendar: period boundaries and day -> period lookups as day
+ordinals.
+
+Periods are calendar months, quarters and years, and fiscal months, quarters
+and years (SVdP's fiscal year runs July 1 - June 30 and is named for the
+calendar year it ends in). Boundaries are ``date.toordinal()`` values, the
+same day ordinals svdp.dates and svdp.colscan produce, so bucketing a column of
+dates is array indexing:
+
+    calendar = period_calendar('fiscal_quarter', date(2023, 7, 1), date(2025, 6, 30))
+    index = calendar.index_of(ordinals)           # -1 outside the span / missing
+    counts = calendar.count(ordinals)             # {'FY2024-Q1': 12, ...}
+
+Calendars are cached per (granularity, span, fiscal year start), so every
+report asking for the same periods shares one set of arrays.
+
+Labels come from svdp.buckets.bucket_label, so they match UAV's buckets and
+sort chronologically as plain strings:
+    month           2025-03
+    quarter         2025-Q1
+    year            2025
+    fiscal_month    FY2025-M09   (March is the 9th month of FY2025)
+    fiscal_quarter  FY2025-Q3
+    fiscal_year     FY2025
+"""
+
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+
+from svdp.buckets import FISCAL_YEAR_START_MONTH, bucket_label
+from svdp.dates import MISSING_ORDINAL
+
+PERIOD_GRANULARITIES = ('month', 'quarter', 'year', 'fiscal_month', 'fiscal_quarter', 'fiscal_year')
+
+_MONTHS_PER_PERIOD = {'month': 1, 'quarter': 3, 'year': 12,
+                      'fiscal_month': 1, 'fiscal_quarter': 3, 'fiscal_year': 12}
+
+
+def _as_ordinal(day):
+    return day if isinstance(day, (int, np.integer)) else day.toordinal()
+
+
+def _month_index(year, month):
+    return year * 12 + (month - 1)
+
+
+def _month_start(month_index):
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _first_period_month(granularity, day, fiscal_year_start):
+    """Month index of the start of the period containing ``day``."""
+    size = _MONTHS_PER_PERIOD[granularity]
+    anchor = (fiscal_year_start - 1) if granularity.startswith('fiscal') else 0
+    month = _month_index(day.year, day.month)
+    return month - ((month - anchor) % size)
+
+
+class PeriodCalendar:
+    """
+    Periods covering a span of days. Build through period_calendar(), which caches them.
+
+        labels     tuple of period labels, in order
+        starts     int32 first-day ordinal of each period
+        ends       int32 last-day ordinal of each period (inclusive)
+        first_day  ordinal of the first covered day
+        lookup     int32 period index of each covered day, from first_day on
+    """
+
+    __slots__ = ('granularity', 'labels', 'starts', 'ends', 'first_day', 'lookup')
+
+    def __init__(self, granularity, labels, starts, ends):
+        self.granularity = granularity
+        self.labels = tuple(labels)
+        self.starts = np.asarray(starts, dtype=np.int32)
+        self.ends = np.asarray(ends, dtype=np.int32)
+        self.first_day = int(self.starts[0])
+        # Day -> period index for the whole covered span, built with one repeat.
+        self.lookup = np.repeat(np.arange(len(self.labels), dtype=np.int32), self.ends - self.starts + 1)
+        for array in (self.starts, self.ends, self.lookup):
+            array.setflags(write=False)  # shared by every caller of the cache
+
+    @property
+    def days(self):
+        """Days in each period."""
+        return self.ends - self.starts + 1
+
+    def index_of(self, ordinals):
+        """Period index of each day ordinal; -1 for days outside the span and MISSING_ORDINAL."""
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        offsets = ordinals - self.first_day
+        inside = (offsets >= 0) & (offsets < len(self.lookup)) & (ordinals != MISSING_ORDINAL)
+        index = np.full(len(ordinals), -1, dtype=np.int32)
+        index[inside] = self.lookup[offsets[inside]]
+        return index
+
+    def count(self, ordinals):
+        """Number of days (rows) per period, as {label: count} for every period in the span."""
+        index = self.index_of(ordinals)
+        counts = np.bincount(index[index >= 0], minlength=len(self.labels))
+        return dict(zip(self.labels, counts.tolist()))
+
+    def window(self, label):
+        """(label, start date, end date) of one period."""
+        position = self.labels.index(label)
+        return label, date.fromordinal(int(self.starts[position])), date.fromordinal(int(self.ends[position]))
+
+    def windows(self):
+        """Every period as (label, start date, end date), e.g. for svdp.report990."""
+        return [self.window(label) for label in self.labels]
+
+
+@lru_cache(maxsize=256)
+def _build(granularity, first_ordinal, last_ordinal, fiscal_year_start):
+    first_day = date.fromordinal(first_ordinal)
+    last_day = date.fromordinal(last_ordinal)
+    size = _MONTHS_PER_PERIOD[granularity]
+    month = _first_period_month(granularity, first_day, fiscal_year_start)
+    last_month = _month_index(last_day.year, last_day.month)
+
+    labels, starts, ends = [], [], []
+    while month <= last_month:
+        start = _month_start(month)
+        labels.append(bucket_label(start, granularity, fiscal_year_start))
+        starts.append(start.toordinal())
+        ends.append(_month_start(month + size).toordinal() - 1)
+        month += size
+    return PeriodCalendar(granularity, labels, starts, ends)
+
+
+def period_calendar(granularity, first_day, last_day, fiscal_year_start=FISCAL_YEAR_START_MONTH):
+    """
+    The (cached) calendar of ``granularity`` periods covering first_day..last_day.
+
+    Args:
+        granularity (str): One of PERIOD_GRANULARITIES.
+        first_day, last_day (datetime.date or int ordinal): The span to cover;
+            the first and last periods are whole, so they may extend past it.
+        fiscal_year_start (int, optional): Month the fiscal year starts in. Defaults to 7.
+
+    Returns:
+        PeriodCalendar
+    """
+    if granularity not in _MONTHS_PER_PERIOD:
+        raise ValueError(f"Unknown granularity '{granularity}'. Use one of: {', '.join(PERIOD_GRANULARITIES)}")
+    first_ordinal, last_ordinal = _as_ordinal(first_day), _as_ordinal(last_day)
+    if last_ordinal < first_ordinal:
+        raise ValueError("last_day is before first_day")
+    return _build(granularity, int(first_ordinal), int(last_ordinal), fiscal_year_start)
+
+
+def period_window(granularity, day, fiscal_year_start=FISCAL_YEAR_START_MONTH):
+    """(label, start date, end date) of the period containing ``day``."""
+    calendar = period_calendar(granularity, day, day, fiscal_year_start)
+    return calendar.window(calendar.labels[0])
+
+
+def fiscal_year_window(fiscal_year, fiscal_year_start=FISCAL_YEAR_START_MONTH):
+    """(label, start, end) of a fiscal year, named for the year it ends in: FY2025 = 07/01/2024 - 06/30/2025."""
+    last_month = date(fiscal_year, (fiscal_year_start - 2) % 12 + 1, 1)
+    return period_window('fiscal_year', last_month, fiscal_year_start)
+
+
+def quarter_window(year, quarter):
+    """(label, start, end) of a calendar quarter, e.g. quarter_window(2025, 1) -> ('2025-Q1', 2025-01-01, 2025-03-31)."""
+    if quarter not in (1, 2, 3, 4):
+        raise ValueError("quarter must be 1-4")
+    return period_window('quarter', date(year, 3 * quarter - 2, 1))
+
+
+def parse_period(label, fiscal_year_start=FISCAL_YEAR_START_MONTH):
+    """
+    (label, start, end) for a period label such as '2025-Q1', '2025-03', '2025',
+    'FY2025', 'FY2025-Q3' or 'FY2025-M09'.
+    """
+    text = label.strip().upper()
+    try:
+        if text.startswith('FY'):
+            fiscal_year, _, rest = text[2:].partition('-')
+            window = fiscal_year_window(int(fiscal_year), fiscal_year_start)
+            if not rest:
+                return window
+            if rest.startswith('Q'):
+                granularity, wanted = 'fiscal_quarter', f"FY{int(fiscal_year):04d}-Q{int(rest[1:])}"
+            else:
+                granularity, wanted = 'fiscal_month', f"FY{int(fiscal_year):04d}-M{int(rest.lstrip('M')):02d}"
+            return period_calendar(granularity, window[1], window[2], fiscal_year_start).window(wanted)
+        year, _, rest = text.partition('-')
+        if not rest:
+            return period_window('year', date(int(year), 1, 1))
+        if rest.startswith('Q'):
+            return quarter_window(int(year), int(rest[1:]))
+        return period_window('month', date(int(year), int(rest), 1))
+    except (ValueError, IndexError):
+        raise ValueError(f"Unrecognized period '{label}'") from None
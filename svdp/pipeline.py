@@ -0,0 +1,210 @@
+"""
+Runs many reports in one process, reading each export once.
+
+Reports are declared, not called: each ``Report`` names its source file, the
+export type and columns it needs (see svdp.schema), an optional normalize
+step, an aggregate function and an optional render function. ``build_plan``
+turns a list of reports into a DAG of load -> normalize -> aggregate -> render
+stages in which reports sharing a file share its load stage (with the union of
+their columns) and reports sharing a normalize step share that too.
+``run_plan`` executes the DAG in a thread pool, starting every stage as soon as
+its inputs are ready, so independent branches run concurrently.
+"""
+
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from svdp import cache, instrument
+from svdp.schema import load_export
+
+Report = namedtuple('Report', ['name', 'source', 'export_type', 'columns', 'aggregate',
+                               'normalize', 'render', 'params'],
+                    defaults=(None, None, {}))
+Report.__doc__ = """
+A report declaration.
+
+    name         Unique report name; results are keyed by it.
+    source       Path of the export the report reads.
+    export_type  Schema name in svdp.schema.SCHEMAS.
+    columns      Canonical columns the report needs.
+    aggregate    aggregate(frame, **params) -> result. Must not modify frame.
+    normalize    Optional normalize(frame) -> frame, shared by reports naming
+                 the same function for the same source. Must not modify its input.
+    render       Optional render(name, result), e.g. printing to the console.
+    params       Keyword arguments for aggregate.
+"""
+
+# deps feed their results to func; after only orders the stage behind others.
+Stage = namedtuple('Stage', ['key', 'func', 'deps', 'after'], defaults=((),))
+
+
+def report_key(report):
+    """
+    The svdp.cache key of a report's result: its aggregate, normalize step,
+    params and columns, the source file's contents and the code computing it.
+    Raises OSError if the source file is missing.
+    """
+    aggregate = report.aggregate
+    normalize = report.normalize
+    params = {'export_type': report.export_type, 'columns': sorted(report.columns),
+              'normalize': getattr(normalize, '__qualname__', None), 'params': sorted(report.params.items())}
+    return cache.make_key(f"{aggregate.__module__}.{aggregate.__qualname__}", params, [report.source],
+                          cache.code_version(aggregate, normalize, load_export))
+
+
+def build_plan(reports, result_cache=None):
+    """
+    Builds the stage DAG for a list of reports.
+
+    With a svdp.cache.ResultCache, reports whose result is cached get an
+    aggregate stage that just returns it (their file is not loaded unless
+    another report needs it), and fresh results are stored.
+
+    Returns:
+        dict: Stage key -> Stage. Keys are tuples starting with the stage kind
+              ('load', 'normalize', 'aggregate' or 'render').
+    """
+    names = [report.name for report in reports]
+    if len(set(names)) != len(names):
+        raise ValueError("Report names must be unique")
+
+    keys = {}
+    cached = {}
+    if result_cache is not None:
+        for report in reports:
+            try:
+                keys[report.name] = report_key(report)
+            except OSError:
+                continue  # the load stage will report the missing file
+            value = result_cache.get(keys[report.name])
+            if value is not None:
+                cached[report.name] = value
+
+    # One load per (file, export type), reading every column any report needs.
+    load_columns = {}
+    for report in reports:
+        if report.name in cached:
+            continue
+        key = ('load', report.source, report.export_type)
+        load_columns.setdefault(key, set()).update(report.columns)
+
+    stages = {}
+    for key, columns in load_columns.items():
+        _, source, export_type = key
+        columns = sorted(columns)
+        stages[key] = Stage(key, lambda source=source, export_type=export_type, columns=columns:
+                            load_export(source, export_type, columns=columns), ())
+
+    def compute(frame, report):
+        result = report.aggregate(frame, **report.params)
+        if report.name in keys and result is not None:
+            result_cache.put(keys[report.name], result)
+        return result
+
+    previous_render = None
+    for report in reports:
+        aggregate_key = ('aggregate', report.name)
+        if report.name in cached:
+            stages[aggregate_key] = Stage(aggregate_key, lambda value=cached[report.name]: value, ())
+        else:
+            upstream = ('load', report.source, report.export_type)
+            if report.normalize is not None:
+                key = ('normalize', report.source, report.export_type, report.normalize)
+                if key not in stages:
+                    stages[key] = Stage(key, report.normalize, (upstream,))
+                upstream = key
+            stages[aggregate_key] = Stage(aggregate_key, lambda frame, report=report: compute(frame, report),
+                                          (upstream,))
+
+        if report.render is not None:
+            # Renders are chained so console output comes out in declaration order.
+            render_key = ('render', report.name)
+            stages[render_key] = Stage(
+                render_key,
+                lambda result, report=report: report.render(report.name, result),
+                (aggregate_key,),
+                (previous_render,) if previous_render else ())
+            previous_render = render_key
+    return stages
+
+
+def _run_stage(stage, args):
+    """Calls a stage inside an instrumentation span named after its kind ('load', 'aggregate', ...)."""
+    kind = stage.key[0]
+    label = stage.key[1] if kind in ('load', 'normalize') else stage.key[-1]
+    with instrument.span(kind, label) as s:
+        result = stage.func(*args)
+        frame = result if hasattr(result, 'shape') else (args[0] if args else None)
+        if hasattr(frame, 'shape'):
+            s.rows = frame.shape[0]
+        return result
+
+
+def run_plan(stages, max_workers=4):
+    """
+    Executes a stage DAG, running independent stages concurrently.
+
+    A stage is called with the results of its ``deps``, in order, once those
+    and its ``after`` stages have finished. When a stage fails its error is
+    printed and everything that needs its result is skipped; the rest of the
+    DAG still runs.
+
+    Returns:
+        tuple: (results, errors), dicts keyed by stage key.
+    """
+    dependents = {key: [] for key in stages}
+    waiting = {}
+    for key, stage in stages.items():
+        waiting[key] = len(stage.deps) + len(stage.after)
+        for dep in stage.deps + stage.after:
+            dependents[dep].append(key)
+
+    results = {}
+    errors = {}
+    running = {}
+
+    def skip(key):
+        for child in dependents[key]:
+            if key not in stages[child].deps:
+                waiting[child] -= 1  # only ordered behind the failed stage
+            elif child not in errors:
+                errors[child] = RuntimeError(f"skipped: {key} failed")
+                skip(child)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        def submit_ready():
+            for key, count in list(waiting.items()):
+                if count == 0 and key not in errors:
+                    del waiting[key]
+                    stage = stages[key]
+                    args = [results[dep] for dep in stage.deps]
+                    running[pool.submit(_run_stage, stage, args)] = key
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    print(f"Error in stage {key}: {e}")
+                    errors[key] = e
+                    skip(key)
+                    continue
+                for child in dependents[key]:
+                    waiting[child] -= 1
+            submit_ready()
+    return results, errors
+
+
+def run_reports(reports, max_workers=4, result_cache=None):
+    """
+    Runs a list of reports, loading each source file once. Pass a
+    svdp.cache.ResultCache to reuse results computed from identical exports.
+
+    Returns:
+        dict: Report name -> aggregate result (reports that failed are left out).
+    """
+    results, _ = run_plan(build_plan(reports, result_cache), max_workers)
+    return {key[1]: value for key, value in results.items() if key[0] == 'aggregate'}
@@ -0,0 +1,197 @@
+"""
+Per-client active-day intervals for distinct-client counts over any window.
+
+"People served" counts ask which distinct clients stayed at least one day in
+a window, often for many windows (each month, quarter and fiscal year) and
+per house and age group. Rebuilding sets of names from the stays for every
+question rescans the stays each time.
+
+``ActiveDays`` indexes each client's active days once, run-length encoded:
+for every segment (e.g. house x age group) the client's stays are merged
+into runs of consecutive days, kept as (client, first day, last day) arrays
+sorted by first day. The distinct clients of a window are the clients of the
+runs that overlap it, marked in a packed bitset (one bit per client), and
+the count is the popcount of the OR over the segments asked for:
+
+    active = ActiveDays.from_stays(client_ids().encode(df['full_name']), df['entry_date'], df['exit_date'],
+                                   house=houses, age_group=np.where(is_adult, 'adult', 'child'))
+    active.count('2025-01-01', '2025-03-31', house='RH', age_group='adult')
+    active.count_by_period(period_calendar('month', first, last), house='BH')
+
+Memory grows with the number of runs, not with days x clients, so a stay
+with a mistyped entry date decades back costs one run like any other.
+
+A stay is active from its entry day through its exit day, inclusive; stays
+with no exit stay active through ``last_day``.
+"""
+
+import numpy as np
+import pandas as pd
+
+from svdp import dates
+
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.int64)
+
+
+def _ordinals(values):
+    values = pd.Series(values) if not isinstance(values, (pd.Series, np.ndarray)) else values
+    if pd.api.types.is_integer_dtype(getattr(values, 'dtype', None)):
+        return np.asarray(values, dtype=np.int64)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return dates.datetimes_to_ordinals(values).astype(np.int64)
+    return dates.to_ordinals(values).astype(np.int64)
+
+
+def _day(value):
+    return int(value) if isinstance(value, (int, np.integer)) else pd.Timestamp(value).toordinal()
+
+
+class ActiveDays:
+    """
+    Run-length encoded active days per client and segment. Build with from_stays().
+
+        clients    the distinct client keys; client i is bit i of every bitset.
+                   None stands for the stays without a key, counted as one client
+        first_day  ordinal of the first covered day
+        days       number of covered days
+        dims       names of the segment dimensions, e.g. ('house', 'age_group')
+        runs       segment key tuple -> (client, first, last) int arrays of the
+                   merged runs (day ordinals, inclusive), sorted by first day
+    """
+
+    def __init__(self, clients, first_day, days, dims, runs):
+        self.clients = clients
+        self.first_day = first_day
+        self.days = days
+        self.dims = dims
+        self.runs = runs
+
+    @classmethod
+    def from_stays(cls, clients, entry_dates, exit_dates, first_day=None, last_day=None, **segments):
+        """
+        Indexes every client's active days.
+
+        Args:
+            clients (array-like): Client key of each stay (e.g. full_name, or
+                svdp.clientids IDs). Stays without one (a missing name, or a
+                negative ID such as MISSING_ID) all count as one client, as
+                they did when people served were sets of names.
+            entry_dates, exit_dates (array-like): datetime64 values, date strings
+                or day ordinals. Missing exits run through ``last_day``.
+            first_day, last_day (date or ordinal, optional): Days covered.
+                Default to the earliest entry and the latest exit.
+            **segments: Equal-length label arrays to split the runs by, e.g.
+                house=..., age_group=...
+
+        Returns:
+            ActiveDays
+        """
+        clients = pd.Series(clients)
+        if pd.api.types.is_integer_dtype(clients.dtype):
+            keys = clients.to_numpy()
+            missing = keys < 0
+        else:
+            keys = clients.to_numpy(dtype=object)
+            missing = clients.isna().to_numpy()
+        codes = np.empty(len(keys), dtype=np.int64)
+        codes[~missing], uniques = pd.factorize(keys[~missing])
+        uniques = np.asarray(uniques, dtype=object)
+        if missing.any():
+            codes[missing] = len(uniques)
+            uniques = np.append(uniques, None)
+        entry = _ordinals(entry_dates)
+        exit_ = _ordinals(exit_dates)
+        known = entry != dates.MISSING_ORDINAL
+        closed = exit_ != dates.MISSING_ORDINAL
+        if first_day is None:
+            first_day = int(entry[known].min()) if known.any() else 0
+        if last_day is None:
+            candidates = np.concatenate([entry[known], exit_[known & closed]])
+            last_day = int(candidates.max()) if len(candidates) else first_day
+        first_day, last_day = _day(first_day), _day(last_day)
+        exit_ = np.where(closed, exit_, last_day)
+
+        # Clip the stays to the covered days.
+        start = np.maximum(entry, first_day)
+        stop = np.minimum(exit_, last_day)
+        keep = known & (stop >= start)
+        start, stop, client = start[keep], stop[keep], codes[keep].astype(np.int64)
+
+        dims = tuple(segments)
+        labels = [pd.Series(values).astype(object).to_numpy()[keep] for values in segments.values()]
+        keys = list(zip(*labels)) if dims else [()] * int(keep.sum())
+        segment_codes, segment_keys = pd.factorize(pd.Series(keys, dtype=object)) if len(keys) else (
+            np.array([], dtype=np.int64), [])
+
+        runs = {}
+        for index, key in enumerate(segment_keys):
+            mine = segment_codes == index
+            runs[tuple(key)] = _merge_runs(client[mine], start[mine], stop[mine])
+        return cls(uniques, first_day, last_day - first_day + 1, dims, runs)
+
+    def _segments(self, filters):
+        unknown = set(filters) - set(self.dims)
+        if unknown:
+            raise KeyError(f"Unknown segment dimensions {sorted(unknown)}; this index has {list(self.dims)}")
+        wanted = []
+        for key, runs in self.runs.items():
+            labels = dict(zip(self.dims, key))
+            if all(labels[name] in (value if isinstance(value, (list, tuple, set)) else (value,))
+                   for name, value in filters.items()):
+                wanted.append(runs)
+        return wanted
+
+    def active(self, first_day, last_day, **filters):
+        """
+        Packed bitset (uint8, one bit per client) of the clients active on any
+        day from first_day to last_day inclusive in the segments matching
+        ``filters`` (e.g. house='RH', or age_group=('adult', 'child')).
+        """
+        first, last = _day(first_day), _day(last_day)
+        hit = np.zeros(len(self.clients), dtype=bool)
+        if last >= first:
+            for client, starts, stops in self._segments(filters):
+                begun = np.searchsorted(starts, last, side='right')  # runs starting by the last day
+                overlapping = stops[:begun] >= first
+                hit[client[:begun][overlapping]] = True
+        return np.packbits(hit)
+
+    def count(self, first_day, last_day, **filters):
+        """Distinct clients active in the window (and segments): OR, then popcount."""
+        return int(_POPCOUNT[self.active(first_day, last_day, **filters)].sum())
+
+    def clients_in(self, first_day, last_day, **filters):
+        """The keys of the clients count() counts."""
+        bits = np.unpackbits(self.active(first_day, last_day, **filters))[:len(self.clients)]
+        return self.clients[bits.astype(bool)]
+
+    def count_by_period(self, calendar, **filters):
+        """{period label: distinct clients} for every period of a svdp.periods calendar."""
+        return {label: self.count(int(start), int(end), **filters)
+                for label, start, end in zip(calendar.labels, calendar.starts, calendar.ends)}
+
+
+def _merge_runs(client, start, stop):
+    """
+    Merges each client's overlapping or adjacent stays into runs.
+
+    Returns:
+        tuple: (client, first, last) int arrays, sorted by first day.
+    """
+    if len(client) == 0:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, empty
+    order = np.lexsort((start, client))
+    client, start, stop = client[order], start[order], stop[order]
+    # Shift each client's days past the previous client's, so one running max
+    # of the last days works across all clients at once.
+    span = int(stop.max() - start.min()) + 2
+    shift = client * span - int(start.min())
+    reach = np.maximum.accumulate(stop + shift)
+    new_run = np.r_[True, (start + shift)[1:] > reach[:-1] + 1]
+    firsts = np.flatnonzero(new_run)
+    run_client = client[firsts]
+    run_start = start[firsts]
+    run_stop = np.maximum.reduceat(stop, firsts)
+    by_start = np.argsort(run_start, kind='stable')
+    return run_client[by_start], run_start[by_start], run_stop[by_start]
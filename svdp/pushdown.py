@@ -0,0 +1,137 @@
+"""
+Date-window predicates pushed down into the CSV readers.
+
+Most reports read a multi-year export and then keep one window of it. A
+DateWindow names the window and the date columns it is judged on; the readers
+evaluate it on each chunk's raw date strings (each distinct string parsed
+once, svdp.dates) before anything else in the chunk is typed or copied:
+
+    window = DateWindow('2025-01-01', '2025-03-31', ('entry_date', 'exit_date'), 'overlap')
+    stays = load_export("RileyEverything.csv", 'riley_everything', columns=[...], where=window)
+    frame, rows_read = read_window("RH2025.csv", DateWindow('2024-01-01', '2024-12-31',
+                                                            ('Entry Date', 'Exit Date')))
+
+Matching modes:
+
+    any      some date column falls in the window (990, Mary Kay: entry or exit in the period)
+    overlap  (entry, exit) stays that overlap the window: entry <= end and
+             exit >= start, a missing exit counting as still open (and an
+             exit before the entry left for the report to judge)
+
+Windows only ever drop rows no report would count. A non-empty date that does
+not parse with the window's formats is kept, so the report's own parsing
+(pandas inference, warnings) still decides about it; so is a stay without an
+exit. Rows without an entry date fail 'overlap'.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from svdp import compression, dates
+
+MATCH_MODES = ('any', 'overlap')
+DEFAULT_CHUNKSIZE = 100000
+
+DateWindow = namedtuple('DateWindow', ['start', 'end', 'columns', 'match', 'formats'],
+                        defaults=('any', dates.DATE_FORMATS))
+DateWindow.__doc__ = """
+A date window to filter rows by while reading.
+
+    start, end  first and last day kept (inclusive); dates or date strings
+    columns     date column names: any number for 'any', (entry, exit) for 'overlap'
+    match       'any' or 'overlap'
+    formats     svdp.dates format hints for the raw strings
+"""
+
+WindowRead = namedtuple('WindowRead', ['frame', 'rows_read'])
+
+
+def _parsed(values, formats):
+    """(ordinals, empty, unparsed) for a column of raw date strings."""
+    values = np.asarray(values, dtype=object)
+    ordinals = dates.to_ordinals(values, formats)
+    empty = pd.isna(values)
+    return ordinals, empty, ~empty & (ordinals == dates.MISSING_ORDINAL)
+
+
+def window_mask(window, columns, formats=None):
+    """
+    Rows of a chunk kept by ``window``.
+
+    Args:
+        window (DateWindow)
+        columns (list): The raw date strings of each of window.columns, in order.
+        formats (list, optional): Format hints per column. Defaults to window.formats for all.
+
+    Returns:
+        numpy.ndarray: bool per row.
+    """
+    if window.match not in MATCH_MODES:
+        raise ValueError(f"Unknown match mode '{window.match}'. Use one of: {', '.join(MATCH_MODES)}")
+    start = pd.Timestamp(window.start).toordinal()
+    end = pd.Timestamp(window.end).toordinal()
+    formats = formats or [window.formats] * len(columns)
+    parsed = [_parsed(values, hints) for values, hints in zip(columns, formats)]
+
+    if window.match == 'overlap':
+        (entry, entry_empty, entry_unparsed), (exit_, exit_empty, exit_unparsed) = parsed
+        entry_ok = ((~entry_empty & ~entry_unparsed) & (entry <= end)) | entry_unparsed
+        exit_ok = (exit_ >= start) | (exit_ < entry) | exit_empty | exit_unparsed
+        return entry_ok & exit_ok
+
+    keep = np.zeros(len(columns[0]) if columns else 0, dtype=bool)
+    for ordinals, empty, unparsed in parsed:
+        keep |= ((ordinals >= start) & (ordinals <= end)) | unparsed
+    return keep
+
+
+def read_window(csv_file, window, chunksize=DEFAULT_CHUNKSIZE, **read_csv_kwargs):
+    """
+    pandas.read_csv for the rows of a window only.
+
+    The window's date columns are read first, a chunk at a time; the full read
+    then skips every other row, so the rest of the columns are converted (with
+    pandas' usual type inference) only for the rows kept.
+
+    Args:
+        csv_file (str): Path to the CSV file (compressed files work; svdp.compression).
+        window (DateWindow): Columns are header names as written in the file.
+        chunksize (int, optional): Rows per chunk of the date pass.
+        **read_csv_kwargs: Passed to pandas.read_csv (not usecols or skiprows).
+
+    Returns:
+        WindowRead: (frame, rows_read), rows_read being every row below the
+        header, kept or not, as pandas.read_csv counts them (blank lines not).
+    """
+    keep, undated = [], []
+    lines = 0
+    # Blank lines stay in as empty rows so positions match the line numbers skiprows sees.
+    with compression.read_csv(csv_file, usecols=list(window.columns), dtype=str, chunksize=chunksize,
+                              skip_blank_lines=False, **read_csv_kwargs) as reader:
+        for chunk in reader:
+            mask = window_mask(window, [chunk[column].to_numpy() for column in window.columns])
+            keep.append(np.flatnonzero(mask) + lines)
+            undated.append(np.flatnonzero(chunk.isna().all(axis=1).to_numpy()) + lines)
+            lines += len(chunk)
+
+    # Line 0 is the header; row i is line i + 1 (a quoted newline does not start a line).
+    wanted = np.zeros(lines + 1, dtype=bool)
+    wanted[0] = True
+    wanted[np.concatenate(keep) + 1 if keep else []] = True
+    frame = compression.read_csv(csv_file, skiprows=lambda line: line > lines or not wanted[line],
+                                 **read_csv_kwargs)
+
+    # A blank line and a row without dates look alike above, and no window keeps either. pandas
+    # drops blank lines when it reads those rows again, which leaves the ones that are rows.
+    rows_read = lines
+    undated = np.concatenate(undated) if undated else []
+    if len(undated):
+        is_undated = np.zeros(lines + 1, dtype=bool)
+        is_undated[0] = True
+        is_undated[undated + 1] = True
+        rows = compression.read_csv(csv_file, usecols=[window.columns[0]], dtype=str, nrows=len(undated),
+                                    skiprows=lambda line: line > lines or not is_undated[line], **read_csv_kwargs)
+        rows_read -= len(undated) - len(rows)
+    return WindowRead(frame, rows_read)
@@ -0,0 +1,173 @@
+"""
+Entry-or-exit-in-window counts for the 990 report, for any number of houses
+and reporting windows at once.
+
+A person is counted for a window when their Entry Date or Exit Date falls
+inside it, once per "Full Name". House files are read in a thread pool, every
+window is checked in one vectorized pass per house, and the per-house,
+per-window exports are written in parallel.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from svdp import compression, dates, instrument, periods, pushdown
+from svdp.buckets import FISCAL_YEAR_START_MONTH
+from svdp.clientids import client_ids
+
+
+def fiscal_year_window(fiscal_year, start_month=FISCAL_YEAR_START_MONTH):
+    """
+    Returns the (label, start, end) window of a fiscal year.
+
+    Fiscal years are named for the calendar year they end in, so FY2025 is
+    07/01/2024 - 06/30/2025. See svdp.periods for quarters and months.
+    """
+    return periods.fiscal_year_window(fiscal_year, start_month)
+
+
+def fiscal_year_windows(fiscal_years, start_month=FISCAL_YEAR_START_MONTH):
+    """Returns the windows for a list of fiscal years."""
+    return [fiscal_year_window(year, start_month) for year in fiscal_years]
+
+
+def load_house(csv_file, window=None):
+    """
+    Reads one house export and parses its Entry/Exit dates (unparseable dates
+    become NaT).
+
+    Args:
+        csv_file (str): Path to the house export.
+        window (svdp.pushdown.DateWindow, optional): Read only the rows whose
+            Entry or Exit Date is in this window; the rows in the whole file
+            are kept in ``df.attrs['rows_read']``.
+
+    Returns:
+        pandas.DataFrame, or None if the file could not be read.
+    """
+    try:
+        with instrument.span('load', csv_file) as s:
+            if window is None:
+                df = compression.read_csv(csv_file)
+                df.attrs['rows_read'] = len(df)
+            else:
+                df, rows_read = pushdown.read_window(csv_file, window)
+                df.attrs['rows_read'] = rows_read
+            s.rows = len(df)
+        with instrument.span('parse', csv_file, rows=len(df)):
+            df['Entry Date'] = dates.to_datetime(df['Entry Date'], infer=True)
+            df['Exit Date'] = dates.to_datetime(df['Exit Date'], infer=True)
+        return df
+    except FileNotFoundError:
+        print(f"Error: File not found at path: {csv_file}")
+    except Exception as e:
+        print(f"An error occurred reading {csv_file}: {e}")
+    return None
+
+
+def load_houses(house_files, max_workers=None, window=None):
+    """
+    Reads several house exports concurrently.
+
+    Args:
+        house_files (dict): House name -> path of its CSV export.
+        max_workers (int, optional): Thread pool size. Defaults to one per file.
+        window (svdp.pushdown.DateWindow, optional): Passed to load_house.
+
+    Returns:
+        dict: House name -> DataFrame, for the files that could be read.
+    """
+    names = list(house_files)
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(names), 1)) as pool:
+        frames = pool.map(lambda path: load_house(path, window), [house_files[name] for name in names])
+    return {name: df for name, df in zip(names, frames) if df is not None}
+
+
+def window_matches(df, windows):
+    """
+    Finds, for every window, the rows counted in it.
+
+    Args:
+        df (pandas.DataFrame): House data with parsed 'Entry Date'/'Exit Date'.
+        windows (list): (label, start, end) tuples; start and end are inclusive.
+
+    Returns:
+        dict: Window label -> positional row indices of the first record of each
+              distinct 'Full Name' whose entry or exit falls in the window.
+    """
+    # Dates as day numbers; NaT becomes a value no window contains.
+    entry = df['Entry Date'].to_numpy(dtype='datetime64[D]')
+    exit_ = df['Exit Date'].to_numpy(dtype='datetime64[D]')
+    starts = np.array([np.datetime64(start, 'D') for _, start, _ in windows])
+    ends = np.array([np.datetime64(end, 'D') for _, _, end in windows])
+
+    # rows x windows
+    in_window = (((entry[:, None] >= starts) & (entry[:, None] <= ends)) |
+                 ((exit_[:, None] >= starts) & (exit_[:, None] <= ends)))
+
+    # drop_duplicates(subset=['Full Name'], keep='first') for every window at once:
+    # the first matching row of each (name, window) pair, found via np.unique.
+    names = client_ids().encode(df['Full Name'])  # missing names share MISSING_ID, as one name
+    rows, cols = np.nonzero(in_window)  # row-major, so rows ascend within a window
+    pair = names[rows].astype(np.int64) * len(windows) + cols
+    _, first = np.unique(pair, return_index=True)
+    rows, cols = rows[first], cols[first]
+
+    matches = {}
+    for index, (label, _, _) in enumerate(windows):
+        matches[label] = np.sort(rows[cols == index])
+    return matches
+
+
+def _output_path(output_dir, house_name, label):
+    slug = lambda text: "".join(c if c.isalnum() else "_" for c in text).strip("_").lower()
+    return os.path.join(output_dir, f"{slug(house_name)}_{slug(label)}_filtered_data.csv")
+
+
+def analyze_990(house_files, windows, output_dir=".", max_workers=None, export=True, output_names=None):
+    """
+    Computes the 990 counts for several houses and windows.
+
+    Args:
+        house_files (dict): House name -> path of its CSV export.
+        windows (list): (label, start, end) tuples, e.g. from fiscal_year_windows().
+        output_dir (str, optional): Where the filtered exports go. Defaults to ".".
+        max_workers (int, optional): Thread pool size for reading and writing.
+        export (bool, optional): Write one filtered CSV per house and window. Defaults to True.
+        output_names (dict, optional): (house name, window label) -> file name in
+            output_dir. Other exports are named <house>_<window>_filtered_data.csv.
+
+    Returns:
+        dict: House name -> {'total': rows in the file, <window label>: distinct
+              people counted in that window, ...}.
+    """
+    # Rows outside every window are never counted; skip them while reading.
+    span = None
+    if windows:
+        span = pushdown.DateWindow(min(start for _, start, _ in windows), max(end for _, _, end in windows),
+                                   ('Entry Date', 'Exit Date'))
+    frames = load_houses(house_files, max_workers, span)
+
+    results = {}
+    exports = []
+    for house_name, df in frames.items():
+        with instrument.span('filter', house_name, rows=len(df)):
+            matches = window_matches(df, windows)
+        counts = {'total': df.attrs['rows_read']}
+        for label, rows in matches.items():
+            counts[label] = len(rows)
+            if export:
+                name = (output_names or {}).get((house_name, label))
+                path = os.path.join(output_dir, name) if name else _output_path(output_dir, house_name, label)
+                exports.append((df.iloc[rows], path))
+        results[house_name] = counts
+
+    def write(job):
+        with instrument.span('write', job[1], rows=len(job[0])):
+            job[0].to_csv(job[1], index=False)
+
+    if exports:
+        with ThreadPoolExecutor(max_workers=max_workers or len(exports)) as pool:
+            list(pool.map(write, exports))
+    return results
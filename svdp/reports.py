@@ -0,0 +1,264 @@
+"""
+Frame-based versions of the RileyFunctions reports, and the monthly batch
+that runs them through svdp.pipeline.
+
+Each aggregate takes the DataFrame produced by svdp.schema.load_export
+(canonical column names) and returns a dict or a svdp.results namedtuple, so
+one loaded export can feed several reports. The numbers match the standalone scripts.
+"""
+
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from svdp.capacity import default_capacity
+from svdp.clientids import client_ids
+from svdp.conflicts import bed_conflict_summary
+from svdp.pipeline import Report
+from svdp.results import BedNights, BedOccupancy, as_dict
+from svdp.violence import analyze_violence
+
+AGE_GROUPS = (("0-12", 0, 12), ("13-17", 13, 17), ("18-24", 18, 24), ("25-59", 25, 59))
+
+
+def normalize_stays(df):
+    """Adds the is_adult flag the stay reports use (missing ages count as children)."""
+    df = df.copy()
+    df['is_adult'] = (df['age'] >= 18).fillna(False).astype(bool)
+    return df
+
+
+def quarterly_bed_nights(df, start_date, end_date, house, unique_served=False, kind='physical_beds', capacity=None):
+    """
+    Bed nights for a quarterly report (BHQuarterlyReportBedNights,
+    BrennenRoomPercent, RHQuarterlyReportBedNights).
+
+    Missing exit dates count as the end of the period, stays are clipped to the
+    period and nights are exit - entry. Records with negative nights are skipped.
+
+    Args:
+        df (pandas.DataFrame): Stays with entry_date, exit_date, is_adult (and
+            full_name when unique_served is True).
+        start_date (str): First day of the period (YYYY-MM-DD).
+        end_date (str): Last day of the period (YYYY-MM-DD).
+        house (str): 'RH' or 'BH', for the possible bed nights.
+        unique_served (bool, optional): Count distinct Full Names served instead
+            of records. Defaults to False.
+        kind (str, optional): svdp.capacity kind counted as possible bed nights.
+            Defaults to "physical_beds" (the quarterly reports' 35 RH / 32 BH).
+        capacity (svdp.capacity.Capacity, optional): Defaults to default_capacity().
+
+    Returns:
+        svdp.results.BedNights
+    """
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date)
+    capacity = capacity or default_capacity()
+
+    stays = df[df['entry_date'] <= end]
+    arrival = stays['entry_date'].clip(lower=start)
+    departure = stays['exit_date'].fillna(end).clip(upper=end)
+    nights = (departure - arrival).dt.days.to_numpy()
+    is_adult = stays['is_adult'].to_numpy()
+    counted = nights >= 0
+
+    if unique_served:
+        clients = client_ids().encode(stays['full_name'])  # missing names count as one, as before
+        adults_served = np.unique(clients[counted & is_adult]).size
+        children_served = np.unique(clients[counted & ~is_adult]).size
+    else:
+        adults_served = int(is_adult.sum())
+        children_served = int((~is_adult).sum())
+
+    adult_nights = int(nights[counted & is_adult].sum())
+    child_nights = int(nights[counted & ~is_adult].sum())
+    return BedNights(
+        total_possible_bed_nights=capacity.available_nights(house, kind, start, end),
+        total_adult_nights=adult_nights,
+        total_child_nights=child_nights,
+        total_individual_nights=adult_nights + child_nights,
+        total_adults_served=adults_served,
+        total_children_served=children_served,
+        total_records=len(stays),
+        skipped_records=int((~counted).sum()),
+    )
+
+
+def bed_occupancy(df, start_date, end_date, house, kind='beds', capacity=None):
+    """
+    Bed occupancy for a period (BrennenBedPercent): stays clipped to the period,
+    counted inclusively, over the house's beds on each day (svdp.capacity).
+
+    Returns:
+        svdp.results.BedOccupancy
+    """
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date)
+    total_bed_nights = (capacity or default_capacity()).available_nights(house, kind, start, end)
+
+    stays = df.dropna(subset=['entry_date', 'exit_date'])
+    duration = (stays['exit_date'].clip(upper=end) - stays['entry_date'].clip(lower=start)).dt.days + 1
+    duration = duration.clip(lower=0).to_numpy()
+    is_adult = stays['is_adult'].to_numpy()
+
+    occupied = int(duration.sum())
+    return BedOccupancy(
+        occupancy_percentage=(occupied / total_bed_nights) * 100 if total_bed_nights > 0 else 0.0,
+        total_bed_nights=total_bed_nights,
+        adult_bed_nights=int(duration[is_adult].sum()),
+        child_bed_nights=int(duration[~is_adult].sum()),
+    )
+
+
+def _house_masks(df):
+    beds = df['bed_assignment_name'].astype(str).str.upper()
+    return {"Brennen House": beds.str.contains("BH").to_numpy(),
+            "Riley House": beds.str.contains("RH").to_numpy()}
+
+
+def _value_counts(values):
+    # A categorical column counts every category, including ones absent from this subset.
+    counts = values.value_counts()
+    return counts[counts > 0].to_dict()
+
+
+def gender_by_house(df):
+    """Gender counts overall and per house (PmtNewGender)."""
+    df = df.dropna(how='all')
+    result = {"All Data": _value_counts(df['gender'])}
+    for house, mask in _house_masks(df).items():
+        result[house] = _value_counts(df.loc[mask, 'gender'])
+    return result
+
+
+def _age_groups(ages):
+    ages = pd.to_numeric(ages, errors='coerce').to_numpy(dtype=float)
+    groups = {}
+    assigned = np.zeros(len(ages), dtype=bool)
+    for label, low, high in AGE_GROUPS:
+        in_group = (ages >= low) & (ages <= high)
+        groups[label] = int(in_group.sum())
+        assigned |= in_group
+    groups["60+"] = int((~assigned).sum())  # includes missing ages, as the script did
+    return groups
+
+
+def enrollment_by_house(df):
+    """Totals, ethnicity and age groups overall and per house (PmtNewEnrollment)."""
+    df = df.dropna(how='all')
+    result = {"All Data": {'total': len(df),
+                           'ethnicity': _value_counts(df['ethnicity']),
+                           'ages': _age_groups(df['age'])}}
+    for house, mask in _house_masks(df).items():
+        subset = df[mask]
+        result[house] = {'total': len(subset),
+                         'ethnicity': _value_counts(subset['ethnicity']),
+                         'ages': _age_groups(subset['age'])}
+    return result
+
+
+def violence_counts(df):
+    """Violence type counts and co-occurrence (OVTPMTabuse, RHHistoryofViolence)."""
+    counts, total, cooccurrence = analyze_violence(df['history_of_violence'])
+    return {'counts': dict(counts), 'total': total, 'cooccurrence': cooccurrence}
+
+
+def print_result(name, result):
+    """Default console rendering: one line per value, nested dicts indented."""
+    print(f"\n--- {name} ---")
+
+    def show(value, indent):
+        for key, item in value.items():
+            if isinstance(item, dict):
+                print(f"{indent}{key}:")
+                show(item, indent + "  ")
+            elif isinstance(item, pd.DataFrame):
+                print(f"{indent}{key}:\n{item.to_string()}")
+            else:
+                print(f"{indent}{key}: {item:.2f}" if isinstance(item, float) else f"{indent}{key}: {item}")
+
+    show(as_dict(result) if hasattr(result, '_asdict') else result, "")
+
+
+def monthly_batch(data_dir=".", quarter_start="2025-01-01", quarter_end="2025-03-31", render=print_result):
+    """
+    The monthly reporting batch as report declarations, reading the standard
+    export file names from ``data_dir``. Pass the list to svdp.pipeline.run_reports.
+    """
+    datetime.strptime(quarter_start, '%Y-%m-%d')  # fail early on a bad date
+    datetime.strptime(quarter_end, '%Y-%m-%d')
+    path = lambda name: os.path.join(data_dir, name)
+    stay_columns = ['entry_date', 'exit_date', 'age']
+    quarter = {'start_date': quarter_start, 'end_date': quarter_end}
+    capacity = default_capacity()  # a param, so cached results follow capacity changes
+    conflict_columns = ['bed_name', 'full_name', 'entry_date', 'exit_date']
+
+    return [
+        Report("Brennen House bed conflicts", path("BHQuarterly.csv"), 'riley_everything',
+               conflict_columns, bed_conflict_summary, None, render, quarter),
+        Report("Rosalie House bed conflicts", path("RHQuarterly.csv"), 'riley_everything',
+               conflict_columns, bed_conflict_summary, None, render, quarter),
+        Report("Brennen House quarterly bed nights", path("BHQuarterly.csv"), 'riley_everything',
+               stay_columns, quarterly_bed_nights, normalize_stays, render,
+               dict(quarter, house='BH', capacity=capacity)),
+        Report("Rosalie House quarterly bed nights", path("RHQuarterly.csv"), 'riley_everything',
+               stay_columns + ['full_name'], quarterly_bed_nights, normalize_stays, render,
+               dict(quarter, house='RH', unique_served=True, capacity=capacity)),
+        Report("Brennen House bed occupancy", path("BHQuarterly.csv"), 'riley_everything',
+               stay_columns, bed_occupancy, normalize_stays, render,
+               dict(quarter, house='BH', capacity=capacity)),
+        Report("PMT gender by house", path("PmtNewGender.csv"), 'pmt',
+               ['gender', 'bed_assignment_name'], gender_by_house, None, render),
+        Report("PMT new enrollment", path("PmtNewEnrollment.csv"), 'pmt',
+               ['ethnicity', 'age', 'bed_assignment_name'], enrollment_by_house, None, render),
+        Report("OVTPMT history of violence", path("OVTPMTabuse.csv"), 'pmt',
+               ['history_of_violence'], violence_counts, None, render),
+        Report("Rosalie House history of violence", path("RHHistoryOfViolence.csv"), 'pmt',
+               ['history_of_violence'], violence_counts, None, render),
+        Report("Brennen House history of violence", path("BHHistoryOfViolence.csv"), 'pmt',
+               ['history_of_violence'], violence_counts, None, render),
+    ]
+
+
+def main():
+    """Runs the monthly batch: python -m svdp.reports [data_dir] --start YYYY-MM-DD --end YYYY-MM-DD"""
+    import argparse
+
+    from svdp import instrument
+    from svdp.cache import ResultCache, default_cache
+    from svdp.pipeline import run_reports
+
+    parser = argparse.ArgumentParser(description="Run the monthly report batch, reading each export once.")
+    parser.add_argument("data_dir", nargs="?", default=".", help="Folder with the exports")
+    parser.add_argument("--start", default="2025-01-01", help="Quarter start (YYYY-MM-DD)")
+    parser.add_argument("--end", default="2025-03-31", help="Quarter end (YYYY-MM-DD)")
+    parser.add_argument("--period", help="Reporting period instead of --start/--end, e.g. 2025-Q1 or FY2025-Q3")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent stages")
+    parser.add_argument("--trace", metavar="JSONL", nargs="?", const="",
+                        help="Time every stage; print a summary and append spans to JSONL if given")
+    parser.add_argument("--cache-dir", help="Result cache folder (default $SVDP_CACHE_DIR or ~/.cache/svdp)")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every report")
+    args = parser.parse_args()
+    if args.period:
+        from svdp.periods import parse_period
+
+        _, start, end = parse_period(args.period)
+        args.start, args.end = start.isoformat(), end.isoformat()
+
+    result_cache = None
+    if not args.no_cache:
+        result_cache = ResultCache(args.cache_dir) if args.cache_dir else default_cache()
+
+    if args.trace is not None:
+        instrument.enable(args.trace or None)
+    run_reports(monthly_batch(args.data_dir, args.start, args.end), max_workers=args.workers,
+                result_cache=result_cache)
+    if args.trace is not None:
+        instrument.disable()
+        print("\n" + instrument.summary_table(by_label=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Typed, immutable report results and bulk writers for them.
+
+Reports return namedtuples (nested namedtuples and tuples of (key, value)
+pairs for breakdowns) instead of printing, so the numbers can be reused,
+cached and written out without re-running the computation. Printing is a
+separate, optional step: each script keeps a print function for its usual
+console layout, and ``render_text`` shows any result generically.
+
+``write_json`` and ``write_table`` write many results in one go: JSON keeps
+the nesting, the table flattens each result into one row with dotted column
+names ("rosalie.bed_occupancy_percentage") and writes CSV, or Parquet when
+the path ends in .parquet (pandas needs pyarrow or fastparquet for that).
+
+This module does not import NumPy or pandas, so the csv-module reports
+(Crisisline) can return results without loading them.
+"""
+
+import json
+import sys
+from collections import namedtuple
+
+HouseOccupancy = namedtuple('HouseOccupancy', [
+    'house', 'bed_occupancy_percentage', 'total_bed_nights', 'occupied_bed_nights',
+    'adult_bed_nights', 'child_bed_nights', 'room_occupancy_percentage', 'total_room_nights',
+    'occupied_room_nights', 'unique_adults', 'unique_children', 'bed_conflicts', 'peak_bed_concurrency'],
+    defaults=(0, 0))
+
+OccupancyReport = namedtuple('OccupancyReport', [
+    'source', 'start_date', 'end_date', 'total_days', 'rosalie', 'brennen'])
+
+BedNights = namedtuple('BedNights', [
+    'total_possible_bed_nights', 'total_adult_nights', 'total_child_nights', 'total_individual_nights',
+    'total_adults_served', 'total_children_served', 'total_records', 'skipped_records'])
+
+BedNights.__doc__ = """
+Bed nights of a quarterly report. The served counts are None when the report
+does not count people served (BHQuarterlyReportBedNights).
+"""
+
+BedOccupancy = namedtuple('BedOccupancy', [
+    'occupancy_percentage', 'total_bed_nights', 'adult_bed_nights', 'child_bed_nights'])
+
+RoomOccupancy = namedtuple('RoomOccupancy', [
+    'total_room_nights', 'occupied_room_nights', 'room_occupancy_percentage'])
+
+CallCount = namedtuple('CallCount', ['source', 'start_date', 'end_date', 'calls'])
+
+HouseGender = namedtuple('HouseGender', ['house', 'total', 'gender'])
+
+GenderReport = namedtuple('GenderReport', ['source', 'all_data', 'brennen', 'riley'])
+GenderReport.__doc__ = """
+PMT gender counts overall and per house. Each part is a HouseGender whose
+gender is a tuple of (gender, count) pairs, most common first.
+"""
+
+HouseEnrollment = namedtuple('HouseEnrollment', ['house', 'total', 'ethnicity', 'ages', 'programs'])
+
+EnrollmentReport = namedtuple('EnrollmentReport', ['source', 'all_data', 'riley', 'brennen'])
+EnrollmentReport.__doc__ = """
+PMT new enrollments overall and per house. ethnicity, ages and programs of
+each HouseEnrollment are tuples of (label, count) pairs.
+"""
+
+ViolenceCounts = namedtuple('ViolenceCounts', ['source', 'counts', 'total', 'cooccurrence'])
+ViolenceCounts.__doc__ = """
+History of violence counts of one file (svdp.violence). counts is a tuple of
+(type, occurrences) pairs; cooccurrence holds (type, ((type, records), ...))
+rows of the co-occurrence matrix.
+"""
+
+BedConflictSummary = namedtuple('BedConflictSummary', [
+    'beds_checked', 'stays_checked', 'conflicting_pairs', 'beds_with_conflicts', 'max_concurrency',
+    'worst_beds'])
+BedConflictSummary.__doc__ = """
+Double-booking check of a stay export (svdp.conflicts). worst_beds is a tuple
+of (bed, conflicting pairs), most conflicts first.
+"""
+
+MaryKayReport = namedtuple('MaryKayReport', [
+    'source', 'year', 'total_records', 'male_records', 'female_records', 'adult_records', 'child_records',
+    'average_adult_stay', 'age_0_18', 'age_19_50', 'age_50_plus', 'age_0_18_percent', 'age_19_50_percent',
+    'age_50_plus_percent', 'ethnicity_percentages'])
+MaryKayReport.__doc__ = """
+Mary Kay grant figures for one year. average_adult_stay is None without
+adults; ethnicity_percentages is a tuple of (category, percent) pairs,
+largest first.
+"""
+
+
+def pairs(mapping):
+    """A dict or Series as a tuple of (key, value) pairs, for immutable breakdowns."""
+    return tuple((key, _plain(value)) for key, value in mapping.items())
+
+
+def _plain(value):
+    """NumPy scalars as Python numbers, so results compare, hash and serialize cleanly."""
+    np = sys.modules.get('numpy')  # a NumPy scalar means NumPy is already loaded
+    return value.item() if np is not None and isinstance(value, np.generic) else value
+
+
+def _is_pairs(value):
+    return (isinstance(value, tuple) and not hasattr(value, '_fields') and
+            all(isinstance(item, tuple) and len(item) == 2 for item in value))
+
+
+def as_dict(result):
+    """Converts a result to plain dicts and lists, recursively."""
+    if hasattr(result, '_asdict'):
+        return {key: as_dict(value) for key, value in result._asdict().items()}
+    if isinstance(result, dict):
+        return {key: as_dict(value) for key, value in result.items()}
+    if _is_pairs(result) and result:
+        return {str(key): as_dict(value) for key, value in result}
+    if isinstance(result, (list, tuple)):
+        return [as_dict(value) for value in result]
+    return _plain(result)
+
+
+def flatten(result, prefix=""):
+    """One result as a flat {dotted.column: value} dict."""
+    row = {}
+    for key, value in as_dict(result).items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            row.update(flatten(value, name + "."))
+        else:
+            row[name] = value
+    return row
+
+
+def write_json(results, path):
+    """Writes a list of results (or a dict of name -> result) to one JSON file."""
+    if isinstance(results, dict):
+        data = {str(name): as_dict(result) for name, result in results.items()}
+    else:
+        data = [as_dict(result) for result in results]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, default=str)
+
+
+def write_table(results, path):
+    """
+    Writes a list of results as one table, a row per result: CSV, or Parquet
+    when ``path`` ends in .parquet.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame([flatten(result) for result in results])
+    if str(path).lower().endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return df
+
+
+def render_text(result, title=None):
+    """A generic, indented text rendering of any result."""
+    lines = [f"--- {title} ---"] if title else []
+
+    def show(value, indent):
+        for key, item in value.items():
+            if isinstance(item, dict):
+                lines.append(f"{indent}{key}:")
+                show(item, indent + "  ")
+            elif isinstance(item, float):
+                lines.append(f"{indent}{key}: {item:.2f}")
+            else:
+                lines.append(f"{indent}{key}: {item}")
+
+    show(as_dict(result), "")
+    return "\n".join(lines)
@@ -0,0 +1,280 @@
+"""
+Registry of the export layouts the reports read, and a loader that uses it.
+
+Each export type lists its columns once: the canonical (snake_case) name the
+reports use, the header text in the export, any other spellings the header has
+shown up with (e.g. 'Unique\\nIdentifier' in DCPR), and a compact dtype.
+``load_export`` reads only the columns a report asks for, matches headers
+loosely (case, line breaks and non-breaking spaces do not matter) and applies
+the dtypes, so every report gets the same names and types without its own
+rename map.
+"""
+
+import csv
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from svdp import compression, dates, pushdown
+
+# dtype is one of: 'string', 'category', 'int8' (small non-negative numbers such
+# as ages; falls back to float32 if a value does not fit), 'datetime' (parsed
+# with ``date_format`` when given, else svdp.dates.DATE_FORMATS with pandas
+# inference as the fallback; unparseable values become NaT), or None to
+# leave the column as pandas reads it.
+Column = namedtuple('Column', ['name', 'source', 'dtype', 'aliases', 'date_format'],
+                    defaults=((), None))
+
+ExportSchema = namedtuple('ExportSchema', ['name', 'description', 'columns', 'header_marker'],
+                          defaults=(None,))
+
+
+def _stays(name, description, extra=()):
+    """HMIS stay exports (RileyEverything, quarterly, 990 house files) share one layout."""
+    return ExportSchema(name, description, (
+        Column('bed_name', 'Bed: Bed Number', 'category'),
+        Column('full_name', 'Full Name', 'string'),
+        Column('program_name', 'Program Enrollment Name', 'category'),
+        Column('bed_assignment_name', 'Bed Assignment Name', 'category'),
+        Column('age', 'Age', 'int8'),
+        Column('sexual_orientation', 'Sexual Orientation', 'category'),
+        Column('other_exit_reason', 'Other Exit Reason', 'string'),
+        Column('ethnicity', 'Nationality/Race/Ethnicity', 'category'),
+        Column('gender', 'Gender', 'category'),
+        Column('entry_date', 'Entry Date', 'datetime'),
+        Column('exit_date', 'Exit Date', 'datetime'),
+        Column('exit_reason', 'Exit Reason', 'category'),
+        Column('race', 'Race', 'category'),
+        Column('start_time', 'Start Date/Time', 'datetime', date_format='%m/%d/%Y, %I:%M %p'),
+        Column('bed_transfer', 'Bed Transfer', 'category'),
+        Column('program', 'Program', 'category'),
+    ) + tuple(extra))
+
+
+SCHEMAS = {schema.name: schema for schema in (
+    _stays('riley_everything', "HMIS bed stays for both houses (RileyEverything.csv, BHoccupancy.csv, "
+                               "quarterly and 990 house exports)"),
+    ExportSchema('pmt', "PMT enrollment, gender and history-of-violence exports", (
+        Column('bed_assignment_name', 'Bed Assignment Name', 'category'),
+        Column('ethnicity', 'Ethnicity', 'category'),
+        Column('age', 'Age', 'int8'),
+        Column('gender', 'Gender', 'category'),
+        Column('history_of_violence', 'History of Violence', 'string'),
+    )),
+    ExportSchema('maryk', "Mary Kay grant exports (MaryKBren.csv, MaryKRosalie.csv)", (
+        Column('bed_name', 'Bed: Bed Number', 'category'),
+        Column('full_name', 'Full Name', 'string'),
+        Column('age', 'Age', 'int8'),
+        Column('gender', 'Gender', 'category'),
+        Column('race', 'Race', 'category'),
+        Column('ethnicity', 'Nationality/Race/Ethnicity', 'category'),
+        Column('entry_date', 'Entry Date', 'datetime'),
+        Column('exit_date', 'Exit Date', 'datetime'),
+    )),
+    ExportSchema('envoy', "Envoy visitor sign-in log", (
+        Column('name', 'name', 'string'),
+        Column('sign_in_time', 'sign_in_time', 'string'),  # several formats; see EnvoyDuplicates.py
+        Column('dv_survivor', 'Are you a Domestic Violence survivor?', 'category'),
+    )),
+    ExportSchema('ce', "Coordinated Entry export (report title rows above the header)", (
+        Column('unique_identifier', 'Unique Identifier', 'string', ('Unique\nIdentifier',)),
+    ), header_marker='Unique Identifier'),
+    ExportSchema('dcpr', "DCPR client list", (
+        Column('unique_identifier', 'Unique Identifier', 'string', ('Unique\nIdentifier',)),
+    )),
+    ExportSchema('uav', "UAV log", (
+        Column('full_name', 'Full Name', 'string'),
+        Column('start_time', 'Start Date/Time', 'datetime', date_format='%m/%d/%Y, %I:%M %p'),
+        Column('exit_reason', 'Exit Reason', 'category'),
+    )),
+    ExportSchema('crisis_line', "Crisis line call report", (
+        Column('assessment_date', 'Assessment Date', 'datetime', date_format='%m/%d/%Y'),
+    )),
+)}
+
+
+def normalize_header(name):
+    """Folds a header name for matching: case, line breaks, NBSPs and runs of spaces are ignored."""
+    return re.sub(r'\s+', ' ', str(name).replace('\xa0', ' ')).strip().casefold()
+
+
+def get_schema(export_type):
+    """Returns the ExportSchema for an export type, raising KeyError with the known types."""
+    try:
+        return SCHEMAS[export_type]
+    except KeyError:
+        raise KeyError(f"Unknown export type '{export_type}'. Known types: {', '.join(SCHEMAS)}") from None
+
+
+def header_lookup(schema):
+    """normalized header text -> Column, covering sources and aliases."""
+    lookup = {}
+    for column in schema.columns:
+        for text in (column.source,) + tuple(column.aliases):
+            lookup[normalize_header(text)] = column
+    return lookup
+
+
+def find_header_row(csv_file, marker):
+    """
+    Returns the number of rows above the header row, i.e. the first row that
+    contains ``marker``. Used for exports with title rows above the header.
+    """
+    with compression.open_text(csv_file, newline='') as f:
+        for index, row in enumerate(csv.reader(f)):
+            if marker in ','.join(row):
+                return index
+    return 0
+
+
+def _to_small_int(series):
+    """Ages and similar counts as nullable int8, or float32 if any value does not fit."""
+    numeric = pd.to_numeric(series, errors='coerce')
+    values = numeric.dropna()
+    if ((values % 1) == 0).all() and values.between(np.iinfo(np.int8).min, np.iinfo(np.int8).max).all():
+        return numeric.astype('Int8')
+    return numeric.astype('float32')
+
+
+def _prepare_read(csv_file, export_type, columns, optional_columns, read_csv_kwargs, where=None):
+    """The schema, header lookup, required names and usecols callable for one export read."""
+    schema = get_schema(export_type)
+    lookup = header_lookup(schema)
+    wanted = None
+    required = set()
+    by_name = {column.name: column for column in schema.columns}
+    if columns is not None:
+        unknown = [name for name in list(columns) + list(optional_columns) if name not in by_name]
+        if unknown:
+            raise KeyError(f"Columns {unknown} are not part of the '{export_type}' schema")
+        required = set(columns)
+        wanted = required | set(optional_columns)
+    if where is not None:
+        unknown = [name for name in where.columns if name not in by_name]
+        if unknown:
+            raise KeyError(f"Window columns {unknown} are not part of the '{export_type}' schema")
+        if wanted is not None:
+            wanted = wanted | set(where.columns)  # read for the predicate, dropped after it if not asked for
+
+    if schema.header_marker and 'skiprows' not in read_csv_kwargs:
+        read_csv_kwargs['skiprows'] = find_header_row(csv_file, schema.header_marker)
+
+    def use_column(header_name):
+        column = lookup.get(normalize_header(header_name))
+        return column is not None and (wanted is None or column.name in wanted)
+
+    return schema, lookup, required, use_column
+
+
+def _filter_window(df, csv_file, schema, lookup, where, keep_columns):
+    """
+    The rows of a chunk (still raw strings) inside ``where``, without the
+    predicate's own columns unless they were asked for (``keep_columns``, None for all).
+    """
+    headers = {}
+    for header_name in df.columns:
+        headers.setdefault(lookup[normalize_header(header_name)].name, header_name)
+    missing = [name for name in where.columns if name not in headers]
+    if missing:
+        raise KeyError(f"Columns {sorted(missing)} not found in {csv_file}")
+    by_name = {column.name: column for column in schema.columns}
+    formats = [(by_name[name].date_format,) if by_name[name].date_format else where.formats for name in where.columns]
+    mask = pushdown.window_mask(where, [df[headers[name]].to_numpy() for name in where.columns], formats)
+    df = df[mask]
+    if keep_columns is not None:
+        df = df[[header for name, header in headers.items() if name in keep_columns or name not in where.columns]]
+    return df
+
+
+def _apply_schema(df, csv_file, schema, lookup, required, rename):
+    """Picks, checks, types and renames the columns of a frame read as strings."""
+    found = {}
+    for header_name in df.columns:
+        column = lookup[normalize_header(header_name)]
+        if column.name not in found.values():
+            found[header_name] = column.name
+    df = df[list(found)]  # a column listed twice under two spellings keeps the first
+
+    if required:
+        missing = required - set(found.values())
+        if missing:
+            raise KeyError(f"Columns {sorted(missing)} not found in {csv_file}")
+
+    columns_by_name = {column.name: column for column in schema.columns}
+    for header_name, name in found.items():
+        column = columns_by_name[name]
+        if column.dtype == 'category':
+            df[header_name] = df[header_name].astype('category')
+        elif column.dtype == 'int8':
+            df[header_name] = _to_small_int(df[header_name])
+        elif column.dtype == 'datetime':
+            formats = (column.date_format,) if column.date_format else dates.DATE_FORMATS
+            df[header_name] = dates.to_datetime(df[header_name], formats, infer=column.date_format is None)
+
+    if rename:
+        df = df.rename(columns=found)
+    else:
+        df = df.rename(columns={header_name: columns_by_name[name].source for header_name, name in found.items()})
+    return df
+
+
+def load_export(csv_file, export_type, columns=None, optional_columns=(), rename=True, where=None, **read_csv_kwargs):
+    """
+    Reads an export, keeping only the columns a report needs, with compact dtypes.
+
+    Args:
+        csv_file (str): Path to the CSV file, plain or compressed (gzip, bz2,
+            xz or zstd; see svdp.compression).
+        export_type (str): Key in SCHEMAS, e.g. "riley_everything".
+        columns (list, optional): Canonical names of the columns to read.
+            Defaults to every schema column present in the file.
+        optional_columns (list, optional): Canonical names read if the file
+            has them (e.g. columns only copied into an output file).
+        rename (bool, optional): Use canonical names (True) or the export's own
+            header text (False). Defaults to True.
+        where (svdp.pushdown.DateWindow, optional): Keep only the rows in this
+            date window (canonical column names). It is checked on each chunk's
+            raw dates before the other columns are typed.
+        **read_csv_kwargs: Passed to pandas.read_csv.
+
+    Returns:
+        pandas.DataFrame
+
+    Raises:
+        KeyError: If a requested column is not in the file.
+    """
+    schema, lookup, required, use_column = _prepare_read(csv_file, export_type, columns, optional_columns,
+                                                         read_csv_kwargs, where)
+    if where is None:
+        df = compression.read_csv(csv_file, usecols=use_column, dtype=str, **read_csv_kwargs)
+    else:
+        # Filter the raw chunks, then type the survivors once (categories stay consistent).
+        keep_columns = None if columns is None else set(columns) | set(optional_columns)
+        with compression.read_csv(csv_file, usecols=use_column, dtype=str, chunksize=pushdown.DEFAULT_CHUNKSIZE,
+                                  **read_csv_kwargs) as reader:
+            df = pd.concat([_filter_window(chunk, csv_file, schema, lookup, where, keep_columns)
+                            for chunk in reader])
+    return _apply_schema(df, csv_file, schema, lookup, required, rename)
+
+
+def iter_export(csv_file, export_type, columns=None, optional_columns=(), rename=True, chunksize=100000,
+                where=None, **read_csv_kwargs):
+    """
+    Reads an export in chunks of ``chunksize`` rows, each typed like load_export,
+    so a report can stream a file of any size. With ``where`` each chunk holds
+    only the rows in the window, typed after the window check.
+
+    Yields:
+        pandas.DataFrame
+    """
+    schema, lookup, required, use_column = _prepare_read(csv_file, export_type, columns, optional_columns,
+                                                         read_csv_kwargs, where)
+    keep_columns = None if columns is None else set(columns) | set(optional_columns)
+    with compression.read_csv(csv_file, usecols=use_column, dtype=str, chunksize=chunksize,
+                              **read_csv_kwargs) as reader:
+        for chunk in reader:
+            if where is not None:
+                chunk = _filter_window(chunk, csv_file, schema, lookup, where, keep_columns)
+            yield _apply_schema(chunk, csv_file, schema, lookup, required, rename)
@@ -0,0 +1,147 @@
+"""
+Counts of "History of Violence" types, shared by the OVTPMT and house
+history-of-violence reports.
+
+The column holds several types per record separated by ';'. The column is
+exploded once, each type is mapped to a bit, and every record becomes one
+integer mask. Occurrence counts come from a bincount over the exploded codes
+and the type x type co-occurrence matrix from a single matrix product.
+"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from svdp import compression
+from svdp.results import ViolenceCounts, pairs
+
+VIOLENCE_COLUMN = 'History of Violence'
+
+# All possible violence types, in report order
+VIOLENCE_TYPES = (
+    "Physical Violence", "Physical Abuse", "Emotional Abuse", "Other/Unknown", "Sexual Assault",
+    "Neglect", "Witnessed Violence", "Elder Abuse", "Trafficked",
+)
+
+
+def encode_violence(histories, violence_types=VIOLENCE_TYPES):
+    """
+    Encodes each record's violence types as a bitmask.
+
+    Args:
+        histories (iterable): "History of Violence" cells, e.g. a DataFrame column.
+        violence_types (sequence, optional): Types to look for; bit i is
+            violence_types[i]. Unknown types are ignored. Defaults to VIOLENCE_TYPES.
+
+    Returns:
+        tuple: (masks, occurrences)
+            - masks (numpy.ndarray): One unsigned integer per record.
+            - occurrences (numpy.ndarray): How many times each type was listed,
+              counting repeats within a record like the original reports did.
+    """
+    if len(violence_types) > 64:
+        raise ValueError("At most 64 violence types can be encoded")
+    mask_dtype = np.uint16 if len(violence_types) <= 16 else np.uint64
+    bit_of = {name: bit for bit, name in enumerate(violence_types)}
+
+    cells = pd.Series(histories, dtype=object).reset_index(drop=True)
+    exploded = cells.fillna('').astype(str).str.split(';').explode().str.strip()
+    codes = exploded.map(bit_of)
+    known = codes.notna().to_numpy()
+    records = exploded.index.to_numpy()[known]
+    codes = codes.to_numpy()[known].astype(np.int64)
+
+    occurrences = np.bincount(codes, minlength=len(violence_types))
+    masks = np.zeros(len(cells), dtype=mask_dtype)
+    np.bitwise_or.at(masks, records, (np.ones_like(codes, dtype=mask_dtype) << codes.astype(mask_dtype)))
+    return masks, occurrences
+
+
+def cooccurrence_matrix(masks, violence_types=VIOLENCE_TYPES):
+    """
+    Builds the type x type co-occurrence matrix from record bitmasks.
+
+    Cell (a, b) is the number of records listing both a and b; the diagonal is
+    the number of records listing each type at least once.
+
+    Returns:
+        pandas.DataFrame: Indexed and labelled by violence type.
+    """
+    bits = np.arange(len(violence_types), dtype=masks.dtype)
+    indicator = ((masks[:, None] >> bits) & 1).astype(np.int64)
+    matrix = indicator.T @ indicator
+    return pd.DataFrame(matrix, index=list(violence_types), columns=list(violence_types))
+
+
+def analyze_violence(histories, violence_types=VIOLENCE_TYPES):
+    """
+    Counts violence types in a "History of Violence" column.
+
+    Returns:
+        tuple: (violence_counts, total_violence_count, cooccurrence)
+            - violence_counts (Counter): Occurrences of each type that was listed.
+            - total_violence_count (int): Sum of all occurrences.
+            - cooccurrence (pandas.DataFrame): See cooccurrence_matrix().
+    """
+    masks, occurrences = encode_violence(histories, violence_types)
+    violence_counts = Counter({name: int(count) for name, count in zip(violence_types, occurrences) if count})
+    return violence_counts, int(occurrences.sum()), cooccurrence_matrix(masks, violence_types)
+
+
+def analyze_violence_file(csv_filename, violence_types=VIOLENCE_TYPES):
+    """
+    Reads only the "History of Violence" column of a CSV file and counts it.
+
+    Returns:
+        tuple: Same as analyze_violence(). Empty results if the file cannot be read.
+    """
+    try:
+        df = compression.read_csv(csv_filename, usecols=[VIOLENCE_COLUMN], dtype=str, keep_default_na=False)
+        histories = df[VIOLENCE_COLUMN]
+    except FileNotFoundError:
+        print(f"Error: File '{csv_filename}' not found.")
+        histories = []
+    except Exception as e:
+        print(f"Error reading CSV file {csv_filename}: {e}")
+        histories = []
+    return analyze_violence(histories, violence_types)
+
+
+def analyze_violence_files(csv_filenames, violence_types=VIOLENCE_TYPES, max_workers=None):
+    """
+    Counts violence types for several house files in a worker pool.
+
+    Returns:
+        dict: File name -> analyze_violence() tuple, in the order given.
+    """
+    csv_filenames = list(csv_filenames)
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(csv_filenames), 1)) as pool:
+        results = pool.map(lambda name: analyze_violence_file(name, violence_types), csv_filenames)
+    return dict(zip(csv_filenames, results))
+
+
+def violence_result(source, analysis):
+    """
+    An analyze_violence() tuple as an immutable result.
+
+    Returns:
+        svdp.results.ViolenceCounts
+    """
+    violence_counts, total_violence_count, cooccurrence = analysis
+    rows = tuple((name, pairs(row)) for name, row in cooccurrence.iterrows())
+    return ViolenceCounts(source, pairs(violence_counts), total_violence_count, rows)
+
+
+def print_violence(result):
+    """Prints a ViolenceCounts in the history-of-violence reports' console layout."""
+    print(f"\nAnalysis Results for {result.source}:")
+    for violence_type, count in result.counts:
+        print(f"{violence_type}: {count}")
+
+    print(f"Total Violence Count for {result.source}: {result.total}")
+    print("\nRecords listing both types:")
+    cooccurrence = pd.DataFrame([dict(row) for _, row in result.cooccurrence],
+                                index=[name for name, _ in result.cooccurrence])
+    print(cooccurrence.to_string())
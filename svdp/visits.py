@@ -0,0 +1,322 @@
+"""
+Envoy visitor frequency and return intervals.
+
+For staffing: how often visitors come back, how long they stay away between
+visits and when in the week the front desk is busiest. Visits are counted as
+EnvoyDuplicates counts them, once per visitor per day: the first sign-in of
+the day (in file order) is the visit and later ones that day are duplicates.
+Visitors are svdp.clientids IDs, so names are not kept.
+
+``VisitSketch`` streams the sign-in log. It keeps each visit as one int64
+(visitor, day) key in sorted runs, so memory grows with the deduplicated
+visits (8 bytes each) and not with the sign-ins or the span of days covered,
+and the chunks can come in any order (Envoy exports are often newest first;
+only which sign-in of a day sets the hour profile follows the order the chunks
+come in):
+
+    sketch = VisitSketch()
+    for chunk in iter_export("V-2023-2025.csv", 'envoy', ['name', 'sign_in_time'], chunksize=100_000):
+        sketch.add(client_ids().encode(chunk['name']), dates.to_datetime(chunk['sign_in_time'], dates.ENVOY_FORMATS))
+    stats = sketch.stats(top=10)
+
+Each chunk's new keys become a run; runs of similar size are merged, so there
+are only a few and checking a chunk against them is a binary search per run.
+The statistics merge the runs: sorted keys are ordered by (visitor, day), so
+each visitor's visits are consecutive and sorted, and the return gaps are the
+day differences between neighbours of the same visitor. Gaps and visit counts
+go into exact integer histograms (as in svdp.los), from which the means,
+percentiles and bins come.
+
+Usage:
+    python -m svdp.visits V-Mar18-Apr23.csv [more logs ...] [--start 2025-03-18] [--end 2025-04-23] [--top 10]
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from svdp import dates
+from svdp.los import bin_labels, percentile
+
+DEFAULT_PERCENTILES = (25, 50, 75, 90)
+# Bin edges: return gaps in days (1, 2-6, 7-13, ...) and visits per visitor (1, 2-4, ...).
+GAP_BINS = (1, 2, 7, 14, 30, 90, 365)
+VISIT_BINS = (1, 2, 5, 10, 25, 50)
+MAX_GAP_DAYS = 3660  # longer gaps are kept in the last day (their exact total is kept)
+WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+_DAY_BITS = 22  # day ordinals stay below 2 ** 22 (year 11000)
+
+Distribution = namedtuple('Distribution', ['count', 'mean', 'median', 'percentiles', 'histogram'])
+Distribution.__doc__ = """
+An integer distribution: how many values, their mean and median, and tuples
+of (percentile, value) and (bin label, count) pairs.
+"""
+
+TopVisitor = namedtuple('TopVisitor', ['client_id', 'visits', 'first_visit', 'last_visit', 'mean_gap_days'])
+
+VisitStats = namedtuple('VisitStats', [
+    'visits', 'visitors', 'first_day', 'last_day', 'visits_per_visitor', 'return_gaps', 'top_visitors',
+    'weekday_profile', 'hour_profile', 'weekday_hour_profile'])
+VisitStats.__doc__ = """
+Visit frequency of a sign-in log.
+
+    visits, visitors       deduplicated visits and distinct visitors
+    first_day, last_day    datetime.date of the first and last visit (None without visits)
+    visits_per_visitor     Distribution of visits per visitor
+    return_gaps            Distribution of days between a visitor's consecutive visits
+    top_visitors           tuple of TopVisitor, most visits first
+    weekday_profile        (weekday, visits) pairs, Mon-Sun
+    hour_profile           (hour, visits) pairs, 0-23, by the sign-in's wall-clock hour
+    weekday_hour_profile   (weekday, 24 visit counts) pairs
+"""
+
+
+def _distribution(histogram, total, bins, percentiles):
+    """Distribution of the integer values histogram counts (histogram[v] = values equal to v)."""
+    count = int(histogram.sum())
+    if count == 0:
+        return Distribution(0, None, None, (), ())
+    cumulative = np.cumsum(histogram)
+    padded = np.zeros(max(len(histogram), bins[-1] + 1), dtype=np.int64)
+    padded[:len(histogram)] = histogram
+    binned = np.add.reduceat(padded, np.asarray(bins))
+    return Distribution(
+        count=count,
+        mean=float(total / count),
+        median=percentile(cumulative, count, 50),
+        percentiles=tuple((p, percentile(cumulative, count, p)) for p in percentiles),
+        histogram=tuple(zip(bin_labels(bins), binned.tolist())),
+    )
+
+
+class VisitSketch:
+    """
+    Deduplicated visits as sorted runs of (visitor, day) keys, plus the
+    weekday x hour load of those visits.
+
+    Args:
+        max_gap_days (int, optional): Gap days tracked individually. Defaults to MAX_GAP_DAYS.
+    """
+
+    def __init__(self, max_gap_days=MAX_GAP_DAYS):
+        self.max_gap_days = max_gap_days
+        self.client_ids = np.zeros(0, dtype=np.int64)  # visitor row -> client ID
+        self._rows = {}                               # client ID -> visitor row
+        self._runs = []                               # sorted (row << _DAY_BITS | day) keys, largest first
+        self.load = np.zeros((7, 24), dtype=np.int64)
+        self.visits = 0
+
+    def _rows_for(self, client_ids):
+        unique, inverse = np.unique(client_ids, return_inverse=True)
+        rows = np.empty(len(unique), dtype=np.int64)
+        for index, client_id in enumerate(unique.tolist()):
+            row = self._rows.get(client_id)
+            if row is None:
+                row = self._rows[client_id] = len(self._rows)
+            rows[index] = row
+        if len(self._rows) > len(self.client_ids):
+            self.client_ids = np.array(list(self._rows), dtype=np.int64)
+        return rows[inverse]
+
+    def _seen(self, keys):
+        """Which of the sorted, unique ``keys`` a run already holds."""
+        seen = np.zeros(len(keys), dtype=bool)
+        for run in self._runs:
+            at = np.minimum(np.searchsorted(run, keys), len(run) - 1)
+            seen |= run[at] == keys
+        return seen
+
+    def _push(self, keys):
+        """Adds a run of new sorted keys, merging runs no more than twice its size."""
+        self._runs.append(keys)
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            top = self._runs.pop()
+            self._runs[-1] = np.sort(np.concatenate((self._runs[-1], top)), kind='mergesort')
+
+    def _keys(self):
+        """Every visit key, sorted."""
+        while len(self._runs) > 1:
+            top = self._runs.pop()
+            self._runs[-1] = np.sort(np.concatenate((self._runs[-1], top)), kind='mergesort')
+        return self._runs[0] if self._runs else np.zeros(0, dtype=np.int64)
+
+    def add(self, client_ids, sign_in_times):
+        """
+        Adds a chunk of sign-ins. Returns self.
+
+        Args:
+            client_ids (array-like): svdp.clientids ID of each sign-in; negative IDs are skipped.
+            sign_in_times (array-like): datetime64 sign-in times; NaT is skipped.
+        """
+        client_ids = np.asarray(client_ids, dtype=np.int64)
+        times = np.asarray(sign_in_times, dtype='datetime64[ns]')
+        keep = (client_ids >= 0) & ~np.isnat(times)
+        if not keep.any():
+            return self
+        client_ids, times = client_ids[keep], times[keep]
+        days = dates.datetimes_to_ordinals(times).astype(np.int64)
+        rows = self._rows_for(client_ids)
+
+        # The first sign-in of each (visitor, day) in this chunk, in chunk order...
+        keys, first = np.unique((rows << _DAY_BITS) | days, return_index=True)
+        # ...that no earlier chunk already counted.
+        new = ~self._seen(keys)
+        keys, days, times = keys[new], days[first[new]], times[first[new]]
+        if len(keys):
+            self._push(keys)
+
+        weekday = (days - 1) % 7  # ordinal 1 is a Monday
+        hour = (times - times.astype('datetime64[D]')).astype('timedelta64[h]').astype(np.int64)
+        self.load += np.bincount(weekday * 24 + hour, minlength=7 * 24).reshape(7, 24)
+        self.visits += len(keys)
+        return self
+
+    def _per_visitor(self):
+        """(visits, first day, last day, gap total) per visitor row, and the gap histogram."""
+        height = len(self._rows)
+        first = np.full(height, dates.MISSING_ORDINAL, dtype=np.int64)
+        last = np.full(height, dates.MISSING_ORDINAL, dtype=np.int64)
+        keys = self._keys()
+        row, day = keys >> _DAY_BITS, keys & ((1 << _DAY_BITS) - 1)  # ordered by (visitor, day)
+        visits = np.bincount(row, minlength=height)
+        opens = np.r_[True, row[1:] != row[:-1]] if len(row) else np.zeros(0, dtype=bool)
+        closes = np.r_[row[1:] != row[:-1], True] if len(row) else np.zeros(0, dtype=bool)
+        first[row[opens]] = day[opens]
+        last[row[closes]] = day[closes]
+        gaps = np.diff(day)[~opens[1:]]
+        gap_totals = np.bincount(row[1:][~opens[1:]], weights=gaps, minlength=height).astype(np.int64)
+        gap_histogram = np.bincount(np.minimum(gaps, self.max_gap_days), minlength=self.max_gap_days + 1)
+        return visits, first, last, gap_totals, gap_histogram
+
+    def per_visitor(self):
+        """
+        One row per visitor: client_id, visits, first_visit, last_visit (datetime64)
+        and mean_gap_days (NaN with a single visit).
+        """
+        visits, first, last, gap_totals, _ = self._per_visitor()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_gap = np.where(visits > 1, gap_totals / np.maximum(visits - 1, 1), np.nan)
+        return pd.DataFrame({
+            'client_id': self.client_ids[:len(visits)],
+            'visits': visits,
+            'first_visit': dates.ordinals_to_datetimes(first),
+            'last_visit': dates.ordinals_to_datetimes(last),
+            'mean_gap_days': mean_gap,
+        })
+
+    def stats(self, top=10, percentiles=DEFAULT_PERCENTILES, gap_bins=GAP_BINS, visit_bins=VISIT_BINS):
+        """
+        Frequency, return-gap and load statistics of the visits added so far.
+
+        Args:
+            top (int, optional): Frequent visitors listed. Defaults to 10.
+            percentiles (tuple, optional): Percentiles of both distributions.
+
+        Returns:
+            VisitStats
+        """
+        visits, first, last, gap_totals, gap_histogram = self._per_visitor()
+        seen = visits > 0
+        visit_histogram = np.bincount(visits[seen], minlength=visit_bins[-1] + 1)
+        gap_total = int(gap_totals.sum())
+
+        # Most visits first; ties go to the most recent, then to the lower ID.
+        order = np.lexsort((self.client_ids[:len(visits)], -last, -visits))[:min(top, int(seen.sum()))]
+        top_visitors = tuple(TopVisitor(
+            client_id=int(self.client_ids[row]),
+            visits=int(visits[row]),
+            first_visit=pd.Timestamp.fromordinal(int(first[row])).date(),
+            last_visit=pd.Timestamp.fromordinal(int(last[row])).date(),
+            mean_gap_days=float(gap_totals[row] / (visits[row] - 1)) if visits[row] > 1 else None,
+        ) for row in order)
+
+        return VisitStats(
+            visits=self.visits,
+            visitors=int(seen.sum()),
+            first_day=pd.Timestamp.fromordinal(int(first[seen].min())).date() if seen.any() else None,
+            last_day=pd.Timestamp.fromordinal(int(last[seen].max())).date() if seen.any() else None,
+            visits_per_visitor=_distribution(visit_histogram, int(visits.sum()), visit_bins, percentiles),
+            return_gaps=_distribution(gap_histogram, gap_total, gap_bins, percentiles),
+            top_visitors=top_visitors,
+            weekday_profile=tuple(zip(WEEKDAYS, self.load.sum(axis=1).tolist())),
+            hour_profile=tuple(enumerate(self.load.sum(axis=0).tolist())),
+            weekday_hour_profile=tuple((day, tuple(row)) for day, row in zip(WEEKDAYS, self.load.tolist())),
+        )
+
+
+def visit_stats(client_ids, sign_in_times, top=10, **options):
+    """VisitStats of one batch of sign-ins (see VisitSketch.add for the arguments)."""
+    return VisitSketch().add(client_ids, sign_in_times).stats(top, **options)
+
+
+def visit_stats_files(csv_files, start_date=None, end_date=None, top=10, chunksize=100000, **options):
+    """
+    VisitStats of one or more Envoy sign-in logs, streamed ``chunksize`` rows
+    at a time. Sign-ins outside start_date..end_date (inclusive) are left out.
+    """
+    from svdp.clientids import client_ids
+    from svdp.schema import iter_export
+
+    ids = client_ids()
+    start = np.datetime64(pd.Timestamp(start_date).date(), 'D') if start_date else None
+    end = np.datetime64(pd.Timestamp(end_date).date(), 'D') if end_date else None
+    sketch = VisitSketch()
+    for csv_file in ([csv_files] if isinstance(csv_files, str) else csv_files):
+        for chunk in iter_export(csv_file, 'envoy', ['name', 'sign_in_time'], chunksize=chunksize):
+            times = dates.to_datetime(chunk['sign_in_time'], dates.ENVOY_FORMATS).to_numpy()
+            day = times.astype('datetime64[D]')
+            if start is not None:
+                times = np.where(day >= start, times, np.datetime64('NaT'))
+            if end is not None:
+                times = np.where(day <= end, times, np.datetime64('NaT'))
+            sketch.add(ids.encode(chunk['name']), times)
+    return sketch.stats(top, **options)
+
+
+def print_visit_stats(stats, names=None):
+    """
+    Prints VisitStats. ``names`` (client ID -> name, e.g. from the sign-ins
+    themselves) labels the top visitors; they are shown by ID otherwise.
+    """
+    names = names or {}
+    if not stats.visits:
+        print("No visits to analyze.")
+        return
+    print(f"Visits (one per visitor per day): {stats.visits} by {stats.visitors} visitors, "
+          f"{stats.first_day} to {stats.last_day}")
+    for title, distribution, unit in (("Visits per visitor", stats.visits_per_visitor, ""),
+                                      ("Days between visits", stats.return_gaps, " days")):
+        if not distribution.count:
+            print(f"\n{title}: none")
+            continue
+        print(f"\n{title}: mean {distribution.mean:.2f}{unit}, median {distribution.median:g}{unit}")
+        print("  percentiles: " + ", ".join(f"p{p} {value:g}" for p, value in distribution.percentiles))
+        for label, count in distribution.histogram:
+            print(f"  {label:>8}: {count}")
+    print(f"\nTop {len(stats.top_visitors)} visitors:")
+    for visitor in stats.top_visitors:
+        gap = f"{visitor.mean_gap_days:.1f}" if visitor.mean_gap_days is not None else "-"
+        print(f"  {names.get(visitor.client_id, f'client {visitor.client_id}')}: {visitor.visits} visits, "
+              f"{visitor.first_visit} to {visitor.last_visit}, mean gap {gap} days")
+    print("\nVisits by weekday: " + ", ".join(f"{day} {count}" for day, count in stats.weekday_profile))
+    busy = [(hour, count) for hour, count in stats.hour_profile if count]
+    print("Visits by hour: " + ", ".join(f"{hour:02d}h {count}" for hour, count in busy))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Visitor frequency and return intervals of Envoy sign-in logs.")
+    parser.add_argument("csv_files", nargs="+", help="Envoy sign-in exports (several years may be split over files)")
+    parser.add_argument("--start", help="First day counted (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last day counted (YYYY-MM-DD)")
+    parser.add_argument("--top", type=int, default=10, help="Frequent visitors listed")
+    parser.add_argument("--chunksize", type=int, default=100000, help="Rows read at a time")
+    args = parser.parse_args()
+
+    print_visit_stats(visit_stats_files(args.csv_files, args.start, args.end, args.top, args.chunksize))
+
+
+if __name__ == "__main__":
+    main()
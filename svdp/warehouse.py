@@ -0,0 +1,271 @@
+"""
+A local SQLite warehouse of the exports, for indexed report queries.
+
+``ingest`` loads every export it knows (see DEFAULT_SOURCES) into one SQLite
+file: one table per export type in svdp.schema, with the schema's canonical
+columns plus
+
+    source_file  the export file the row came from (re-ingesting a file
+                 replaces its rows)
+    client_key   the person: Full Name / Envoy name / Unique Identifier,
+                 trimmed and case-folded
+    house        'RH' or 'BH', from the bed columns (stay and PMT tables)
+    sign_in_date the Envoy sign-in day (the raw time has several formats)
+
+Dates are stored as ISO text ('YYYY-MM-DD', or 'YYYY-MM-DD HH:MM:SS' for
+date-times) so they sort and compare correctly, and are indexed together with
+client_key and house. Rows go in through executemany, in one transaction per
+file.
+
+The query helpers run indexed range queries and return DataFrames with the
+canonical column names, so adding a year of data does not slow down reports
+on earlier periods.
+
+Usage:
+    python -m svdp.warehouse DATA_DIR [--db svdp.sqlite]
+"""
+
+import fnmatch
+import os
+import sqlite3
+from itertools import islice
+
+import pandas as pd
+
+from svdp import dates
+from svdp.schema import get_schema, load_export
+
+DEFAULT_DB = "svdp.sqlite"
+BATCH_ROWS = 50000
+
+# (file name pattern, export type), matched against the files in the data folder.
+DEFAULT_SOURCES = (
+    ("RileyEverything.csv", 'riley_everything'),
+    ("BHoccupancy.csv", 'riley_everything'),
+    ("BHQuarterly.csv", 'riley_everything'),
+    ("RHQuarterly.csv", 'riley_everything'),
+    ("RH2025.csv", 'riley_everything'),
+    ("RH18-24LastYR.csv", 'riley_everything'),
+    ("BrennanAll.csv", 'riley_everything'),
+    ("RosalieAll.csv", 'riley_everything'),
+    ("MaryKBren.csv", 'maryk'),
+    ("MaryKRosalie.csv", 'maryk'),
+    ("PmtNewEnrollment.csv", 'pmt'),
+    ("PmtNewGender.csv", 'pmt'),
+    ("OVTPMTabuse.csv", 'pmt'),
+    ("*HistoryOfViolence.csv", 'pmt'),
+    ("V-*.csv", 'envoy'),
+    ("CE.csv", 'ce'),
+    ("DCPR.csv", 'dcpr'),
+    ("UAV.csv", 'uav'),
+    ("CrisisLineReport.csv", 'crisis_line'),
+)
+
+CLIENT_KEY_COLUMNS = ('full_name', 'name', 'unique_identifier')
+HOUSE_COLUMNS = ('bed_name', 'bed_assignment_name')
+INDEXED_COLUMNS = ('client_key', 'house', 'entry_date', 'exit_date', 'sign_in_date', 'start_time',
+                   'assessment_date', 'source_file')
+
+def _sign_in_dates(values):
+    """Envoy sign-in times as ISO day strings (None if unparseable), parsing each distinct value once."""
+    days = dates.to_datetime(values, dates.ENVOY_FORMATS).dt.strftime('%Y-%m-%d')
+    return days.astype(object).where(days.notna(), None)
+
+
+def connect(db_path=DEFAULT_DB):
+    """Opens the warehouse with settings suited to bulk loads and reads."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def table_columns(export_type):
+    """Column names of an export type's table, schema columns first."""
+    schema = get_schema(export_type)
+    names = [column.name for column in schema.columns]
+    derived = ['source_file']
+    if any(name in CLIENT_KEY_COLUMNS for name in names):
+        derived.append('client_key')
+    if any(name in HOUSE_COLUMNS for name in names):
+        derived.append('house')
+    if export_type == 'envoy':
+        derived.append('sign_in_date')
+    return names + derived
+
+
+def create_table(conn, export_type):
+    """Creates an export type's table and its indexes if they do not exist."""
+    schema = get_schema(export_type)
+    types = {column.name: 'INTEGER' if column.dtype == 'int8' else 'TEXT' for column in schema.columns}
+    columns = table_columns(export_type)
+    definitions = ", ".join(f"{name} {types.get(name, 'TEXT')}" for name in columns)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {export_type} ({definitions})")
+    for name in INDEXED_COLUMNS:
+        if name in columns:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{export_type}_{name} ON {export_type} ({name})")
+
+
+def _frame_for_table(df, export_type, source_file):
+    """Adds the derived columns and converts values to what sqlite3 stores."""
+    schema = get_schema(export_type)
+    out = pd.DataFrame(index=df.index)
+    for column in schema.columns:
+        if column.name not in df:
+            out[column.name] = None
+        elif column.dtype == 'datetime':
+            has_time = column.date_format is not None and ('%H' in column.date_format or '%I' in column.date_format)
+            out[column.name] = df[column.name].dt.strftime('%Y-%m-%d %H:%M:%S' if has_time else '%Y-%m-%d')
+        else:
+            out[column.name] = df[column.name]
+
+    columns = table_columns(export_type)
+    out['source_file'] = os.path.basename(source_file)
+    if 'client_key' in columns:
+        key_column = next((name for name in CLIENT_KEY_COLUMNS if name in df), None)
+        out['client_key'] = (df[key_column].astype('string').str.strip().str.casefold()
+                             if key_column else None)
+    if 'house' in columns:
+        house = pd.Series(None, index=df.index, dtype=object)
+        for name in HOUSE_COLUMNS:
+            if name in df:
+                beds = df[name].astype('string').str.upper()
+                house = house.where(house.notna(), beds.str.contains('RH').map({True: 'RH'}))
+                house = house.where(house.notna(), beds.str.contains('BH').map({True: 'BH'}))
+        out['house'] = house
+    if 'sign_in_date' in columns:
+        out['sign_in_date'] = _sign_in_dates(df['sign_in_time']) if 'sign_in_time' in df else None
+
+    out = out[columns].astype(object)
+    return out.where(out.notna(), None)
+
+
+def ingest_file(conn, csv_file, export_type):
+    """
+    Loads one export into its table, replacing rows from a previous ingest of
+    the same file name, in a single transaction.
+
+    Returns:
+        int: Rows inserted.
+    """
+    df = load_export(csv_file, export_type)
+    rows = _frame_for_table(df, export_type, csv_file)
+    columns = list(rows.columns)
+    insert = f"INSERT INTO {export_type} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+    with conn:
+        create_table(conn, export_type)
+        conn.execute(f"DELETE FROM {export_type} WHERE source_file = ?", (os.path.basename(csv_file),))
+        values = rows.itertuples(index=False, name=None)
+        while True:
+            batch = list(islice(values, BATCH_ROWS))
+            if not batch:
+                break
+            conn.executemany(insert, batch)
+    return len(rows)
+
+
+def find_sources(data_dir, sources=DEFAULT_SOURCES):
+    """The (path, export type) pairs for the known exports present in ``data_dir``."""
+    found = []
+    names = sorted(os.listdir(data_dir))
+    for pattern, export_type in sources:
+        for name in fnmatch.filter(names, pattern):
+            found.append((os.path.join(data_dir, name), export_type))
+    return found
+
+
+def ingest(data_dir=".", db_path=DEFAULT_DB, sources=DEFAULT_SOURCES):
+    """
+    Loads every known export in ``data_dir`` into the warehouse. A file that
+    cannot be read is reported and skipped.
+
+    Returns:
+        dict: File path -> rows inserted.
+    """
+    conn = connect(db_path)
+    counts = {}
+    try:
+        for path, export_type in find_sources(data_dir, sources):
+            try:
+                counts[path] = ingest_file(conn, path, export_type)
+            except Exception as e:
+                print(f"Error ingesting {path} as {export_type}: {e}")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return counts
+
+
+def _query(conn, sql, params, date_columns=()):
+    df = pd.read_sql_query(sql, conn, params=params)
+    for name in date_columns:
+        if name in df:
+            df[name] = pd.to_datetime(df[name], errors='coerce')
+    return df
+
+
+def _iso(day):
+    return pd.Timestamp(day).strftime('%Y-%m-%d')
+
+
+def _where(conditions, params, source_file=None, house=None):
+    if source_file is not None:
+        conditions.append("source_file = ?")
+        params.append(os.path.basename(source_file))
+    if house is not None:
+        conditions.append("house = ?")
+        params.append(house)
+    return " AND ".join(conditions)
+
+
+def stays_overlapping(conn, start_date, end_date, house=None, source_file=None, table='riley_everything'):
+    """
+    Stays that overlap [start_date, end_date]: entered by the end and not
+    exited before the start (a missing exit counts as still there).
+    """
+    params = [_iso(end_date), _iso(start_date)]
+    where = _where(["entry_date <= ?", "(exit_date >= ? OR exit_date IS NULL)"], params, source_file, house)
+    return _query(conn, f"SELECT * FROM {table} WHERE {where}", params, ('entry_date', 'exit_date'))
+
+
+def stays_entered_or_exited(conn, start_date, end_date, house=None, source_file=None, table='riley_everything'):
+    """Stays whose entry or exit date falls in [start_date, end_date] (the 990 rule)."""
+    start, end = _iso(start_date), _iso(end_date)
+    params = [start, end, start, end]
+    where = _where(["(entry_date BETWEEN ? AND ? OR exit_date BETWEEN ? AND ?)"], params, source_file, house)
+    return _query(conn, f"SELECT * FROM {table} WHERE {where}", params, ('entry_date', 'exit_date'))
+
+
+def sign_ins_between(conn, start_date, end_date, source_file=None):
+    """Envoy sign-ins on days in [start_date, end_date]."""
+    params = [_iso(start_date), _iso(end_date)]
+    where = _where(["sign_in_date BETWEEN ? AND ?"], params, source_file)
+    return _query(conn, f"SELECT * FROM envoy WHERE {where}", params)
+
+
+def count_between(conn, table, column, start_date, end_date, source_file=None):
+    """Number of rows of ``table`` whose date ``column`` falls in [start_date, end_date]."""
+    if column not in INDEXED_COLUMNS:
+        raise ValueError(f"'{column}' is not an indexed date column")
+    params = [_iso(start_date), _iso(end_date) + " 23:59:59"]
+    where = _where([f"{column} BETWEEN ? AND ?"], params, source_file)
+    return conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}", params).fetchone()[0]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load every known export in a folder into a SQLite warehouse.")
+    parser.add_argument("data_dir", nargs="?", default=".", help="Folder with the exports")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"SQLite file (default {DEFAULT_DB})")
+    args = parser.parse_args()
+
+    counts = ingest(args.data_dir, args.db)
+    for path, rows in counts.items():
+        print(f"{os.path.basename(path)}: {rows} rows")
+    print(f"Loaded {sum(counts.values())} rows from {len(counts)} files into {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""
+Watch a drop folder and re-run the reports that read each export that lands.
+
+Exports are saved (or copied, often compressed) into one folder. The watcher
+polls it, waits until a file has stopped changing for ``debounce`` seconds
+(so a half-written download is never read), identifies the export type from
+the file's header and runs only the reports that read that file, through
+svdp.pipeline with the result cache, so fresh numbers are printed seconds
+after an export lands.
+
+A file's type is its header fingerprint: every schema in svdp.schema is
+scored by the header names it recognises, each weighted by how few schemas
+share it ('History of Violence' says more than 'Full Name'), plus the share
+of its own columns the file has. A report depends on a landed file when the
+file is the report's export type and has every column the report reads, so
+date-stamped and renamed drops still run. File names only tell the houses
+apart: a report on one house's export (BHQuarterly.csv) runs for files named
+for that house ('BH', 'Brennen'; 'RH', 'Rosalie'), and reports on both houses
+for files named for neither. Among those, a file that still carries a
+report's standard name (PmtNewGender 2025-04.csv) runs just the reports of
+that name.
+
+Runs go to a bounded pool of ``workers`` threads. A file that changes again
+while its reports are running is queued for one more run, not one per change.
+
+Usage:
+    python -m svdp.watch DROP_DIR [--period 2025-Q1] [--debounce 2] [--workers 2]
+"""
+
+import csv
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from svdp import cache, compression
+from svdp.pipeline import run_reports
+from svdp.schema import SCHEMAS, header_lookup, normalize_header
+
+COMPRESSED_SUFFIXES = ('.gz', '.bz2', '.xz', '.zst')
+PARTIAL_SUFFIXES = ('.tmp', '.part', '.crdownload', '.partial')
+HEADER_ROWS = 20  # rows searched for the header of exports with title rows
+HOUSE_PATTERNS = (('BH', re.compile(r'BH|(?i:brenn[ae]n)')), ('RH', re.compile(r'RH|(?i:rosalie)')))
+
+ExportMatch = namedtuple('ExportMatch', ['export_type', 'header_row', 'columns', 'score'])
+ExportMatch.__doc__ = """
+Result of identify_export.
+
+    export_type  best matching schema name, or None if no header name is known
+    header_row   rows above the header (title rows)
+    columns      schema name -> frozenset of that schema's canonical columns in the file
+    score        fingerprint score of export_type (0 if nothing matched)
+"""
+
+_LOOKUPS = {name: header_lookup(schema) for name, schema in SCHEMAS.items()}
+
+
+def _weights():
+    """normalized header text -> 1 / number of schemas that know it."""
+    holders = {}
+    for lookup in _LOOKUPS.values():
+        for text in lookup:
+            holders[text] = holders.get(text, 0) + 1
+    return {text: 1 / count for text, count in holders.items()}
+
+
+_WEIGHTS = _weights()
+
+
+def _header(path):
+    """(rows above the header, header names): the first row holding a schema's header marker, else row 0."""
+    markers = [schema.header_marker for schema in SCHEMAS.values() if schema.header_marker]
+    with compression.open_text(path, newline='', encoding='utf-8-sig', errors='replace') as f:
+        rows = []
+        for row in csv.reader(f):
+            rows.append(row)
+            if len(rows) >= HEADER_ROWS:
+                break
+    for index, row in enumerate(rows):
+        if any(marker in ','.join(row) for marker in markers):
+            return index, row
+    return 0, rows[0] if rows else []
+
+
+def identify_export(path):
+    """
+    The export type of a file from its header, however it is named.
+
+    Returns:
+        ExportMatch
+    """
+    header_row, header = _header(path)
+    names = {normalize_header(name) for name in header}
+    columns = {name: frozenset(lookup[text].name for text in names if text in lookup)
+               for name, lookup in _LOOKUPS.items()}
+
+    def rank(name):
+        weighted = sum(_WEIGHTS[text] for text in names if text in _LOOKUPS[name])
+        coverage = len(columns[name]) / len(SCHEMAS[name].columns)
+        marker = SCHEMAS[name].header_marker
+        # Title rows above the header point to the schemas that expect them, and only those.
+        title_fit = (marker is not None) == (header_row > 0)
+        return title_fit, weighted + coverage if weighted else 0.0
+
+    best = max(SCHEMAS, key=rank)
+    score = rank(best)[1]
+    return ExportMatch(best if score > 0 else None, header_row, columns, score)
+
+
+def export_name(path):
+    """A file's name without compression extensions: 'BHQuarterly.csv.gz' -> 'BHQuarterly.csv'."""
+    name = os.path.basename(path)
+    while name.lower().endswith(COMPRESSED_SUFFIXES):
+        name = os.path.splitext(name)[0]
+    return name
+
+
+def house_of(path):
+    """'BH' or 'RH' when a file name names exactly one house, else None."""
+    name = export_name(path)
+    houses = [house for house, pattern in HOUSE_PATTERNS if pattern.search(name)]
+    return houses[0] if len(houses) == 1 else None
+
+
+def _name_key(path):
+    """A file name without extensions, case and punctuation: 'PmtNewGender (2).csv' -> 'pmtnewgender2'."""
+    return re.sub(r'[^0-9a-z]', '', os.path.splitext(export_name(path))[0].casefold())
+
+
+def dependent_reports(path, reports, match=None):
+    """
+    The reports that read the export at ``path``, pointed at it: those of its
+    export type and house whose columns it has (see the module docstring).
+
+    Returns:
+        tuple: (reports to run, with source replaced by ``path``; reports of
+        the file's type and house whose columns it lacks)
+    """
+    match = match or identify_export(path)
+    house = house_of(path)
+    candidates = [report for report in reports
+                  if report.export_type == match.export_type and house_of(report.source) == house]
+    key = _name_key(path)
+    named = [report for report in candidates if _name_key(report.source) in key]
+    runnable, mismatched = [], []
+    for report in named or candidates:
+        if set(report.columns) <= match.columns[report.export_type]:
+            runnable.append(report._replace(source=path))
+        else:
+            mismatched.append(report)
+    return runnable, mismatched
+
+
+def _stamp():
+    return datetime.now().strftime('%H:%M:%S')
+
+
+class Watcher:
+    """
+    Polls ``drop_dir`` and runs the reports that depend on each settled, changed file.
+
+    Call poll() periodically (run() does, every ``interval`` seconds) and
+    close() when done.
+    """
+
+    def __init__(self, drop_dir, reports, debounce=2.0, workers=2, stage_workers=4, result_cache=None):
+        self.drop_dir = drop_dir
+        self.reports = list(reports)
+        self.debounce = debounce
+        self.stage_workers = stage_workers
+        self.result_cache = result_cache
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        self._stats = {}       # path -> (size, mtime_ns) last seen
+        self._changed_at = {}  # path -> monotonic time the stat last changed
+        self._handled = {}     # path -> stat already dispatched (or baselined)
+        self._digests = {}     # path -> content digest last run
+        self._running = set()
+        self._again = set()
+
+    def _files(self):
+        for entry in os.scandir(self.drop_dir):
+            name = entry.name
+            if name.startswith(('.', '~$')) or name.lower().endswith(PARTIAL_SUFFIXES) or not entry.is_file():
+                continue
+            stat = entry.stat()
+            yield entry.path, (stat.st_size, stat.st_mtime_ns)
+
+    def baseline(self):
+        """Treats the files already in the folder as handled, so only new arrivals run."""
+        for path, stat in self._files():
+            self._stats[path] = self._handled[path] = stat
+            self._digests[path] = cache.file_digest(path)
+
+    def poll(self, now=None):
+        """
+        Checks the folder once and dispatches every file that has been
+        unchanged for ``debounce`` seconds since it last changed.
+
+        Returns:
+            list: Paths dispatched by this poll.
+        """
+        now = time.monotonic() if now is None else now
+        present = set()
+        dispatched = []
+        for path, stat in self._files():
+            present.add(path)
+            if self._stats.get(path) != stat:
+                self._stats[path] = stat
+                self._changed_at[path] = now
+                continue
+            if self._handled.get(path) == stat or now - self._changed_at.get(path, now) < self.debounce:
+                continue
+            self._handled[path] = stat
+            digest = cache.file_digest(path)
+            if self._digests.get(path) == digest:
+                continue  # touched, not changed
+            self._digests[path] = digest
+            self._dispatch(path)
+            dispatched.append(path)
+        for path in set(self._stats) - present:
+            for table in (self._stats, self._changed_at, self._handled, self._digests):
+                table.pop(path, None)
+        return dispatched
+
+    def _dispatch(self, path):
+        with self._lock:
+            if path in self._running:
+                self._again.add(path)  # one more run once the current one ends
+                return
+            self._running.add(path)
+        future = self._pool.submit(self.process, path)
+        future.add_done_callback(lambda _, path=path: self._finished(path))
+
+    def _finished(self, path):
+        with self._lock:
+            self._running.discard(path)
+            again = path in self._again
+            self._again.discard(path)
+        if again:
+            self._dispatch(path)
+
+    def process(self, path):
+        """Identifies one export and runs the reports that read it. Returns their results."""
+        name = os.path.basename(path)
+        try:
+            match = identify_export(path)
+            reports, mismatched = dependent_reports(path, self.reports, match)
+        except Exception as e:
+            print(f"[{_stamp()}] Error reading {name}: {e}")
+            return {}
+        for report in mismatched:
+            print(f"[{_stamp()}] Warning: {name} looks like a '{match.export_type}' export without the columns "
+                  f"'{report.name}' needs; skipped")
+        if not reports:
+            if not mismatched:
+                print(f"[{_stamp()}] {name} ({match.export_type or 'unknown export'}): no report reads this file")
+            return {}
+
+        print(f"[{_stamp()}] {name} ({match.export_type}): running {len(reports)} report(s)")
+        started = time.perf_counter()
+        results = run_reports(reports, max_workers=self.stage_workers, result_cache=self.result_cache)
+        print(f"[{_stamp()}] {name}: {len(results)}/{len(reports)} report(s) done "
+              f"in {time.perf_counter() - started:.2f}s")
+        return results
+
+    def run(self, interval=0.5, run_existing=False):
+        """Polls until interrupted (Ctrl+C)."""
+        if not run_existing:
+            self.baseline()
+        print(f"Watching {os.path.abspath(self.drop_dir)} for {len(self.reports)} reports (Ctrl+C to stop)")
+        try:
+            while True:
+                self.poll()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("Stopping; waiting for running reports")
+        finally:
+            self.close()
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+
+def main():
+    import argparse
+
+    from svdp.cache import ResultCache, default_cache
+    from svdp.reports import monthly_batch
+
+    parser = argparse.ArgumentParser(description="Re-run the reports that read each export dropped into a folder.")
+    parser.add_argument("drop_dir", help="Folder the exports are saved to")
+    parser.add_argument("--start", default="2025-01-01", help="Quarter start (YYYY-MM-DD)")
+    parser.add_argument("--end", default="2025-03-31", help="Quarter end (YYYY-MM-DD)")
+    parser.add_argument("--period", help="Reporting period instead of --start/--end, e.g. 2025-Q1 or FY2025-Q3")
+    parser.add_argument("--debounce", type=float, default=2.0, help="Seconds a file must be unchanged before it runs")
+    parser.add_argument("--interval", type=float, default=0.5, help="Seconds between folder checks")
+    parser.add_argument("--workers", type=int, default=2, help="Exports processed at the same time")
+    parser.add_argument("--run-existing", action="store_true", help="Also run the files already in the folder")
+    parser.add_argument("--cache-dir", help="Result cache folder (default $SVDP_CACHE_DIR or ~/.cache/svdp)")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every report")
+    args = parser.parse_args()
+    if args.period:
+        from svdp.periods import parse_period
+
+        _, start, end = parse_period(args.period)
+        args.start, args.end = start.isoformat(), end.isoformat()
+
+    result_cache = None
+    if not args.no_cache:
+        result_cache = ResultCache(args.cache_dir) if args.cache_dir else default_cache()
+    watcher = Watcher(args.drop_dir, monthly_batch(args.drop_dir, args.start, args.end), debounce=args.debounce,
+                      workers=args.workers, result_cache=result_cache)
+    watcher.run(args.interval, run_existing=args.run_existing)
+
+
+if __name__ == "__main__":
+    main()